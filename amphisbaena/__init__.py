@@ -1,7 +1,22 @@
 """
 Amphisbaena
 """
-from ._version import get_versions
 
-__version__ = get_versions()["version"]
-del get_versions
+
+def __getattr__(name: str) -> object:
+    """
+    Resolve __version__ on its first access only: in a source checkout,
+    versioneer runs git to compute it, while the built packages carry the
+    static _version.py written by the build_py command of versioneer
+    :param name:
+    :type name: str
+    :return:
+    :rtype: object
+    """
+    if name == "__version__":
+        from ._version import get_versions  # pylint: disable=import-outside-toplevel
+
+        version = get_versions()["version"]
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
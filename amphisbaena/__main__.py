@@ -1,22 +1,39 @@
 """
 The main of the module
+
+The settings, the logging utilities and the parsers of the config files are
+imported on the code paths needing them, so that e.g. --version and --help
+start fast.
 """
-import logging
 import os
 import sys
-from argparse import Action, ArgumentParser, Namespace
-from ast import literal_eval
-from typing import Dict
-
-import orjson
-import yaml
+from argparse import SUPPRESS, Action, ArgumentError, ArgumentParser, Namespace
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import amphisbaena
-from amphisbaena.settings import Settings, SettingsException
-from amphisbaena.utils import configure_logging, get_runtime_info
+
+if TYPE_CHECKING:
+    from amphisbaena.settings import Settings
 
 PROG = "amphisbaena"
 
+# The environment variable of the socket of a daemon to run the commands in
+SOCKET_ENV = "AMPHISBAENA_SOCKET"
+
+# The environment variable of the directory of the settings snapshots
+SETTINGS_CACHE_ENV = "AMPHISBAENA_SETTINGS_CACHE"
+
 
 class SettingsAppend(Action):  # pylint: disable=too-few-public-methods
     """
@@ -43,19 +60,57 @@ class SettingsAppend(Action):  # pylint: disable=too-few-public-methods
         :return:
         :rtype: None
         """
-        items: Dict = getattr(namespace, self.dest)
+        from amphisbaena.utils.misc import (  # pylint: disable=import-outside-toplevel
+            literal_value,
+        )
+
+        # the default is None: a dict default would be shared by the parses of
+        # the cached parser
+        items: Dict = getattr(namespace, self.dest) or {}
 
         key: str
         value: str
         key, value = values.split("=", 1)
-        items.update({key: literal_eval(value)})
+        items.update({key: literal_value(value)})
 
         setattr(namespace, self.dest, items)
 
 
-class ConfigAppend(Action):  # pylint: disable=too-few-public-methods
+def read_overrides(lines: Iterable[str]) -> Dict[str, Any]:
+    """
+    The settings of KEY=VALUE lines, the values parsed as with -s, or of NDJSON
+    lines of objects; the blank lines and the lines starting with # are skipped
+    :param lines:
+    :type lines: Iterable[str]
+    :return:
+    :rtype: Dict[str, Any]
+    """
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    from amphisbaena.utils.misc import (  # pylint: disable=import-outside-toplevel
+        literal_value,
+    )
+
+    items: Dict[str, Any] = {}
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            if line.startswith("{"):
+                items.update(orjson.loads(line))
+            else:
+                key, value = line.split("=", 1)
+                items[key.strip()] = literal_value(value.strip())
+        except (SyntaxError, ValueError) as exc:
+            # orjson.JSONDecodeError is a ValueError
+            raise ValueError(f"line {number}: {line!r}") from exc
+    return items
+
+
+class SettingsFileAppend(Action):  # pylint: disable=too-few-public-methods
     """
-    Load the config file into dict
+    Read settings from a file of overrides, or from stdin with -
     """
 
     def __call__(  # type: ignore
@@ -64,7 +119,7 @@ class ConfigAppend(Action):  # pylint: disable=too-few-public-methods
         namespace: Namespace,
         values: str,
         option_string=None,
-    ):
+    ) -> None:
         """
 
         :param parser:
@@ -78,57 +133,231 @@ class ConfigAppend(Action):  # pylint: disable=too-few-public-methods
         :return:
         :rtype: None
         """
-        items: Dict = getattr(namespace, self.dest)
+        items: Dict = getattr(namespace, self.dest) or {}
 
-        suffix = values.rsplit(".")[-1]
+        try:
+            if values == "-":
+                overrides = read_overrides(sys.stdin)
+            else:
+                with open(values, encoding="utf-8") as fp:
+                    overrides = read_overrides(fp)
+        except OSError as exc:
+            raise ArgumentError(self, str(exc)) from exc
+        except ValueError as exc:
+            raise ArgumentError(self, f"invalid override at {exc}") from exc
 
-        with open(values, "r") as config_fh:
-            if suffix == "json":
-                config = orjson.loads(config_fh.read())
-            elif suffix in ("yaml", "yml"):
-                config = yaml.safe_load(config_fh)
-
-        items.update(config)
+        items.update(overrides)
 
         setattr(namespace, self.dest, items)
 
 
-def get_arguments(*args) -> Namespace:
+def load_configs(paths: Sequence[str]) -> Dict[str, Any]:
+    """
+    Merge the config files in order, in any format of the parser registry; they
+    are read and parsed in threads when there are several of them
+    :param paths:
+    :type paths: Sequence[str]
+    :return:
+    :rtype: Dict[str, Any]
     """
+    # pylint: disable=import-outside-toplevel
+    from amphisbaena.settings import read_file
 
-    :param args:
-    :type args:
+    if len(paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(min(len(paths), os.cpu_count() or 1)) as executor:
+            configs = list(executor.map(read_file, paths))
+    else:
+        configs = [read_file(x) for x in paths]
+
+    items: Dict[str, Any] = {}
+    for config in configs:
+        items.update(config or {})
+    return items
+
+
+class VersionAction(Action):  # pylint: disable=too-few-public-methods
+    """
+    Print the version and exit, resolving the version only when asked
+    """
+
+    def __init__(
+        self,
+        option_strings,
+        dest=SUPPRESS,
+        default=SUPPRESS,
+        help=None,  # pylint: disable=redefined-builtin
+    ):
+        """
+
+        :param option_strings:
+        :param dest:
+        :param default:
+        :param help:
+        """
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(  # type: ignore
+        self,
+        parser: ArgumentParser,
+        namespace: Namespace,
+        values: str,
+        option_string=None,
+    ) -> None:
+        """
+
+        :param parser:
+        :type parser: ArgumentParser
+        :param namespace:
+        :type namespace: Namespace
+        :param values:
+        :type values: str
+        :param option_string:
+        :type option_string:
+        :return:
+        :rtype: None
+        """
+        print(f"{parser.prog} {amphisbaena.__version__}")
+        parser.exit()
+
+
+@lru_cache
+def get_parser() -> ArgumentParser:
+    """
+    The parser of the command line, built once per process: main may run many
+    times in a process, e.g. in the daemon. The subcommands are to be added
+    here too, so that their parsers are built once as well. The actions store
+    new objects into the namespace of each parse, never their defaults.
     :return:
-    :rtype: Namespace
+    :rtype: ArgumentParser
     """
     parser = ArgumentParser(prog=PROG)
 
     parser.add_argument(
         "-c",
         "--config",
-        action=ConfigAppend,
-        default=dict(),
+        action="append",
+        metavar="FILE",
         help="load the configuration of the setting from a file",
     )
     parser.add_argument(
         "-s",
         "--setting",
         action=SettingsAppend,
-        default=dict(),
         help="configure the setting from command line interface",
     )
+    parser.add_argument(
+        "-S",
+        "--settings-file",
+        action=SettingsFileAppend,
+        metavar="FILE",
+        help="configure the settings from the KEY=VALUE or NDJSON lines of a file, "
+        "or of stdin with -",
+    )
+    parser.add_argument(
+        "--profile-settings",
+        action="store_true",
+        help="print the time spent loading each source of the settings",
+    )
+    parser.add_argument(
+        "--settings-cache",
+        metavar="DIR",
+        help=f"reuse the settings resolved by a previous run with the same "
+        f"settings and unchanged files, from snapshots in this directory (also "
+        f"{SETTINGS_CACHE_ENV})",
+    )
+    parser.add_argument(
+        "--no-settings-cache",
+        action="store_true",
+        help="resolve the settings without the snapshots",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help=f"run the commands sent to this Unix socket, by the invocations with "
+        f"{SOCKET_ENV} set to it",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run the commands of the JSON arrays of arguments on the lines of a "
+        "file, or of stdin with -, over these settings",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="run the commands of the batch in N processes",
+    )
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
+        action=VersionAction,
         help="print the version number and exit (also --version)",
-        version=f"%(prog)s {amphisbaena.__version__}",
     )
 
-    return parser.parse_args(args)
+    return parser
+
+
+def parse_arguments(*args) -> Namespace:
+    """
+    Parse the arguments, leaving the paths of the config files in config
+    :param args:
+    :type args:
+    :return:
+    :rtype: Namespace
+    """
+    ns_args = get_parser().parse_args(args)
+    ns_args.config = ns_args.config or []
+    ns_args.setting = ns_args.setting or {}
+    ns_args.settings_file = ns_args.settings_file or {}
+    return ns_args
 
 
-def set_logging(settings: Settings) -> None:
+def load_config_arguments(ns_args: Namespace) -> Namespace:
+    """
+    Replace the paths of the config files by their merged settings
+    :param ns_args:
+    :type ns_args: Namespace
+    :return:
+    :rtype: Namespace
+    """
+    # pylint: disable=import-outside-toplevel
+    if ns_args.config:
+        from amphisbaena.settings import UnknownConfigFormatException
+
+        try:
+            ns_args.config = load_configs(ns_args.config)
+        except UnknownConfigFormatException as exc:
+            get_parser().error(f"argument -c/--config: unknown format of {exc}")
+    else:
+        ns_args.config = {}
+
+    return ns_args
+
+
+def get_arguments(*args) -> Namespace:
+    """
+    Parse the arguments and load the config files; they are only loaded once
+    the arguments are all parsed, so that e.g. --version never reads them
+    :param args:
+    :type args:
+    :return:
+    :rtype: Namespace
+    """
+    return load_config_arguments(parse_arguments(*args))
+
+
+def set_logging(settings: "Settings") -> None:
     """
 
     :param settings:
@@ -136,6 +365,13 @@ def set_logging(settings: Settings) -> None:
     :return:
     :rtype: None
     """
+    import logging  # pylint: disable=import-outside-toplevel
+
+    from amphisbaena.utils import (  # pylint: disable=import-outside-toplevel
+        configure_logging,
+        get_runtime_info,
+    )
+
     configure_logging(settings)
 
     logger = logging.getLogger("amphisbaena")
@@ -144,20 +380,156 @@ def set_logging(settings: Settings) -> None:
     get_runtime_info(logger)
 
 
-def main(*args):
+def cmd_settings(ns_args: Namespace) -> Dict[str, Any]:
     """
-
-    :param args:
+    The settings of the command line, at the cmd priority, once the config files
+    are loaded
+    :param ns_args:
+    :type ns_args: Namespace
     :return:
+    :rtype: Dict[str, Any]
     """
-    ns_args: Namespace = get_arguments(*args)
+    return {**ns_args.settings_file, **ns_args.setting, **ns_args.config}
 
-    settings = Settings(
-        settings={**ns_args.setting, **ns_args.config},
-        priority="cmd",
-        default_settings=True,
+
+def resolve_settings(ns_args: Namespace) -> Tuple["Settings", Optional[str]]:
+    """
+    The settings of the command line over the default settings, from their
+    snapshot when the snapshot cache is enabled and has them
+    :param ns_args: with the paths of the config files
+    :type ns_args: Namespace
+    :return: the settings, and whether the snapshot was a hit or a miss, None
+        when the cache is not used
+    :rtype: Tuple[Settings, Optional[str]]
+    """
+    # pylint: disable=import-outside-toplevel
+    from amphisbaena.settings import Settings, measure
+
+    directory = ns_args.settings_cache or os.environ.get(SETTINGS_CACHE_ENV)
+    if ns_args.no_settings_cache or not directory:
+        load_config_arguments(ns_args)
+        return Settings(cmd_settings(ns_args), "cmd", default_settings=True), None
+
+    from amphisbaena.snapshot import SnapshotCache
+
+    cache = SnapshotCache(directory)
+    key = cache.key(
+        repr((ns_args.settings_file, ns_args.setting, ns_args.config)),
+        ns_args.config,
     )
+    with measure(str(directory), "snapshot") as record:
+        settings = cache.get(key) if key is not None else None
+        snapshot = f"{'miss' if settings is None else 'hit'} {key}"
+        record.source = f"{snapshot} in {directory}"
+        if settings is not None:
+            record.keys = len(settings)
+            return settings, snapshot
+
+    load_config_arguments(ns_args)
+    settings = Settings(cmd_settings(ns_args), "cmd", default_settings=True)
+    if key is not None:
+        cache.put(key, settings)
+    return settings, snapshot
+
+
+class Result(NamedTuple):
+    """
+    The outcome of a command run in process
+    """
+
+    status: int
+    settings: Optional["Settings"] = None
+    error: Optional[BaseException] = None
+
+
+def main(*args, settings: "Settings" = None) -> Optional["Settings"]:
+    """
+
+    :param args:
+    :param settings: the base of the settings, overlaid with the settings of
+        the command line; the default settings with None
+    :type settings: Settings
+    :return: the settings of the command, None when serving
+    :rtype: Optional[Settings]
+    """
+    # pylint: disable=import-outside-toplevel
+    from amphisbaena.settings import SettingsOverlay, profile
+
+    ns_args: Namespace = parse_arguments(*args)
+    if ns_args.serve:
+        from amphisbaena.daemon import serve
+
+        serve(ns_args.serve)
+        return None
+
+    snapshot: Optional[str] = None
+    with profile() if ns_args.profile_settings else nullcontext() as profiler:
+        if settings is None:
+            settings, snapshot = resolve_settings(ns_args)
+        else:
+            load_config_arguments(ns_args)
+            settings = SettingsOverlay(settings, cmd_settings(ns_args), priority="cmd")
+
+    if profiler is not None:
+        print(profiler.format(), file=sys.stderr)
+
+    if ns_args.batch:
+        from amphisbaena.batch import run_batch_file
+
+        if run_batch_file(ns_args.batch, settings, ns_args.jobs):
+            sys.exit(1)
+        return settings
+
     set_logging(settings)
+    if snapshot is not None:
+        import logging
+
+        logging.getLogger("amphisbaena").debug("Settings snapshot %s", snapshot)
+    return settings
+
+
+def run(argv: Sequence[str], settings: "Settings" = None) -> Result:
+    """
+    Run the command in this process as the entrypoint does, returning instead
+    of exiting; the parser, the logging setup and the runtime information are
+    reused across the runs of a process
+    :param argv:
+    :type argv: Sequence[str]
+    :param settings: the base of the settings, overlaid with the settings of
+        the command line; the default settings with None
+    :type settings: Settings
+    :return:
+    :rtype: Result
+    """
+    try:
+        settings_ = main(*argv, settings=settings)
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return Result(exc.code or os.EX_OK, error=exc if exc.code else None)
+        print(exc.code, file=sys.stderr)
+        return Result(1, error=exc)
+    except Exception as exc:  # pylint: disable=broad-except
+        # main has imported the settings when they raise
+        from amphisbaena.settings import (  # pylint: disable=import-outside-toplevel
+            SettingsException,
+        )
+
+        if isinstance(exc, SettingsException):
+            return Result(os.EX_CONFIG, error=exc)
+        return Result(1, error=exc)
+    return Result(os.EX_OK, settings_)
+
+
+def is_unexpected(result: Result) -> bool:
+    """
+    Whether the command failed on an error other than the exits and the
+    settings errors, to be reported with its traceback
+    :param result:
+    :type result: Result
+    :return:
+    :rtype: bool
+    """
+    return isinstance(result.error, Exception) and result.status != os.EX_CONFIG
 
 
 def entrypoint(*args):
@@ -169,12 +541,25 @@ def entrypoint(*args):
     if not args:
         args = sys.argv[1:]
 
-    try:
-        main(*args)
-    except SettingsException:
-        sys.exit(os.EX_CONFIG)
-    else:
-        sys.exit(os.EX_OK)
+    # pylint: disable=import-outside-toplevel
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        from amphisbaena.daemon import forward, is_forwardable
+
+        if is_forwardable(args):
+            try:
+                sys.exit(forward(socket_path, args))
+            except (FileNotFoundError, ConnectionRefusedError):
+                # no daemon listens: run the command in this process
+                pass
+            except OSError as exc:
+                # the daemon may have run the command: never run it twice
+                sys.exit(f"amphisbaena: the daemon on {socket_path} failed: {exc}")
+
+    result = run(args)
+    if is_unexpected(result):
+        raise result.error  # type: ignore
+    sys.exit(result.status)
 
 
 if __name__ == "__main__":
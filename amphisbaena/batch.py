@@ -0,0 +1,155 @@
+"""
+Many commands run by a single process
+
+    amphisbaena -s LOG_LEVEL=30 --batch commands.ndjson --jobs 4
+
+Every line of the batch is the JSON array of the arguments of a command. The
+commands run over the settings of the batch command line, loaded once, each
+with its own overlay; the status and the output of every command are written
+as a JSON line, in the order of the batch.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, TextIO
+
+import orjson
+
+from amphisbaena.daemon import LOCAL_OPTIONS, has_local_option, run_captured
+
+if TYPE_CHECKING:
+    from amphisbaena.settings import Settings
+
+# The chunks of commands sent at once to a worker process
+CHUNKSIZE = 16
+
+# The base settings of the commands run by a worker process
+_SETTINGS: Optional["Settings"] = None
+
+
+def read_commands(lines: Iterable[str]) -> Iterator[Any]:
+    """
+    The arguments of the commands, or the ValueError of the invalid lines; the
+    blank lines are skipped
+    :param lines:
+    :type lines: Iterable[str]
+    :return:
+    :rtype: Iterator[Any]
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            argv = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield ValueError(f"line {number}: {exc}")
+            continue
+        if not isinstance(argv, list) or not all(isinstance(x, str) for x in argv):
+            yield ValueError(f"line {number}: not an array of strings")
+        elif has_local_option(argv):
+            options = " and ".join(LOCAL_OPTIONS)
+            yield ValueError(f"line {number}: {options} are not allowed in a batch")
+        else:
+            yield argv
+
+
+def run_item(item: Any, settings: "Settings" = None) -> Dict[str, Any]:
+    """
+    Run a command of the batch, capturing its output
+    :param item: the arguments of the command, or the error of its line
+    :type item: Any
+    :param settings: the base of the settings of the command
+    :type settings: Settings
+    :return:
+    :rtype: Dict[str, Any]
+    """
+    if isinstance(item, ValueError):
+        return {"status": os.EX_USAGE, "stdout": "", "stderr": f"{item}\n"}
+
+    status, stdout, stderr = run_captured(item, settings)
+    return {"status": status, "stdout": stdout, "stderr": stderr}
+
+
+def _init_worker(settings: "Settings") -> None:
+    """
+    Keep the base settings in the worker process; they are pickled through
+    their wire format
+    :param settings:
+    :type settings: Settings
+    :return:
+    :rtype: None
+    """
+    global _SETTINGS  # pylint: disable=global-statement
+    _SETTINGS = settings
+
+
+def _run_worker_item(item: Any) -> Dict[str, Any]:
+    """
+
+    :param item:
+    :type item: Any
+    :return:
+    :rtype: Dict[str, Any]
+    """
+    return run_item(item, _SETTINGS)
+
+
+def run_batch(
+    lines: Iterable[str],
+    settings: "Settings",
+    jobs: int = 1,
+    output: TextIO = None,
+) -> int:
+    """
+    Run the commands of the batch and write their results
+    :param lines:
+    :type lines: Iterable[str]
+    :param settings: the base of the settings of the commands
+    :type settings: Settings
+    :param jobs: the number of worker processes, the commands run in this
+        process with 1
+    :type jobs: int
+    :param output: stdout with None
+    :type output: TextIO
+    :return: the number of the failed commands
+    :rtype: int
+    """
+    output = output if output is not None else sys.stdout
+    commands = read_commands(lines)
+
+    failures = 0
+
+    def write(results: Iterable[Dict[str, Any]]) -> None:
+        nonlocal failures
+        for index, result in enumerate(results):
+            failures += result["status"] != os.EX_OK
+            output.write(orjson.dumps({"index": index, **result}).decode())
+            output.write("\n")
+
+    if jobs <= 1:
+        write(run_item(x, settings) for x in commands)
+        return failures
+
+    with ProcessPoolExecutor(
+        jobs, initializer=_init_worker, initargs=(settings,)
+    ) as executor:
+        write(executor.map(_run_worker_item, commands, chunksize=CHUNKSIZE))
+    return failures
+
+
+def run_batch_file(path: str, settings: "Settings", jobs: int = 1) -> int:
+    """
+    Run the commands of a batch file, or of stdin with -
+    :param path:
+    :type path: str
+    :param settings:
+    :type settings: Settings
+    :param jobs:
+    :type jobs: int
+    :return: the number of the failed commands
+    :rtype: int
+    """
+    if path == "-":
+        return run_batch(sys.stdin, settings, jobs)
+    with open(path, encoding="utf-8") as fp:
+        return run_batch(fp, settings, jobs)
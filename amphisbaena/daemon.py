@@ -0,0 +1,405 @@
+"""
+A warm process running the commands sent over a Unix socket
+
+    amphisbaena --serve /run/user/1000/amphisbaena.sock &
+    AMPHISBAENA_SOCKET=/run/user/1000/amphisbaena.sock amphisbaena -s A=1
+
+The daemon imports the modules, reads the default settings and configures the
+logging once; with AMPHISBAENA_SOCKET set, the entrypoint is a thin client
+forwarding its arguments, its working directory and its AMPHISBAENA_*
+environment variables, and printing back the output and the exit status of
+the command, or running it in its own process when no daemon listens. The
+commands reading stdin, i.e. -S -, serving or running a batch always run in
+the process of the client.
+"""
+import io
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import orjson
+
+if TYPE_CHECKING:
+    from amphisbaena.settings import Settings
+
+# The length of the messages, before each of them
+HEADER = struct.Struct("!I")
+
+# The prefix of the environment variables forwarded by the clients
+ENV_PREFIX = "AMPHISBAENA_"
+
+# The options of the commands always run in the process of the client
+LOCAL_OPTIONS = ("--batch", "--serve")
+
+# The seconds a client waits for the daemon to accept and to run its command
+CLIENT_TIMEOUT = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """
+
+    :param sock:
+    :type sock: socket.socket
+    :param message:
+    :type message: Dict[str, Any]
+    :return:
+    :rtype: None
+    """
+    data = orjson.dumps(message)
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """
+    The bytes, or None when the peer closes the connection before sending them
+    :param sock:
+    :type sock: socket.socket
+    :param size:
+    :type size: int
+    :return:
+    :rtype: Optional[bytes]
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """
+
+    :param sock:
+    :type sock: socket.socket
+    :return:
+    :rtype: Optional[Dict[str, Any]]
+    """
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    data = _recv_exactly(sock, HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return orjson.loads(data)
+
+
+def _is_option(arg: str, option: str) -> bool:
+    """
+    Whether the argument is the long option, with or without its value, or an
+    abbreviation of it as argparse accepts them
+    :param arg:
+    :type arg: str
+    :param option:
+    :type option: str
+    :return:
+    :rtype: bool
+    """
+    name = arg.split("=", 1)[0]
+    return len(name) > 2 and name.startswith("--") and option.startswith(name)
+
+
+def reads_stdin(argv: Sequence[str]) -> bool:
+    """
+    Whether the command reads stdin, with -S -
+    :param argv:
+    :type argv: Sequence[str]
+    :return:
+    :rtype: bool
+    """
+    for index, arg in enumerate(argv):
+        if arg == "-S-" or (_is_option(arg, "--settings-file") and arg.endswith("=-")):
+            return True
+        if arg == "-S" or (_is_option(arg, "--settings-file") and "=" not in arg):
+            if index + 1 < len(argv) and argv[index + 1] == "-":
+                return True
+    return False
+
+
+def has_local_option(argv: Sequence[str]) -> bool:
+    """
+    Whether the command serves or runs a batch, with any of the forms of their
+    options argparse accepts
+    :param argv:
+    :type argv: Sequence[str]
+    :return:
+    :rtype: bool
+    """
+    return any(_is_option(x, option) for x in argv for option in LOCAL_OPTIONS)
+
+
+def is_forwardable(argv: Sequence[str]) -> bool:
+    """
+    Whether the command can run in a daemon: it neither serves nor runs a
+    batch, which would block the daemon, nor reads stdin
+    :param argv:
+    :type argv: Sequence[str]
+    :return:
+    :rtype: bool
+    """
+    return not has_local_option(argv) and not reads_stdin(argv)
+
+
+def forwarded_environ(environ: Mapping[str, str] = None) -> Dict[str, str]:
+    """
+    The AMPHISBAENA_* variables of the environment
+    :param environ: os.environ with None
+    :type environ: Mapping[str, str]
+    :return:
+    :rtype: Dict[str, str]
+    """
+    variables = os.environ if environ is None else environ
+    return {k: v for k, v in variables.items() if k.startswith(ENV_PREFIX)}
+
+
+@contextmanager
+def client_context(cwd: Optional[str], environ: Dict[str, str]) -> Generator:
+    """
+    Run the block in the working directory and with the AMPHISBAENA_*
+    environment variables of the client, restoring the ones of the daemon on
+    exit; the daemon runs a single command at a time
+    :param cwd:
+    :type cwd: Optional[str]
+    :param environ:
+    :type environ: Dict[str, str]
+    :return:
+    :rtype: Generator
+    """
+    previous_cwd = os.getcwd()
+    previous_environ = forwarded_environ()
+    try:
+        if cwd is not None:
+            os.chdir(cwd)
+        for k in previous_environ:
+            del os.environ[k]
+        os.environ.update(forwarded_environ(environ))
+        yield
+    finally:
+        for k in [x for x in os.environ if x.startswith(ENV_PREFIX)]:
+            del os.environ[k]
+        os.environ.update(previous_environ)
+        os.chdir(previous_cwd)
+
+
+def run_command(argv: Sequence[str], settings: "Settings" = None) -> int:
+    """
+    Run the command as the entrypoint does, returning the exit status instead
+    of exiting
+    :param argv:
+    :type argv: Sequence[str]
+    :param settings: the base of the settings of the command
+    :type settings: Settings
+    :return:
+    :rtype: int
+    """
+    # pylint: disable=import-outside-toplevel
+    from amphisbaena.__main__ import is_unexpected, run
+
+    result = run(argv, settings)
+    error = result.error
+    if error is not None and is_unexpected(result):
+        traceback.print_exception(type(error), error, error.__traceback__)
+    return result.status
+
+
+def run_captured(
+    argv: Sequence[str], settings: "Settings" = None
+) -> Tuple[int, str, str]:
+    """
+    Run the command capturing its output
+    :param argv:
+    :type argv: Sequence[str]
+    :param settings: the base of the settings of the command
+    :type settings: Settings
+    :return: the exit status, the stdout and the stderr
+    :rtype: Tuple[int, str, str]
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        status = run_command(argv, settings)
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+class CommandHandler(socketserver.BaseRequestHandler):
+    """
+    Run the command of a request and send back its result
+    """
+
+    def handle(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        message = recv_message(self.request)
+        if message is None:
+            return
+
+        argv = message["argv"]
+        if not is_forwardable(argv):
+            status, stdout = os.EX_USAGE, ""
+            stderr = (
+                f"the command can not run in the daemon: it reads stdin or uses "
+                f"{' or '.join(LOCAL_OPTIONS)}\n"
+            )
+        else:
+            try:
+                server = cast(CommandServer, self.server)
+                with client_context(message.get("cwd"), message.get("env", {})):
+                    status, stdout, stderr = run_captured(argv, server.settings)
+            except OSError as exc:
+                status, stdout, stderr = os.EX_OSERR, "", f"{exc}\n"
+
+        send_message(
+            self.request, {"status": status, "stdout": stdout, "stderr": stderr}
+        )
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """
+    Serve the commands one at a time: a command owns the process wide state,
+    e.g. sys.stdout and the logging, while it runs
+    """
+
+    def __init__(self, path: Union[str, Path], settings: "Settings" = None):
+        """
+        The socket is only accessible by the user running the daemon
+        :param path:
+        :type path: Union[str, Path]
+        :param settings: the base of the settings of the commands, the default
+            settings with None
+        :type settings: Settings
+        """
+        self.path = Path(path)
+        self.settings = settings
+        if self.path.exists():
+            if is_serving(self.path):
+                raise OSError(f"a daemon already serves on {self.path}")
+            self.path.unlink()
+
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(self.path), CommandHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        super().server_close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def is_serving(path: Union[str, Path]) -> bool:
+    """
+    Whether a daemon accepts the connections on the socket
+    :param path:
+    :type path: Union[str, Path]
+    :return:
+    :rtype: bool
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(path: Union[str, Path]) -> None:
+    """
+    Warm up the settings and the logging, and serve until interrupted or
+    terminated
+    :param path:
+    :type path: Union[str, Path]
+    :return:
+    :rtype: None
+    """
+    # pylint: disable=import-outside-toplevel
+    from amphisbaena.__main__ import set_logging
+    from amphisbaena.settings import Settings
+
+    settings = Settings(default_settings=True)
+    set_logging(settings)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    with CommandServer(path, settings) as server:
+        logger.info("Serve on %s", path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request(path: Union[str, Path], argv: Sequence[str]) -> Dict[str, Any]:
+    """
+    Send the command, with the working directory and the AMPHISBAENA_*
+    environment variables, to the daemon and wait for its result; only the
+    FileNotFoundError and the ConnectionRefusedError of the connection tell
+    that no daemon listens, the command may have run on any other error
+    :param path:
+    :type path: Union[str, Path]
+    :param argv:
+    :type argv: Sequence[str]
+    :return:
+    :rtype: Dict[str, Any]
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        sock.connect(str(path))
+        send_message(
+            sock,
+            {
+                "argv": list(argv),
+                "cwd": os.getcwd(),
+                "env": forwarded_environ(),
+            },
+        )
+        response = recv_message(sock)
+    if response is None:
+        raise ConnectionError(f"the daemon on {path} closed the connection")
+    return response
+
+
+def forward(path: Union[str, Path], argv: Sequence[str]) -> int:
+    """
+    Run the command in the daemon, printing its output
+    :param path:
+    :type path: Union[str, Path]
+    :param argv:
+    :type argv: Sequence[str]
+    :return: the exit status
+    :rtype: int
+    """
+    response = request(path, argv)
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["status"]
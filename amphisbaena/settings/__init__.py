@@ -3,203 +3,269 @@ Settings
 """
 from __future__ import annotations
 
-from collections.abc import MutableMapping
-from contextlib import contextmanager
-from dataclasses import dataclass
+import copyreg
+import sys
+from collections import defaultdict
 from importlib import import_module
+from importlib.machinery import ModuleSpec
 from importlib.util import find_spec
 from pathlib import Path
+from threading import get_ident
 from types import ModuleType
-from typing import Any, Dict, Generator, Iterator, Mapping, Union
-
-import orjson
-import yaml
-
-# The pair of priority and priority_value
-PRIORITIES: Dict[str, int] = {
-    "default": 0,
-    "project": 20,
-    "env": 40,
-    "cmd": 60,
-}
-
-
-class SettingsException(Exception):
-    """
-    The base exception
-    """
-
-
-class SettingNameNotUpperException(SettingsException):
-    """
-    The name of setting is not upper case
-    """
-
-
-class CompareWithNotSettingException(SettingsException):
-    """
-    Compare with not Setting exception
-    """
-
-
-class CompareWithNotSameNameSettingException(SettingsException):
-    """
-    Compare with not same name Setting
-    """
-
-
-class SettingsFrozenException(SettingsException):
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .exceptions import (
+    CompareWithNotSameNameSettingException,
+    CompareWithNotSettingException,
+    SettingDependencyCycleException,
+    SettingNameNotUpperException,
+    SettingReferenceNotFoundException,
+    SettingsException,
+    SettingsFrozenException,
+    SettingsLowOrEqualPriorityException,
+    SettingsNotFrozenException,
+    SettingsReadsNotTrackedException,
+    SettingsSerializationException,
+    UnknownConfigFormatException,
+)
+from . import aio
+from .base import PRIORITIES, BaseSettings, Setting
+from .interpolation import TEMPLATES, compile_value
+from .lazy import LazyAttribute, LazyModule, module_names
+from .parsers import (
+    PARSERS,
+    Parser,
+    get_parser,
+    read_file,
+    read_json,
+    read_yaml,
+    register_parser,
+)
+from .profiler import LoadProfiler, get_profiler, measure, profile
+from .tracking import ReadReport, ReadTracker
+from .wire import dump_settings, load_settings
+
+# asyncio, orjson and yaml are imported where they are used, to keep them out
+# of the startup of the processes not using them
+if TYPE_CHECKING:
+    from .providers import SettingsProvider
+
+# The default settings layers by module name, with the spec of the module they
+# were read from: a reloaded module gets a new spec
+_DEFAULT_LAYERS: Dict[str, Tuple[Optional[ModuleSpec], Dict[str, Setting]]] = {}
+
+
+def default_layer(name: str) -> Optional[Dict[str, Setting]]:
     """
-    The exception when modify a frozen settings instance
+    The settings of a default settings module, read once per process and
+    shared by all the instances, or None when the module does not exist
+    :param name:
+    :type name: str
+    :return:
+    :rtype: Optional[Dict[str, Setting]]
     """
+    module = sys.modules.get(name)
+    if module is not None:
+        cached = _DEFAULT_LAYERS.get(name)
+        if cached is not None and cached[0] is module.__spec__:
+            return cached[1]
+    else:
+        with measure(name, "find_spec"):
+            spec = find_spec(name)
+        if spec is None:
+            return None
+
+    with measure(name, "import_module"):
+        module = import_module(name)
+    with measure(name, "settings") as record:
+        layer = {
+            k: Setting("default", k, getattr(module, k))
+            for k in dir(module)
+            if k.isupper()
+        }
+        record.keys = len(layer)
+    _DEFAULT_LAYERS[name] = (module.__spec__, layer)
+    return layer
 
 
-class SettingsLowOrEqualPriorityException(SettingsException):
-    """
-    The exception when modify a setting with a lower priority
-    """
-
-
-@dataclass
-class Setting:
+class Settings(BaseSettings):  # pylint: disable=too-many-ancestors
     """
-    The single setting container
+    settings class
     """
 
-    priority: str
-    name: str
-    value: Any
-
-    def __post_init__(self):
-        self.priority_value = PRIORITIES[self.priority]
-
-    def __eq__(self, other: object) -> bool:
+    def __init__(
+        self,
+        settings: Mapping = None,
+        priority: str = "project",
+        default_settings: Union[bool, str] = False,
+    ):
         """
 
-        :param other:
-        :type other: object
-        :return:
-        :rtype: bool
+        :param settings:
+        :type settings: Mapping
+        :param priority:
+        :type priority: str
+        :param default_settings:
+        :type default_settings: bool
         """
-        if not isinstance(other, self.__class__):
-            raise CompareWithNotSettingException
+        # computed settings, their cached values and the reverse dependencies
+        # recorded while evaluating them
+        self._computed: Dict[str, Callable[[Settings], Any]] = {}
+        self._computed_cache: Dict[str, Any] = {}
+        self._dependents: DefaultDict[str, Set[str]] = defaultdict(set)
+        # the stacks, per thread, of the computed settings being evaluated and
+        # the names each one has read so far; a dict rather than a
+        # threading.local keeps the instances picklable
+        self._tracking: Dict[int, List[Tuple[str, Set[str]]]] = {}
 
-        if self.priority != other.priority:  # type: ignore
-            return False
-        if self.name != other.name:  # type: ignore
-            return False
-        if self.value != other.value:  # type: ignore
-            return False
-        if self.priority_value != other.priority_value:  # type: ignore
-            return False
-        return True
-
-    def __lt__(self, other: object) -> bool:
-        """
+        super().__init__(settings, priority)
 
-        :param other:
-        :type other: object
-        :return:
-        :rtype: bool
-        """
-        if not isinstance(other, self.__class__):
-            raise CompareWithNotSettingException
-        if self.name != other.name:
-            raise CompareWithNotSameNameSettingException
-        return self.priority_value < other.priority_value
+        if default_settings is False:
+            return
 
-    def __le__(self, other: object) -> bool:
-        """
+        if default_settings is True:
+            default_settings = f"{self.__module__}.default_settings"
 
-        :param other:
-        :type other: object
+        layer = default_layer(default_settings)  # type: ignore
+        if layer:
+            # attach the shared default settings under the ones already set
+            with measure(default_settings, "attach") as record:  # type: ignore
+                data = self._data
+                data.update((k, v) for k, v in layer.items() if k not in data)
+                record.keys = len(layer)
+
+    # ---- computed settings --------------------------------------------------
+
+    @BaseSettings.frozen_check
+    def register_computed(self, name: str, func: Callable[[Settings], Any]) -> None:
+        """
+        Register a setting computed from the others
+
+        The function is called with this settings instance on the first read,
+        and the value is memoized until one of the settings read during the
+        evaluation changes. A setting stored with the same name takes
+        precedence over the computed one.
+        :param name:
+        :type name: str
+        :param func:
+        :type func: Callable[[Settings], Any]
         :return:
-        :rtype: bool
+        :rtype: None
         """
-        if not isinstance(other, self.__class__):
-            raise CompareWithNotSettingException
-        if self.name != other.name:
-            raise CompareWithNotSameNameSettingException
-        return self.priority_value <= other.priority_value
-
+        if not name.isupper():
+            raise SettingNameNotUpperException
 
-class BaseSettings(MutableMapping):
-    """
-    base settings class
-    """
+        self._computed[name] = func
+        self._invalidate(name)
 
-    class FrozenCheck:  # pylint: disable = too-few-public-methods
+    def _evaluate(self, k: str, func: Callable[[Settings], Any]) -> Any:
         """
-        A decorator for Settings frozen status check
+        Evaluate a computed setting with the dependency tracking
+        :param k:
+        :type k: str
+        :param func:
+        :type func: Callable[[Settings], Any]
+        :return:
+        :rtype: Any
         """
+        try:
+            return self._computed_cache[k]
+        except KeyError:
+            pass
+
+        ident = get_ident()
+        stack = self._tracking.get(ident, [])
+        if any(name == k for name, _ in stack):
+            raise SettingDependencyCycleException(k)
+
+        dependencies: Set[str] = set()
+        stack.append((k, dependencies))
+        self._tracking[ident] = stack
+        try:
+            value = func(self)
+        finally:
+            stack.pop()
+            if not stack:
+                del self._tracking[ident]
 
-        def __call__(self, method):
-            def frozen_check(settings: BaseSettings, *args, **kwargs):
-                if settings.is_frozen():
-                    raise SettingsFrozenException
-                return method(settings, *args, **kwargs)
-
-            return frozen_check
-
-    frozen_check = FrozenCheck()
+        for dependency in dependencies:
+            self._dependents[dependency].add(k)
+        self._computed_cache[k] = value
+        return value
 
-    def __init__(self, settings: Mapping = None, priority: str = "project"):
+    def _track(self, k: str) -> None:
         """
-
-        :param settings:
-        :type settings: Mapping
-        :param priority:
-        :type priority: str
+        Record the read as a dependency of the computed setting the current
+        thread is evaluating, if any
+        :param k:
+        :type k: str
+        :return:
+        :rtype: None
         """
-        self._priority = priority
-        self._skip_error = False
+        stack = self._tracking.get(get_ident())
+        if stack:
+            stack[-1][1].add(k)
 
-        self._data: Dict[str, Setting] = {}
-
-        self._frozen: bool = False
-
-        if settings:
-            self.update(settings)
-
-        self._frozen = True
-
-    def is_frozen(self) -> bool:
+    def _invalidate(self, k: str) -> None:
         """
-        check this settings class frozen or not
+        Drop the memoized values depending on the given setting, transitively
+        :param k:
+        :type k: str
         :return:
+        :rtype: None
         """
-        return self._frozen
+        self._computed_cache.pop(k, None)
+
+        pending: List[str] = [k]
+        while pending:
+            for dependent in self._dependents.pop(pending.pop(), ()):
+                self._computed_cache.pop(dependent, None)
+                pending.append(dependent)
 
-    @contextmanager
-    def unfreeze(self, priority: str = "project", skip_error=False) -> Generator:
+    def _resolve_lazy(self, module: LazyModule = None) -> None:
         """
-        A context manager to unfreeze this instance and keep the previous frozen
-        status
-        :param priority:
-        :type priority: str
-        :param skip_error:
-        :type skip_error: bool
+        Replace the lazy attributes of a module, or of all the modules, by their
+        values; the names the imported module does not define get back the
+        settings they replaced, or are dropped
+        :param module:
+        :type module: LazyModule
         :return:
-        :rtype: Generator
+        :rtype: None
         """
-        _priority: str
-        _priority, self._priority = self._priority, priority
-        _skip_error: bool
-        _skip_error, self._skip_error = self._skip_error, skip_error
-
-        status: bool
-        status, self._frozen = self._frozen, False
+        pending = list(self._data.items())
+        while pending:
+            k, setting = pending.pop()
+            value = setting.value
+            if not isinstance(value, LazyAttribute):
+                continue
+            if module not in (None, value.module):
+                continue
+            try:
+                setting.value = value.load()
+            except KeyError:
+                if value.replaced is None:
+                    del self._data[k]
+                    continue
+                self._data[k] = value.replaced
+                # the replaced setting may be lazy as well, from another module
+                if module is None:
+                    pending.append((k, value.replaced))
 
-        try:
-            yield self
-        finally:
-            self._priority = _priority
-            self._skip_error = _skip_error
-            self._frozen = status
-
-    # ---- abstract methods of MutableMapping ---------------------------------
-
-    @frozen_check
     def __setitem__(self, k: str, v: Any) -> None:
         """
 
@@ -210,17 +276,11 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: None
         """
-        if not k.isupper():
-            raise SettingNameNotUpperException
-
-        setting: Setting = Setting(self._priority, k, v)
-        if k in self and setting <= self._data[k]:
-            if not self._skip_error:
-                raise SettingsLowOrEqualPriorityException
-            return
-        self._data[k] = setting
+        setting = self._data.get(k)
+        super().__setitem__(k, v)
+        if self._data.get(k) is not setting:
+            self._invalidate(k)
 
-    @frozen_check
     def __delitem__(self, k: str) -> None:
         """
 
@@ -229,7 +289,8 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: None
         """
-        del self._data[k]
+        super().__delitem__(k)
+        self._invalidate(k)
 
     def __getitem__(self, k: str) -> Any:
         """
@@ -239,7 +300,31 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: Any
         """
-        return self._data[k].value
+        if self._tracking:
+            self._track(k)
+        if self._reads is not None:
+            self._reads.record(k)
+
+        try:
+            value = self._data[k].value
+        except KeyError:
+            if k not in self._computed:
+                raise
+            return self._evaluate(k, self._computed[k])
+
+        while isinstance(value, LazyAttribute):
+            self._resolve_lazy(value.module)
+            value = self._data[k].value
+        if isinstance(value, TEMPLATES):
+            try:
+                return self._evaluate(k, value.render)
+            except KeyError as exc:
+                # the key exists, so a missing reference must not read as a
+                # missing key, e.g. by get()
+                raise SettingReferenceNotFoundException(
+                    f"{k} references the missing setting {exc.args[0]}"
+                ) from exc
+        return value
 
     def __len__(self) -> int:
         """
@@ -247,7 +332,7 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: int
         """
-        return len(self._data)
+        return len(self._data) + sum(1 for k in self._computed if k not in self._data)
 
     def __iter__(self) -> Iterator[str]:
         """
@@ -255,7 +340,8 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: Iterator[str]
         """
-        return iter(self._data)
+        yield from self._data
+        yield from (k for k in self._computed if k not in self._data)
 
     def __contains__(self, k: str) -> bool:  # type: ignore
         """
@@ -265,92 +351,163 @@ class BaseSettings(MutableMapping):
         :return:
         :rtype: bool
         """
-        return k in self._data
-
-
-class Settings(BaseSettings):  # pylint: disable=too-many-ancestors
-    """
-    settings class
-    """
-
-    def __init__(
-        self,
-        settings: Mapping = None,
-        priority: str = "project",
-        default_settings: Union[bool, str] = False,
-    ):
-        """
-
-        :param settings:
-        :type settings: Mapping
-        :param priority:
-        :type priority: str
-        :param default_settings:
-        :type default_settings: bool
-        """
-        super().__init__(settings, priority)
+        return k in self._data or k in self._computed
 
-        if default_settings is False:
-            return
+    # ---- loaders ------------------------------------------------------------
 
-        if default_settings is True:
-            default_settings = f"{self.__module__}.default_settings"
-
-        if find_spec(default_settings):  # type: ignore
-            with self.unfreeze("default", skip_error=True) as settings_:
-                settings_.load_module(default_settings)  # pylint: disable=no-member
-
-    def load_module(self, module: Union[ModuleType, str]) -> None:
+    def load_module(self, module: Union[ModuleType, str], lazy: bool = False) -> None:
         """
-
+        With lazy, the names of a module given by name are read from its source
+        and the module is only imported when one of them is first read
         :param module:
         :type module: Union[ModuleType, str]
+        :param lazy:
+        :type lazy: bool
         :return:
         :rtype: None
         """
+        if isinstance(module, str) and lazy:
+            names = module_names(module)
+            if names is not None:
+                lazy_module = LazyModule(module)
+                for key in names:
+                    self[key] = LazyAttribute(lazy_module, key, self._data.get(key))
+                return
+
         if isinstance(module, str):
-            module = import_module(module)
+            with measure(module, "import_module"):
+                module = import_module(module)
 
-        for key in filter(lambda x: x.isupper(), dir(module)):
-            self[key] = getattr(module, key)
+        with measure(module.__name__, "settings") as record:
+            for key in filter(lambda x: x.isupper(), dir(module)):
+                self[key] = getattr(module, key)
+                record.keys += 1
 
-    def load_yaml(self, yml: Union[str, Path]) -> None:
+    def _load_mapping(
+        self, mapping: Mapping, interpolate: bool = False, source: str = "mapping"
+    ) -> None:
+        """
+
+        :param mapping:
+        :type mapping: Mapping
+        :param interpolate:
+        :type interpolate: bool
+        :param source: the name of the source in the profiler records
+        :type source: str
+        :return:
+        :rtype: None
         """
+        with measure(source, "settings") as record:
+            if interpolate:
+                mapping = {k: compile_value(v) for k, v in mapping.items()}
+            self.update(mapping)
+            record.keys = len(mapping)
 
+    def load_yaml(
+        self,
+        yml: Union[str, Path],
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> None:
+        """
+        With interpolate, the ${KEY} references in string values, at any depth of
+        the dicts and lists, are compiled once and resolved on read, against the
+        settings of any priority
         :param yml:
         :type yml: Union[str, Path]
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
         :return:
         :rtype: None
         """
-        if isinstance(yml, str):
-            yml = Path(yml)
-
-        with yml.open() as fh:  # pylint: disable=invalid-name
-            yml_ = yaml.safe_load(fh)
+        yml_ = read_yaml(yml, keys=keys, prefixes=prefixes)
 
         if yml_:
-            self.update(yml_)
-
-    def load_json(self, json: Union[str, Path]) -> None:
-        """
+            self._load_mapping(yml_, interpolate, str(yml))
 
+    def load_json(
+        self,
+        json: Union[str, Path],
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> None:
+        """
+        With interpolate, the ${KEY} references in string values, at any depth of
+        the dicts and lists, are compiled once and resolved on read, against the
+        settings of any priority
         :param json:
         :type json: Union[str, Path]
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
         :return:
         :rtype: None
         """
-        if isinstance(json, str):
-            json = Path(json)
-
-        with json.open("rb") as fh:  # pylint: disable=invalid-name
-            json_ = orjson.loads(fh.read())
+        json_ = read_json(json, keys=keys, prefixes=prefixes)
 
         if json_:
-            self.update(json_)
+            self._load_mapping(json_, interpolate, str(json))
+
+    def load_file(
+        self,
+        path: Union[str, Path],
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> None:
+        """
+        Load a configuration file in any format of the parser registry,
+        selected by the suffix or by sniffing the content
+        :param path:
+        :type path: Union[str, Path]
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
+        :return:
+        :rtype: None
+        """
+        content = read_file(path, keys=keys, prefixes=prefixes)
+
+        if content:
+            self._load_mapping(content, interpolate, str(path))
+
+    def load_provider(
+        self, provider: SettingsProvider, interpolate: bool = False
+    ) -> None:
+        """
+
+        :param provider:
+        :type provider: SettingsProvider
+        :param interpolate:
+        :type interpolate: bool
+        :return:
+        :rtype: None
+        """
+        snapshot = provider.load()
+
+        if snapshot.settings:
+            self._load_mapping(
+                snapshot.settings, interpolate, type(provider).__name__
+            )
 
     @classmethod
     def from_module(
-        cls, module: Union[ModuleType, str], priority: str = "project"
+        cls,
+        module: Union[ModuleType, str],
+        priority: str = "project",
+        lazy: bool = False,
     ) -> Settings:
         """
 
@@ -358,50 +515,365 @@ class Settings(BaseSettings):  # pylint: disable=too-many-ancestors
         :type module: Union[ModuleType, str]
         :param priority:
         :type priority: str
+        :param lazy:
+        :type lazy: bool
         :return:
         :rtype: Settings
         """
         obj = cls()
         with obj.unfreeze(priority) as obj_:
-            obj_.load_module(module)  # pylint: disable=no-member
+            obj_.load_module(module, lazy)  # pylint: disable=no-member
         return obj
 
     @classmethod
-    def from_yaml(cls, yml: Union[str, Path], priority: str = "project") -> Settings:
+    def from_yaml(
+        cls,
+        yml: Union[str, Path],
+        priority: str = "project",
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> Settings:
         """
 
         :param yml:
         :type yml: Union[str, Path]
         :param priority:
         :type priority: str
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
         :return:
         :rtype: Settings
         """
         obj = cls()
         with obj.unfreeze(priority) as obj_:
-            obj_.load_yaml(yml)  # pylint: disable=no-member
+            obj_.load_yaml(
+                yml, interpolate, keys, prefixes
+            )  # pylint: disable=no-member
         return obj
 
     @classmethod
-    def from_json(cls, json: Union[str, Path], priority: str = "project") -> Settings:
+    def from_json(
+        cls,
+        json: Union[str, Path],
+        priority: str = "project",
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> Settings:
         """
 
         :param json:
         :type json: Union[str, Path]
         :param priority:
         :type priority: str
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
         :return:
         :rtype: Settings
         """
         obj = cls()
         with obj.unfreeze(priority) as obj_:
-            obj_.load_json(json)  # pylint: disable=no-member
+            obj_.load_json(
+                json, interpolate, keys, prefixes
+            )  # pylint: disable=no-member
         return obj_
 
+    @classmethod
+    def from_file(
+        cls,
+        path: Union[str, Path],
+        priority: str = "project",
+        interpolate: bool = False,
+        keys: Iterable[str] = None,
+        prefixes: Iterable[str] = None,
+    ) -> Settings:
+        """
+
+        :param path:
+        :type path: Union[str, Path]
+        :param priority:
+        :type priority: str
+        :param interpolate:
+        :type interpolate: bool
+        :param keys: only load these top level keys
+        :type keys: Iterable[str]
+        :param prefixes: only load the top level keys with these prefixes
+        :type prefixes: Iterable[str]
+        :return:
+        :rtype: Settings
+        """
+        obj = cls()
+        with obj.unfreeze(priority) as obj_:
+            obj_.load_file(
+                path, interpolate, keys, prefixes
+            )  # pylint: disable=no-member
+        return obj
+
+    # the async loaders, reading and parsing the files in an executor
+    afrom_yaml = classmethod(aio.afrom_yaml)
+    afrom_json = classmethod(aio.afrom_json)
+    afrom_file = classmethod(aio.afrom_file)
+
+    @classmethod
+    def from_provider(
+        cls,
+        provider: SettingsProvider,
+        priority: str = "project",
+        interpolate: bool = False,
+    ) -> Settings:
+        """
+
+        :param provider:
+        :type provider: SettingsProvider
+        :param priority:
+        :type priority: str
+        :param interpolate:
+        :type interpolate: bool
+        :return:
+        :rtype: Settings
+        """
+        obj = cls()
+        with obj.unfreeze(priority) as obj_:
+            obj_.load_provider(provider, interpolate)  # pylint: disable=no-member
+        return obj
+
+    # ---- serialization ------------------------------------------------------
+
+    def dumps(self) -> bytes:
+        """
+        Serialize the values and priorities into the compact binary layout of
+        the wire format; the computed settings are not serialized
+        :return:
+        :rtype: bytes
+        """
+        self._resolve_lazy()
+        return dump_settings(self._priority, self._data)
+
+    @classmethod
+    def loads(cls, data: bytes) -> Settings:
+        """
+        Deserialize the settings written by dumps
+
+        The payload is read by marshal, so it must come from a trusted peer, as
+        with pickle.
+        :param data:
+        :type data: bytes
+        :return:
+        :rtype: Settings
+        """
+        obj = cls()
+        obj._read_wire(data)  # pylint: disable=protected-access
+        return obj
+
+    def _read_wire(self, data: bytes) -> None:
+        """
+        Replace the settings by the ones in the wire format
+        :param data:
+        :type data: bytes
+        :return:
+        :rtype: None
+        """
+        self._priority, self._data = load_settings(data)
+
+    def __reduce__(self):
+        """
+        Pickle through the wire format, falling back to the instance state for
+        the values marshal does not support or the computed settings
+        :return:
+        """
+        if not self._computed:
+            try:
+                return self.__class__.loads, (self.dumps(),)
+            except SettingsSerializationException:
+                pass
+        return copyreg.__newobj__, (self.__class__,), self.__dict__
+
+    def copy_to_dict(self) -> Dict[str, Any]:
+        """
+        Read the values straight from the storage, resolving only the templates
+        and the computed settings through __getitem__
+        :return:
+        :rtype: Dict[str, Any]
+        """
+        self._resolve_lazy()
+
+        data = {
+            k: self[k] if isinstance(setting.value, TEMPLATES) else setting.value
+            for k, setting in self._data.items()
+        }
+        for k in self._computed:
+            if k not in data:
+                data[k] = self[k]
+        return data
+
+    def to_json_bytes(self, default: Callable[[Any], Any] = None) -> bytes:
+        """
+        Serialize the effective values into JSON
+        :param default: serialize the values orjson does not support
+        :type default: Callable[[Any], Any]
+        :return:
+        :rtype: bytes
+        """
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        return orjson.dumps(self.copy_to_dict(), default=default)
+
+    def to_yaml(self, stream: IO = None) -> Optional[str]:
+        """
+        Serialize the effective values into YAML, with the LibYAML dumper when
+        it is available
+        :param stream: write into the stream instead of returning a string
+        :type stream: IO
+        :return:
+        :rtype: Optional[str]
+        """
+        import yaml  # pylint: disable=import-outside-toplevel
+
+        from .yaml_parser import YamlDumper  # pylint: disable=import-outside-toplevel
+
+        return yaml.dump(
+            self.copy_to_dict(), stream, Dumper=YamlDumper, sort_keys=False
+        )
+
+
+class SettingsOverlay(Settings):  # pylint: disable=too-many-ancestors
+    """
+    The overrides over a shared frozen base settings, e.g. for a tenant
+
+    Only the overrides are stored, the reads of the other names fall through to
+    the base. The overrides take precedence over the base whatever their
+    priorities, and the values of the base are resolved against the base. dumps
+    serializes the overrides only.
+    """
+
+    def __init__(
+        self,
+        base: Settings,
+        settings: Mapping = None,
+        priority: str = "project",
+    ):
+        """
+
+        :param base:
+        :type base: Settings
+        :param settings:
+        :type settings: Mapping
+        :param priority:
+        :type priority: str
+        """
+        if not base.is_frozen():
+            raise SettingsNotFrozenException
+
+        self._base = base
+        super().__init__(settings, priority)
+
+    @property
+    def base(self) -> Settings:
+        """
+
+        :return:
+        :rtype: Settings
+        """
+        return self._base
+
+    def _is_overridden(self, k: str) -> bool:
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: bool
+        """
+        return k in self._data or k in self._computed
+
+    def __getitem__(self, k: str) -> Any:
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: Any
+        """
+        if self._is_overridden(k):
+            return super().__getitem__(k)
+
+        if self._tracking:
+            self._track(k)
+        if self._reads is not None:
+            self._reads.record(k)
+        return self._base[k]
+
+    def __len__(self) -> int:
+        """
+
+        :return:
+        :rtype: int
+        """
+        return len(self._base) + sum(
+            1 for k in super().__iter__() if k not in self._base
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """
+
+        :return:
+        :rtype: Iterator[str]
+        """
+        yield from super().__iter__()
+        yield from (k for k in self._base if not self._is_overridden(k))
+
+    def __contains__(self, k: str) -> bool:  # type: ignore
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: bool
+        """
+        return self._is_overridden(k) or k in self._base
+
     def copy_to_dict(self) -> Dict[str, Any]:
         """
 
         :return:
         :rtype: Dict[str, Any]
         """
-        return dict(self.items())
+        data = self._base.copy_to_dict()
+        data.update(super().copy_to_dict())
+        return data
+
+    @classmethod
+    def _from_wire(cls, base: Settings, data: bytes) -> SettingsOverlay:
+        """
+
+        :param base:
+        :type base: Settings
+        :param data:
+        :type data: bytes
+        :return:
+        :rtype: SettingsOverlay
+        """
+        obj = cls(base)
+        obj._read_wire(data)  # pylint: disable=protected-access
+        return obj
+
+    def __reduce__(self):
+        """
+        Pickle the base along with the overrides in the wire format
+        :return:
+        """
+        if not self._computed:
+            try:
+                return self.__class__._from_wire, (self._base, self.dumps())
+            except SettingsSerializationException:
+                pass
+        return copyreg.__newobj__, (self.__class__,), self.__dict__
@@ -0,0 +1,170 @@
+"""
+The async loaders of settings, reading and parsing the files in an executor so
+that the event loop is not blocked; they are the afrom_* class methods of
+Settings
+"""
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Type, Union
+
+from .parsers import read_file, read_json, read_yaml
+from .profiler import get_profiler
+
+# asyncio is imported where it is used, to keep it out of the startup of the
+# processes not using it
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from . import Settings
+
+
+async def _read(
+    reader: Callable[..., Any],
+    path: Union[str, Path],
+    executor: Optional[Executor],
+    filters: Dict[str, Optional[Iterable[str]]],
+) -> Any:
+    """
+    Read and parse the file in the executor; when the awaiting task is
+    cancelled, the parsed content is discarded
+    :param reader:
+    :type reader: Callable[..., Any]
+    :param path:
+    :type path: Union[str, Path]
+    :param executor:
+    :type executor: Optional[Executor]
+    :param filters: the keys and prefixes filters of the reader
+    :type filters: Dict[str, Optional[Iterable[str]]]
+    :return:
+    :rtype: Any
+    """
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+    from contextvars import copy_context
+
+    call = partial(reader, path, **filters)
+    if get_profiler() is not None and not isinstance(executor, ProcessPoolExecutor):
+        # the threads of the executor do not inherit the enabled profiler
+        call = partial(copy_context().run, call)
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+def _build(
+    cls: Type[Settings],
+    content: Any,
+    path: Union[str, Path],
+    priority: str,
+    interpolate: bool,
+) -> Settings:
+    """
+    Build the settings on the event loop once the parsing is complete
+    :param cls:
+    :type cls: Type[Settings]
+    :param content:
+    :type content: Any
+    :param path:
+    :type path: Union[str, Path]
+    :param priority:
+    :type priority: str
+    :param interpolate:
+    :type interpolate: bool
+    :return:
+    :rtype: Settings
+    """
+    obj = cls()
+    if content:
+        with obj.unfreeze(priority) as obj_:
+            obj_._load_mapping(  # pylint: disable=protected-access
+                content, interpolate, str(path)
+            )
+    return obj
+
+
+async def afrom_yaml(
+    cls: Type[Settings],
+    yml: Union[str, Path],
+    priority: str = "project",
+    interpolate: bool = False,
+    executor: Executor = None,
+    **filters: Optional[Iterable[str]],
+) -> Settings:
+    """
+    The counterpart of from_yaml not blocking the event loop
+    :param cls:
+    :type cls: Type[Settings]
+    :param yml:
+    :type yml: Union[str, Path]
+    :param priority:
+    :type priority: str
+    :param interpolate:
+    :type interpolate: bool
+    :param executor: the default executor of the loop with None
+    :type executor: Executor
+    :param filters: the keys and prefixes filters of from_yaml
+    :type filters: Optional[Iterable[str]]
+    :return:
+    :rtype: Settings
+    """
+    content = await _read(read_yaml, yml, executor, filters)
+    return _build(cls, content, yml, priority, interpolate)
+
+
+async def afrom_json(
+    cls: Type[Settings],
+    json: Union[str, Path],
+    priority: str = "project",
+    interpolate: bool = False,
+    executor: Executor = None,
+    **filters: Optional[Iterable[str]],
+) -> Settings:
+    """
+    The counterpart of from_json not blocking the event loop
+    :param cls:
+    :type cls: Type[Settings]
+    :param json:
+    :type json: Union[str, Path]
+    :param priority:
+    :type priority: str
+    :param interpolate:
+    :type interpolate: bool
+    :param executor: the default executor of the loop with None
+    :type executor: Executor
+    :param filters: the keys and prefixes filters of from_json
+    :type filters: Optional[Iterable[str]]
+    :return:
+    :rtype: Settings
+    """
+    content = await _read(read_json, json, executor, filters)
+    return _build(cls, content, json, priority, interpolate)
+
+
+async def afrom_file(
+    cls: Type[Settings],
+    path: Union[str, Path],
+    priority: str = "project",
+    interpolate: bool = False,
+    executor: Executor = None,
+    **filters: Optional[Iterable[str]],
+) -> Settings:
+    """
+    The counterpart of from_file not blocking the event loop
+    :param cls:
+    :type cls: Type[Settings]
+    :param path:
+    :type path: Union[str, Path]
+    :param priority:
+    :type priority: str
+    :param interpolate:
+    :type interpolate: bool
+    :param executor: the default executor of the loop with None
+    :type executor: Executor
+    :param filters: the keys and prefixes filters of from_file
+    :type filters: Optional[Iterable[str]]
+    :return:
+    :rtype: Settings
+    """
+    content = await _read(read_file, path, executor, filters)
+    return _build(cls, content, path, priority, interpolate)
@@ -0,0 +1,272 @@
+"""
+The setting container and the base settings mapping, with the priorities
+"""
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Generator, Iterator, Mapping, Optional
+
+from .exceptions import (
+    CompareWithNotSameNameSettingException,
+    CompareWithNotSettingException,
+    SettingNameNotUpperException,
+    SettingsFrozenException,
+    SettingsLowOrEqualPriorityException,
+    SettingsReadsNotTrackedException,
+)
+from .tracking import ReadReport, ReadTracker
+
+# The pair of priority and priority_value
+PRIORITIES: Dict[str, int] = {
+    "default": 0,
+    "project": 20,
+    "env": 40,
+    "cmd": 60,
+}
+
+
+@dataclass
+class Setting:
+    """
+    The single setting container
+    """
+
+    priority: str
+    name: str
+    value: Any
+
+    def __post_init__(self):
+        self.priority_value = PRIORITIES[self.priority]
+
+    def __eq__(self, other: object) -> bool:
+        """
+
+        :param other:
+        :type other: object
+        :return:
+        :rtype: bool
+        """
+        if not isinstance(other, self.__class__):
+            raise CompareWithNotSettingException
+
+        if self.priority != other.priority:  # type: ignore
+            return False
+        if self.name != other.name:  # type: ignore
+            return False
+        if self.value != other.value:  # type: ignore
+            return False
+        if self.priority_value != other.priority_value:  # type: ignore
+            return False
+        return True
+
+    def __lt__(self, other: object) -> bool:
+        """
+
+        :param other:
+        :type other: object
+        :return:
+        :rtype: bool
+        """
+        if not isinstance(other, self.__class__):
+            raise CompareWithNotSettingException
+        if self.name != other.name:
+            raise CompareWithNotSameNameSettingException
+        return self.priority_value < other.priority_value
+
+    def __le__(self, other: object) -> bool:
+        """
+
+        :param other:
+        :type other: object
+        :return:
+        :rtype: bool
+        """
+        if not isinstance(other, self.__class__):
+            raise CompareWithNotSettingException
+        if self.name != other.name:
+            raise CompareWithNotSameNameSettingException
+        return self.priority_value <= other.priority_value
+
+
+class BaseSettings(MutableMapping):
+    """
+    base settings class
+    """
+
+    class FrozenCheck:  # pylint: disable = too-few-public-methods
+        """
+        A decorator for Settings frozen status check
+        """
+
+        def __call__(self, method):
+            def frozen_check(settings: BaseSettings, *args, **kwargs):
+                if settings.is_frozen():
+                    raise SettingsFrozenException
+                return method(settings, *args, **kwargs)
+
+            return frozen_check
+
+    frozen_check = FrozenCheck()
+
+    def __init__(self, settings: Mapping = None, priority: str = "project"):
+        """
+
+        :param settings:
+        :type settings: Mapping
+        :param priority:
+        :type priority: str
+        """
+        self._priority = priority
+        self._skip_error = False
+
+        self._data: Dict[str, Setting] = {}
+        # the tracker of the reads, when they are tracked
+        self._reads: Optional[ReadTracker] = None
+
+        self._frozen: bool = False
+
+        if settings:
+            self.update(settings)
+
+        self._frozen = True
+
+    def is_frozen(self) -> bool:
+        """
+        check this settings class frozen or not
+        :return:
+        """
+        return self._frozen
+
+    @contextmanager
+    def unfreeze(self, priority: str = "project", skip_error=False) -> Generator:
+        """
+        A context manager to unfreeze this instance and keep the previous frozen
+        status
+        :param priority:
+        :type priority: str
+        :param skip_error:
+        :type skip_error: bool
+        :return:
+        :rtype: Generator
+        """
+        _priority: str
+        _priority, self._priority = self._priority, priority
+        _skip_error: bool
+        _skip_error, self._skip_error = self._skip_error, skip_error
+
+        status: bool
+        status, self._frozen = self._frozen, False
+
+        try:
+            yield self
+        finally:
+            self._priority = _priority
+            self._skip_error = _skip_error
+            self._frozen = status
+
+    def track_reads(self, sample_rate: int = 100) -> ReadTracker:
+        """
+        Start tracking the reads of this instance, replacing any previous
+        tracker
+        :param sample_rate: count one read in about this number of reads
+        :type sample_rate: int
+        :return:
+        :rtype: ReadTracker
+        """
+        self._reads = ReadTracker(sample_rate)
+        return self._reads
+
+    def untrack_reads(self) -> Optional[ReadTracker]:
+        """
+        Stop tracking the reads
+        :return: the tracker, if the reads were tracked
+        :rtype: Optional[ReadTracker]
+        """
+        tracker, self._reads = self._reads, None
+        return tracker
+
+    def read_report(self, top: int = 20) -> ReadReport:
+        """
+        The hot and never read keys since the reads are tracked
+        :param top: the number of hot keys
+        :type top: int
+        :return:
+        :rtype: ReadReport
+        """
+        if self._reads is None:
+            raise SettingsReadsNotTrackedException
+        return self._reads.report(self, top)
+
+    # ---- abstract methods of MutableMapping ---------------------------------
+
+    @frozen_check
+    def __setitem__(self, k: str, v: Any) -> None:
+        """
+
+        :param k:
+        :type k: str
+        :param v:
+        :type v: Any
+        :return:
+        :rtype: None
+        """
+        if not k.isupper():
+            raise SettingNameNotUpperException
+
+        setting: Setting = Setting(self._priority, k, v)
+        if k in self._data and setting <= self._data[k]:
+            if not self._skip_error:
+                raise SettingsLowOrEqualPriorityException
+            return
+        self._data[k] = setting
+
+    @frozen_check
+    def __delitem__(self, k: str) -> None:
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: None
+        """
+        del self._data[k]
+
+    def __getitem__(self, k: str) -> Any:
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: Any
+        """
+        if self._reads is not None:
+            self._reads.record(k)
+        return self._data[k].value
+
+    def __len__(self) -> int:
+        """
+
+        :return:
+        :rtype: int
+        """
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+
+        :return:
+        :rtype: Iterator[str]
+        """
+        return iter(self._data)
+
+    def __contains__(self, k: str) -> bool:  # type: ignore
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: bool
+        """
+        return k in self._data
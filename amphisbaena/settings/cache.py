@@ -0,0 +1,194 @@
+"""
+A cache of the settings loaded from files
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from amphisbaena.settings import Settings
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached settings with the modification time and size of its file
+    """
+
+    mtime: int
+    size: int
+    settings: Settings
+
+
+@dataclass
+class CacheStats:
+    """
+    The counters of a settings cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class SettingsCache:
+    """
+    Settings loaded from files on demand, keyed by path and modification time
+
+    The least recently used settings are evicted beyond the bounds in entries
+    or in bytes of the files. Concurrent requests of the same file wait for a
+    single load, and count as hits.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        maxbytes: Optional[int] = None,
+        priority: str = "project",
+    ):
+        """
+
+        :param maxsize: the maximum number of entries, unbounded with None
+        :type maxsize: Optional[int]
+        :param maxbytes: the maximum size of the files, unbounded with None
+        :type maxbytes: Optional[int]
+        :param priority:
+        :type priority: str
+        """
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.priority = priority
+
+        self._entries: "OrderedDict[Path, CacheEntry]" = OrderedDict()
+        self._loading: Dict[Tuple[Path, int], Future] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        """
+
+        :return:
+        :rtype: int
+        """
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        A copy of the counters
+        :return:
+        :rtype: CacheStats
+        """
+        with self._lock:
+            return CacheStats(
+                self._stats.hits,
+                self._stats.misses,
+                self._stats.evictions,
+                len(self._entries),
+                self._stats.bytes,
+            )
+
+    def get(self, path: Union[str, Path]) -> Settings:
+        """
+        The settings of the file, loaded again when it has changed
+        :param path:
+        :type path: Union[str, Path]
+        :return:
+        :rtype: Settings
+        """
+        path = Path(path).absolute()
+        stat = path.stat()
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                self._stats.hits += 1
+                return entry.settings
+
+            key = (path, stat.st_mtime_ns)
+            future = self._loading.get(key)
+            waiting = future is not None
+            if waiting:
+                self._stats.hits += 1
+            else:
+                future = self._loading[key] = Future()
+                self._stats.misses += 1
+
+        if waiting:
+            return future.result()  # type: ignore
+
+        try:
+            settings = self._load(path)
+        except BaseException as exc:
+            future.set_exception(exc)  # type: ignore
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+        with self._lock:
+            self._store(path, CacheEntry(stat.st_mtime_ns, stat.st_size, settings))
+        future.set_result(settings)  # type: ignore
+        return settings
+
+    def _load(self, path: Path) -> Settings:
+        """
+        Load the file in any format of the parser registry
+        :param path:
+        :type path: Path
+        :return:
+        :rtype: Settings
+        """
+        return Settings.from_file(path, self.priority)
+
+    def _store(self, path: Path, entry: CacheEntry) -> None:
+        """
+        Store the entry and evict the least recently used ones beyond the
+        bounds; called with the lock held
+        :param path:
+        :type path: Path
+        :param entry:
+        :type entry: CacheEntry
+        :return:
+        :rtype: None
+        """
+        previous = self._entries.pop(path, None)
+        if previous is not None:
+            self._stats.bytes -= previous.size
+        self._entries[path] = entry
+        self._stats.bytes += entry.size
+
+        while len(self._entries) > 1 and (
+            (self.maxsize is not None and len(self._entries) > self.maxsize)
+            or (self.maxbytes is not None and self._stats.bytes > self.maxbytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.bytes -= evicted.size
+            self._stats.evictions += 1
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """
+
+        :param path:
+        :type path: Union[str, Path]
+        :return:
+        :rtype: None
+        """
+        with self._lock:
+            entry = self._entries.pop(Path(path).absolute(), None)
+            if entry is not None:
+                self._stats.bytes -= entry.size
+
+    def clear(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._stats.bytes = 0
@@ -0,0 +1,76 @@
+"""
+The exceptions of settings
+"""
+
+
+class SettingsException(Exception):
+    """
+    The base exception
+    """
+
+
+class SettingNameNotUpperException(SettingsException):
+    """
+    The name of setting is not upper case
+    """
+
+
+class CompareWithNotSettingException(SettingsException):
+    """
+    Compare with not Setting exception
+    """
+
+
+class CompareWithNotSameNameSettingException(SettingsException):
+    """
+    Compare with not same name Setting
+    """
+
+
+class SettingsFrozenException(SettingsException):
+    """
+    The exception when modify a frozen settings instance
+    """
+
+
+class SettingsLowOrEqualPriorityException(SettingsException):
+    """
+    The exception when modify a setting with a lower priority
+    """
+
+
+class SettingsNotFrozenException(SettingsException):
+    """
+    The exception when a frozen settings instance is expected
+    """
+
+
+class SettingDependencyCycleException(SettingsException):
+    """
+    The exception when a computed setting depends on itself
+    """
+
+
+class SettingReferenceNotFoundException(SettingsException):
+    """
+    The exception when a template references a setting that does not exist
+    """
+
+
+class SettingsReadsNotTrackedException(SettingsException):
+    """
+    The exception when the report of the reads is asked without tracking them
+    """
+
+
+class SettingsSerializationException(SettingsException):
+    """
+    The exception when settings can not be written into or read from the wire
+    format
+    """
+
+
+class UnknownConfigFormatException(SettingsException):
+    """
+    The exception when no parser is found for a configuration file
+    """
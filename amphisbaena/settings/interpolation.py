@@ -0,0 +1,202 @@
+"""
+Interpolation of ${KEY} references in setting values
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterator, List, Mapping, Tuple, Union
+
+# "$${" escapes a literal "${"
+PATTERN = re.compile(r"\$\$\{|\$\{([A-Z0-9_]+)\}")
+
+
+@dataclass(frozen=True)
+class Reference:
+    """
+    A reference to another setting inside a template
+    """
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Template:
+    """
+    A template compiled into literal parts and references
+    """
+
+    source: str
+    parts: Tuple[Union[str, Reference], ...]
+
+    @property
+    def references(self) -> Tuple[str, ...]:
+        """
+        The names of the settings referenced by this template
+        :return:
+        :rtype: Tuple[str, ...]
+        """
+        return tuple(x.name for x in self.parts if isinstance(x, Reference))
+
+    def render(self, settings: Mapping) -> Any:
+        """
+        Resolve the references against the given settings
+
+        A template made of a single reference keeps the type of the referenced
+        value, otherwise the parts are joined as a string.
+        :param settings:
+        :type settings: Mapping
+        :return:
+        :rtype: Any
+        """
+        if len(self.parts) == 1 and isinstance(self.parts[0], Reference):
+            return settings[self.parts[0].name]
+
+        return "".join(
+            str(settings[x.name]) if isinstance(x, Reference) else x
+            for x in self.parts
+        )
+
+
+@dataclass(frozen=True)
+class ContainerTemplate:
+    """
+    A dict, list or tuple holding templates at any depth
+    """
+
+    source: Any
+    value: Any
+
+    @property
+    def references(self) -> Tuple[str, ...]:
+        """
+        The names of the settings referenced by the templates it holds
+        :return:
+        :rtype: Tuple[str, ...]
+        """
+        return tuple(
+            x for template in _templates(self.value) for x in template.references
+        )
+
+    def render(self, settings: Mapping) -> Any:
+        """
+        Rebuild the container with the templates it holds resolved against the
+        given settings
+        :param settings:
+        :type settings: Mapping
+        :return:
+        :rtype: Any
+        """
+        return _render(self.value, settings)
+
+
+# The values resolved on read, and written by their source
+TEMPLATES = (Template, ContainerTemplate)
+
+
+def _templates(value: Any) -> Iterator[Template]:
+    """
+    The templates held by a compiled container, at any depth
+    :param value:
+    :type value: Any
+    :return:
+    :rtype: Iterator[Template]
+    """
+    if isinstance(value, Template):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _templates(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _templates(item)
+
+
+def _render(value: Any, settings: Mapping) -> Any:
+    """
+    Resolve the templates held by a compiled container, at any depth
+    :param value:
+    :type value: Any
+    :param settings:
+    :type settings: Mapping
+    :return:
+    :rtype: Any
+    """
+    if isinstance(value, Template):
+        return value.render(settings)
+    if isinstance(value, dict):
+        return {k: _render(v, settings) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(x, settings) for x in value]
+    if isinstance(value, tuple):
+        return tuple(_render(x, settings) for x in value)
+    return value
+
+
+def _compile_container(value: Any) -> Any:
+    """
+    Compile the strings of a container, at any depth
+    :param value:
+    :type value: Any
+    :return:
+    :rtype: Any
+    """
+    if isinstance(value, str):
+        return compile_template(value) if "${" in value else value
+    if isinstance(value, dict):
+        return {k: _compile_container(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compile_container(x) for x in value]
+    if isinstance(value, tuple):
+        return tuple(_compile_container(x) for x in value)
+    return value
+
+
+@lru_cache(maxsize=1024)
+def compile_template(text: str) -> Union[str, Template]:
+    """
+    Parse a string once into a template, or return the string itself when it
+    contains no reference
+    :param text:
+    :type text: str
+    :return:
+    :rtype: Union[str, Template]
+    """
+    parts: List[Union[str, Reference]] = []
+    literal = []
+    position = 0
+    for match in PATTERN.finditer(text):
+        literal.append(text[position : match.start()])
+        position = match.end()
+        if match.group(1) is None:
+            literal.append("${")
+            continue
+        if any(literal):
+            parts.append("".join(literal))
+        literal = []
+        parts.append(Reference(match.group(1)))
+    literal.append(text[position:])
+    if any(literal):
+        parts.append("".join(literal))
+
+    if not any(isinstance(x, Reference) for x in parts):
+        return "".join(x for x in parts if isinstance(x, str))
+    return Template(text, tuple(parts))
+
+
+def compile_value(value: Any) -> Any:
+    """
+    Compile the value into a template if it is a string with references, or a
+    dict, list or tuple holding such strings at any depth
+    :param value:
+    :type value: Any
+    :return:
+    :rtype: Any
+    """
+    if isinstance(value, str):
+        return compile_template(value) if "${" in value else value
+    if isinstance(value, (dict, list, tuple)):
+        compiled = _compile_container(value)
+        if any(True for _ in _templates(compiled)):
+            return ContainerTemplate(value, compiled)
+        return compiled
+    return value
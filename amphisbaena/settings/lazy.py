@@ -0,0 +1,228 @@
+"""
+Lazy module-backed settings
+"""
+import ast
+import threading
+from dataclasses import dataclass, field
+from importlib import import_module
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Any, Iterable, List, Optional, Set, Union
+
+
+def _target_names(target: ast.expr) -> List[str]:
+    """
+    The names bound by an assignment target
+    :param target:
+    :type target: ast.expr
+    :return:
+    :rtype: List[str]
+    """
+    return [x.id for x in ast.walk(target) if isinstance(x, ast.Name)]
+
+
+# The simple statements binding no name
+_PLAIN_STATEMENTS = (
+    ast.Expr,
+    ast.Pass,
+    ast.Assert,
+    ast.Raise,
+    ast.Delete,
+    ast.Global,
+    ast.Nonlocal,
+    ast.Break,
+    ast.Continue,
+    ast.Return,
+)
+
+# The compound statements whose blocks are walked, any other one, e.g. match,
+# makes the names unknown
+_COMPOUND_STATEMENTS = (ast.If, ast.For, ast.While, ast.With, ast.Try)
+
+# The builtins binding names dynamically
+_DYNAMIC_NAMES = frozenset(("exec", "globals", "locals", "vars"))
+
+
+def _import_names(statement: Union[ast.Import, ast.ImportFrom]) -> Optional[List[str]]:
+    """
+    The names bound by an import, or None with a star import
+    :param statement:
+    :type statement: Union[ast.Import, ast.ImportFrom]
+    :return:
+    :rtype: Optional[List[str]]
+    """
+    if any(alias.name == "*" for alias in statement.names):
+        return None
+    return [x.asname or x.name.split(".")[0] for x in statement.names]
+
+
+def _statement_names(statement: ast.stmt) -> Optional[List[str]]:
+    """
+    The names bound by a simple statement, or None when they can not be known
+    without executing it
+    :param statement:
+    :type statement: ast.stmt
+    :return:
+    :rtype: Optional[List[str]]
+    """
+    if isinstance(statement, (ast.Import, ast.ImportFrom)):
+        return _import_names(statement)
+    if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [statement.name]
+
+    if isinstance(statement, ast.Assign):
+        targets = statement.targets
+    elif isinstance(statement, (ast.AnnAssign, ast.AugAssign)):
+        targets = [statement.target]
+    else:
+        return [] if isinstance(statement, _PLAIN_STATEMENTS) else None
+    return [x for target in targets for x in _target_names(target)]
+
+
+def _collect_block_names(statement: ast.stmt, names: Set[str]) -> bool:
+    """
+    Collect the names bound by a compound statement and by its blocks
+    :param statement:
+    :type statement: ast.stmt
+    :param names:
+    :type names: Set[str]
+    :return:
+    :rtype: bool
+    """
+    if isinstance(statement, ast.For):
+        names.update(_target_names(statement.target))
+    if isinstance(statement, ast.With):
+        for item in statement.items:
+            if item.optional_vars is not None:
+                names.update(_target_names(item.optional_vars))
+
+    blocks = [getattr(statement, x, ()) for x in ("body", "orelse", "finalbody")]
+    blocks.extend(x.body for x in getattr(statement, "handlers", ()))
+    return all(_collect_names(x, names) for x in blocks)
+
+
+def _collect_names(statements: Iterable[ast.stmt], names: Set[str]) -> bool:
+    """
+    Collect the names bound by the statements at the module level, return False
+    when they can not be known without executing the module
+    :param statements:
+    :type statements: Iterable[ast.stmt]
+    :param names:
+    :type names: Set[str]
+    :return:
+    :rtype: bool
+    """
+    for statement in statements:
+        if isinstance(statement, _COMPOUND_STATEMENTS):
+            if not _collect_block_names(statement, names):
+                return False
+            continue
+        statement_names = _statement_names(statement)
+        if statement_names is None:
+            return False
+        names.update(statement_names)
+    return True
+
+
+def _binds_dynamically(tree: ast.Module) -> bool:
+    """
+    Whether the module may bind names its statements do not show, through
+    globals(), exec and the like, or an assignment expression
+    :param tree:
+    :type tree: ast.Module
+    :return:
+    :rtype: bool
+    """
+    return any(
+        isinstance(x, ast.NamedExpr)
+        or (isinstance(x, ast.Name) and x.id in _DYNAMIC_NAMES)
+        for x in ast.walk(tree)
+    )
+
+
+def source_names(source: str) -> Optional[List[str]]:
+    """
+    Read the upper case names bound by the source of a module, or None when
+    they can not be known statically
+    :param source:
+    :type source: str
+    :return:
+    :rtype: Optional[List[str]]
+    """
+    tree = ast.parse(source)
+    names: Set[str] = set()
+    if _binds_dynamically(tree) or not _collect_names(tree.body, names):
+        return None
+    # a module __getattr__ serves names that are bound nowhere
+    if "__getattr__" in names:
+        return None
+    return sorted(x for x in names if x.isupper())
+
+
+def module_names(name: str) -> Optional[List[str]]:
+    """
+    Read the upper case names of a module from its source without executing
+    it, or None when the source is not available or the names can not be known
+    statically, e.g. with a star import, a match statement or globals()
+    :param name:
+    :type name: str
+    :return:
+    :rtype: Optional[List[str]]
+    """
+    spec = find_spec(name)
+    if spec is None or spec.loader is None or not hasattr(spec.loader, "get_source"):
+        return None
+
+    source = spec.loader.get_source(name)  # type: ignore
+    if source is None:
+        return None
+    return source_names(source)
+
+
+@dataclass
+class LazyModule:
+    """
+    A module imported on the first access
+    """
+
+    name: str
+    _module: Optional[ModuleType] = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def module(self) -> ModuleType:
+        """
+
+        :return:
+        :rtype: ModuleType
+        """
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = import_module(self.name)
+        return self._module
+
+
+@dataclass(frozen=True)
+class LazyAttribute:
+    """
+    The value of a setting read from a lazy module on the first access, with the
+    setting it replaced, restored when the module does not define the name
+    """
+
+    module: LazyModule
+    name: str
+    replaced: Any = field(default=None, repr=False, compare=False)
+
+    def load(self) -> Any:
+        """
+
+        :return:
+        :rtype: Any
+        """
+        try:
+            return getattr(self.module.module, self.name)
+        except AttributeError as exc:
+            raise KeyError(self.name) from exc
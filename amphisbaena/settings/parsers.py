@@ -0,0 +1,351 @@
+"""
+The parsers of configuration files, selected by suffix or by content sniffing
+"""
+import io
+import re
+from dataclasses import dataclass
+from importlib import import_module
+from importlib.util import find_spec
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .exceptions import UnknownConfigFormatException
+from .profiler import measure
+
+# The libraries of the parsers are imported on their first use, to keep them
+# out of the startup of the processes not reading such files
+
+# The TOML library, tomllib from Python 3.11 or else tomli, if any
+TOML_MODULE = next((x for x in ("tomllib", "tomli") if find_spec(x)), None)
+
+# The bytes read from the head of a file to sniff its format
+SNIFF_SIZE = 4096
+
+# The lines of a table or a key, and their TOML, INI and YAML forms
+KEY_LINE = re.compile(rb"^(\[|[\w.\-\"']+\s*[=:])")
+TOML_LINE = re.compile(
+    rb"^(\[\[?[\w.\-\" ]+\]\]?|[\w.\-\"]+\s*=\s*([\"'\[{\d+\-]|true|false|inf|nan))"
+)
+INI_LINE = re.compile(rb"^\[[^\]]+\]$")
+YAML_LINE = re.compile(rb"^(---|%YAML|[\w.\-\"']+\s*:(\s|$))")
+
+
+@dataclass(frozen=True)
+class Parser:
+    """
+    A parser of a configuration file format
+
+    load reads a file opened in binary mode, streaming it when the format
+    allows; sniff tells whether the head of a file looks like this format;
+    load_partial reads only the top level keys accepted by a selector, skipping
+    the others without decoding them.
+    """
+
+    name: str
+    suffixes: Tuple[str, ...]
+    load: Callable[[IO[bytes]], Any]
+    sniff: Optional[Callable[[bytes], bool]] = None
+    load_partial: Optional[Callable[[IO[bytes], Callable[[str], bool]], Any]] = None
+
+
+# The registered parsers by name, sniffed in the order of registration
+PARSERS: Dict[str, Parser] = {}
+
+
+def register_parser(parser: Parser) -> None:
+    """
+    Register a parser, replacing any parser of the same name
+    :param parser:
+    :type parser: Parser
+    :return:
+    :rtype: None
+    """
+    PARSERS.pop(parser.name, None)
+    PARSERS[parser.name] = parser
+
+
+def key_selector(
+    keys: Iterable[str] = None, prefixes: Iterable[str] = None
+) -> Optional[Callable[[str], bool]]:
+    """
+    The selector of the top level keys equal to one of the keys or starting
+    with one of the prefixes, or None to select all of them
+    :param keys:
+    :type keys: Iterable[str]
+    :param prefixes:
+    :type prefixes: Iterable[str]
+    :return:
+    :rtype: Optional[Callable[[str], bool]]
+    """
+    if keys is None and prefixes is None:
+        return None
+
+    keys_ = frozenset(keys or ())
+    prefixes_ = tuple(prefixes or ())
+    if not prefixes_:
+        return keys_.__contains__
+    return lambda x: x in keys_ or x.startswith(prefixes_)
+
+
+def select_keys(content: Any, selector: Callable[[str], bool]) -> Any:
+    """
+    Keep the top level keys accepted by the selector in the content of a file
+    :param content:
+    :type content: Any
+    :param selector:
+    :type selector: Callable[[str], bool]
+    :return:
+    :rtype: Any
+    """
+    if not isinstance(content, dict):
+        return content
+    return {k: v for k, v in content.items() if isinstance(k, str) and selector(k)}
+
+
+def _significant_lines(head: bytes) -> List[bytes]:
+    """
+    The lines neither blank nor a comment
+    :param head:
+    :type head: bytes
+    :return:
+    :rtype: List[bytes]
+    """
+    lines = (x.strip() for x in head.splitlines())
+    return [x for x in lines if x and not x.startswith((b"#", b";"))]
+
+
+def sniff_toml(head: bytes) -> bool:
+    """
+    All the lines of the tables and the keys are in the TOML form
+    :param head:
+    :type head: bytes
+    :return:
+    :rtype: bool
+    """
+    lines = [x for x in _significant_lines(head) if KEY_LINE.match(x)]
+    return bool(lines) and all(TOML_LINE.match(x) for x in lines)
+
+
+def sniff_ini(head: bytes) -> bool:
+    """
+    The content starts with a section
+    :param head:
+    :type head: bytes
+    :return:
+    :rtype: bool
+    """
+    lines = _significant_lines(head)
+    return bool(lines) and bool(INI_LINE.match(lines[0]))
+
+
+def sniff_yaml(head: bytes) -> bool:
+    """
+    The content starts with a document marker, a directive or a mapping key
+    :param head:
+    :type head: bytes
+    :return:
+    :rtype: bool
+    """
+    lines = _significant_lines(head)
+    return bool(lines) and bool(YAML_LINE.match(lines[0]))
+
+
+def load_json(fh: IO[bytes]) -> Any:  # pylint: disable=invalid-name
+    """
+    orjson parses a whole document, faster than any streaming parser, or than
+    scanning past the unselected values in Python
+    :param fh:
+    :type fh: IO[bytes]
+    :return:
+    :rtype: Any
+    """
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    return orjson.loads(fh.read())
+
+
+def load_yaml(fh: IO[bytes]) -> Any:  # pylint: disable=invalid-name
+    """
+    PyYAML is imported on the first YAML file
+    :param fh:
+    :type fh: IO[bytes]
+    :return:
+    :rtype: Any
+    """
+    from .yaml_parser import load  # pylint: disable=import-outside-toplevel
+
+    return load(fh)
+
+
+def load_yaml_partial(
+    fh: IO[bytes], selector: Callable[[str], bool]  # pylint: disable=invalid-name
+) -> Any:
+    """
+
+    :param fh:
+    :type fh: IO[bytes]
+    :param selector:
+    :type selector: Callable[[str], bool]
+    :return:
+    :rtype: Any
+    """
+    from .yaml_parser import load_partial  # pylint: disable=import-outside-toplevel
+
+    return load_partial(fh, selector)
+
+
+def load_toml(fh: IO[bytes]) -> Any:  # pylint: disable=invalid-name
+    """
+
+    :param fh:
+    :type fh: IO[bytes]
+    :return:
+    :rtype: Any
+    """
+    return import_module(TOML_MODULE).load(fh)  # type: ignore
+
+
+def load_ini(fh: IO[bytes]) -> Any:  # pylint: disable=invalid-name
+    """
+    Read the sections as mappings, and the DEFAULT section at the top level
+    :param fh:
+    :type fh: IO[bytes]
+    :return:
+    :rtype: Any
+    """
+    import configparser  # pylint: disable=import-outside-toplevel
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.optionxform = str  # type: ignore
+    text = io.TextIOWrapper(fh, encoding="utf-8")  # type: ignore
+    try:
+        config.read_file(text)
+    finally:
+        text.detach()
+
+    content: Dict[str, Any] = dict(config.defaults())
+    content.update(
+        (name, dict(config.items(name, raw=True))) for name in config.sections()
+    )
+    return content
+
+
+register_parser(
+    Parser("json", (".json",), load_json, lambda x: x.lstrip().startswith(b"{"))
+)
+if TOML_MODULE is not None:
+    register_parser(Parser("toml", (".toml",), load_toml, sniff_toml))
+register_parser(Parser("ini", (".ini", ".cfg", ".conf"), load_ini, sniff_ini))
+register_parser(
+    Parser("yaml", (".yaml", ".yml"), load_yaml, sniff_yaml, load_yaml_partial)
+)
+
+
+def get_parser(path: Union[str, Path] = None, head: bytes = None) -> Parser:
+    """
+    Select the parser by the suffix of the path, or else by sniffing the head
+    of the content
+    :param path:
+    :type path: Union[str, Path]
+    :param head:
+    :type head: bytes
+    :return:
+    :rtype: Parser
+    """
+    if path is not None:
+        suffix = Path(path).suffix.lower()
+        for parser in PARSERS.values():
+            if suffix in parser.suffixes:
+                return parser
+
+    if head is not None:
+        for parser in PARSERS.values():
+            if parser.sniff is not None and parser.sniff(head):
+                return parser
+
+    raise UnknownConfigFormatException(path)
+
+
+def read_file(
+    path: Union[str, Path],
+    parser: Union[str, Parser] = None,
+    keys: Iterable[str] = None,
+    prefixes: Iterable[str] = None,
+) -> Any:
+    """
+    Parse a configuration file with the given parser or the one selected by
+    get_parser
+
+    With keys or prefixes, only the matching top level keys are kept; the
+    parsers with load_partial skip the others without decoding them, the other
+    parsers decode the whole file then drop them.
+    :param path:
+    :type path: Union[str, Path]
+    :param parser: a parser or the name of a registered parser
+    :type parser: Union[str, Parser]
+    :param keys:
+    :type keys: Iterable[str]
+    :param prefixes:
+    :type prefixes: Iterable[str]
+    :return:
+    :rtype: Any
+    """
+    selector = key_selector(keys, prefixes)
+    if isinstance(parser, str):
+        parser = PARSERS[parser]
+
+    with Path(path).open("rb") as fh:  # pylint: disable=invalid-name
+        if parser is None:
+            try:
+                parser = get_parser(path)
+            except UnknownConfigFormatException:
+                parser = get_parser(path, fh.read(SNIFF_SIZE))
+                fh.seek(0)
+        with measure(str(path), parser.name) as record:
+            if selector is None:
+                content = parser.load(fh)
+            elif parser.load_partial is None:
+                content = select_keys(parser.load(fh), selector)
+            else:
+                content = parser.load_partial(fh, selector)
+            record.bytes = fh.tell()
+            record.keys = len(content) if isinstance(content, dict) else 0
+        return content
+
+
+def read_yaml(
+    yml: Union[str, Path],
+    keys: Iterable[str] = None,
+    prefixes: Iterable[str] = None,
+) -> Any:
+    """
+
+    :param yml:
+    :type yml: Union[str, Path]
+    :param keys:
+    :type keys: Iterable[str]
+    :param prefixes:
+    :type prefixes: Iterable[str]
+    :return:
+    :rtype: Any
+    """
+    return read_file(yml, "yaml", keys, prefixes)
+
+
+def read_json(
+    json: Union[str, Path],
+    keys: Iterable[str] = None,
+    prefixes: Iterable[str] = None,
+) -> Any:
+    """
+
+    :param json:
+    :type json: Union[str, Path]
+    :param keys:
+    :type keys: Iterable[str]
+    :param prefixes:
+    :type prefixes: Iterable[str]
+    :return:
+    :rtype: Any
+    """
+    return read_file(json, "json", keys, prefixes)
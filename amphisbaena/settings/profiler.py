@@ -0,0 +1,172 @@
+"""
+Opt-in timings of the settings loading
+
+While a profiler is enabled, the loaders record how long each source spends in
+find_spec, import_module, parsing and Setting construction, with the number of
+keys and bytes read:
+
+    with profile() as profiler:
+        settings = Settings.from_yaml("settings.yaml")
+    print(profiler.format())
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, DefaultDict, Dict, Generator, List, Optional
+
+
+@dataclass
+class SourceTiming:
+    """
+    The time spent on a stage of loading a source
+    """
+
+    source: str
+    stage: str
+    seconds: float = 0.0
+    keys: int = 0
+    bytes: int = 0
+
+
+class LoadProfiler:
+    """
+    The recorder of the timings
+    """
+
+    def __init__(self):
+        """ """
+        self.records: List[SourceTiming] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, source: str, stage: str) -> Generator:
+        """
+        Time the block; the yielded record takes its keys and bytes
+        :param source:
+        :type source: str
+        :param stage:
+        :type stage: str
+        :return:
+        :rtype: Generator
+        """
+        record = SourceTiming(source, stage)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            with self._lock:
+                self.records.append(record)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        The total and per stage times, and the records in order
+        :return:
+        :rtype: Dict[str, Any]
+        """
+        stages: DefaultDict[str, float] = defaultdict(float)
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            stages[record.stage] += record.seconds
+        return {
+            "seconds": sum(stages.values()),
+            "stages": dict(stages),
+            "sources": [asdict(x) for x in records],
+        }
+
+    def format(self) -> str:
+        """
+        The report as a table
+        :return:
+        :rtype: str
+        """
+        report = self.report()
+        lines = [f"{'stage':<16}{'ms':>10}{'keys':>8}{'bytes':>10}  source"]
+        for record in report["sources"]:
+            lines.append(
+                f"{record['stage']:<16}{record['seconds'] * 1e3:>10.3f}"
+                f"{record['keys']:>8}{record['bytes']:>10}  {record['source']}"
+            )
+        lines.append(f"{'total':<16}{report['seconds'] * 1e3:>10.3f}")
+        return "\n".join(lines)
+
+
+class _Disabled:
+    """
+    The context of measure without a profiler, shared so that it costs next
+    to nothing; the yielded record is a scratch one
+    """
+
+    record = SourceTiming("", "")
+
+    def __enter__(self) -> SourceTiming:
+        """
+
+        :return:
+        :rtype: SourceTiming
+        """
+        return self.record
+
+    def __exit__(self, *exc_info) -> None:
+        """
+
+        :param exc_info:
+        :return:
+        :rtype: None
+        """
+
+
+_DISABLED = _Disabled()
+
+# The profiler enabled in the current context, if any; a context variable, so
+# that the threads and the tasks enabling their own do not restore each other's
+_PROFILER: ContextVar[Optional[LoadProfiler]] = ContextVar(
+    "amphisbaena_profiler", default=None
+)
+
+
+def get_profiler() -> Optional[LoadProfiler]:
+    """
+
+    :return:
+    :rtype: Optional[LoadProfiler]
+    """
+    return _PROFILER.get()
+
+
+@contextmanager
+def profile(profiler: LoadProfiler = None) -> Generator:
+    """
+    Enable a profiler in the block of the current thread or task, restoring
+    the previous one on exit
+    :param profiler: a new profiler with None
+    :type profiler: LoadProfiler
+    :return:
+    :rtype: Generator
+    """
+    profiler = profiler if profiler is not None else LoadProfiler()
+    token = _PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _PROFILER.reset(token)
+
+
+def measure(source: str, stage: str) -> Any:
+    """
+    Time the block with the enabled profiler, if any
+    :param source:
+    :type source: str
+    :param stage:
+    :type stage: str
+    :return:
+    :rtype: Any
+    """
+    profiler = _PROFILER.get()
+    if profiler is None:
+        return _DISABLED
+    return profiler.measure(source, stage)
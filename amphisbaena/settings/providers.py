@@ -0,0 +1,273 @@
+"""
+Providers of settings layers from configuration services
+"""
+import hashlib
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import orjson
+
+from amphisbaena.settings import PARSERS, SettingsException, read_file
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderUnavailableException(SettingsException):
+    """
+    The exception when the backend of a provider can not be reached
+    """
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    The settings fetched from a provider at a version
+    """
+
+    version: str
+    settings: Dict[str, Any]
+
+
+class SettingsProvider(ABC):
+    """
+    The interface of the providers
+    """
+
+    @abstractmethod
+    def version(self) -> str:
+        """
+        The current version, or etag, of the settings in the backend
+        :return:
+        :rtype: str
+        """
+
+    @abstractmethod
+    def fetch(self, version: Optional[str] = None) -> Optional[Snapshot]:
+        """
+        Fetch the settings, or None when the backend is still at the given
+        version
+        :param version:
+        :type version: Optional[str]
+        :return:
+        :rtype: Optional[Snapshot]
+        """
+
+    def load(self) -> Snapshot:
+        """
+        Fetch the settings unconditionally
+        :return:
+        :rtype: Snapshot
+        """
+        snapshot = self.fetch()
+        if snapshot is None:
+            raise ProviderUnavailableException
+        return snapshot
+
+    def watch(
+        self,
+        callback: Callable[[Snapshot], None],
+        version: Optional[str] = None,
+        interval: float = 30.0,
+    ) -> threading.Event:
+        """
+        Poll the backend in a daemon thread and call back with every new
+        version; set the returned event to stop watching
+        :param callback:
+        :type callback: Callable[[Snapshot], None]
+        :param version: the version already known by the caller
+        :type version: Optional[str]
+        :param interval:
+        :type interval: float
+        :return:
+        :rtype: threading.Event
+        """
+        stop = threading.Event()
+
+        def poll(version_: Optional[str]) -> None:
+            while not stop.wait(interval):
+                try:
+                    snapshot = self.fetch(version_)
+                except ProviderUnavailableException as exc:
+                    logger.warning("Settings provider unavailable: %s", exc)
+                    continue
+                if snapshot is not None:
+                    version_ = snapshot.version
+                    callback(snapshot)
+
+        threading.Thread(target=poll, args=(version,), daemon=True).start()
+        return stop
+
+
+class CachedProvider(SettingsProvider):
+    """
+    Keep the last settings fetched from a provider on disk
+
+    Once a cached copy exists, loading returns it at once and refreshes the
+    cache in the background, so a slow or unavailable backend never blocks the
+    startup.
+    """
+
+    def __init__(self, provider: SettingsProvider, cache: Union[str, Path]):
+        """
+
+        :param provider:
+        :type provider: SettingsProvider
+        :param cache:
+        :type cache: Union[str, Path]
+        """
+        self.provider = provider
+        self.cache = Path(cache)
+
+    def cached(self) -> Optional[Snapshot]:
+        """
+        The settings in the cache, if any
+        :return:
+        :rtype: Optional[Snapshot]
+        """
+        try:
+            data = orjson.loads(self.cache.read_bytes())
+        except FileNotFoundError:
+            return None
+        except orjson.JSONDecodeError:
+            logger.warning("Ignore the corrupted settings cache: %s", self.cache)
+            return None
+        return Snapshot(data["version"], data["settings"])
+
+    def _write_cache(self, snapshot: Snapshot) -> None:
+        """
+        Replace the cache atomically
+        :param snapshot:
+        :type snapshot: Snapshot
+        :return:
+        :rtype: None
+        """
+        self.cache.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.cache.with_name(f"{self.cache.name}.{os.getpid()}.tmp")
+        temp.write_bytes(
+            orjson.dumps({"version": snapshot.version, "settings": snapshot.settings})
+        )
+        os.replace(temp, self.cache)
+
+    def version(self) -> str:
+        """
+
+        :return:
+        :rtype: str
+        """
+        return self.provider.version()
+
+    def fetch(self, version: Optional[str] = None) -> Optional[Snapshot]:
+        """
+        Refresh the cache conditionally on its version, falling back to the
+        cached copy when the backend is unavailable
+        :param version:
+        :type version: Optional[str]
+        :return:
+        :rtype: Optional[Snapshot]
+        """
+        cached = self.cached()
+        try:
+            snapshot = self.provider.fetch(cached.version if cached else None)
+        except ProviderUnavailableException:
+            if cached is None:
+                raise
+            logger.warning("Settings provider unavailable, use the cached copy")
+            snapshot = None
+
+        if snapshot is None:
+            snapshot = cached
+        else:
+            self._write_cache(snapshot)
+
+        if snapshot is None or snapshot.version == version:
+            return None
+        return snapshot
+
+    def refresh(self) -> None:
+        """
+        Refresh the cache, logging instead of raising the errors
+        :return:
+        :rtype: None
+        """
+        try:
+            self.fetch()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Fail to refresh the settings cache: %s", self.cache)
+
+    def load(self, background: bool = True) -> Snapshot:
+        """
+        Return the cached copy and refresh it in a daemon thread, or fetch from
+        the backend when nothing is cached yet
+        :param background:
+        :type background: bool
+        :return:
+        :rtype: Snapshot
+        """
+        cached = self.cached()
+        if cached is None:
+            return super().load()
+
+        if background:
+            threading.Thread(target=self.refresh, daemon=True).start()
+        return cached
+
+
+class DirectoryProvider(SettingsProvider):
+    """
+    Provide the settings from the files of the registered parsers in a local
+    directory, merged in the order of the file names; it stands in for a
+    configuration service in tests
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+
+        :param path:
+        :type path: Union[str, Path]
+        """
+        self.path = Path(path)
+
+    def _files(self) -> List[Path]:
+        """
+
+        :return:
+        :rtype: List[Path]
+        """
+        if not self.path.is_dir():
+            raise ProviderUnavailableException(self.path)
+        suffixes = {x for parser in PARSERS.values() for x in parser.suffixes}
+        return sorted(x for x in self.path.iterdir() if x.suffix in suffixes)
+
+    def version(self) -> str:
+        """
+        Hash the names, sizes and modification times of the files
+        :return:
+        :rtype: str
+        """
+        digest = hashlib.sha1()  # nosec
+        for file in self._files():
+            stat = file.stat()
+            digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()
+
+    def fetch(self, version: Optional[str] = None) -> Optional[Snapshot]:
+        """
+
+        :param version:
+        :type version: Optional[str]
+        :return:
+        :rtype: Optional[Snapshot]
+        """
+        version_ = self.version()
+        if version_ == version:
+            return None
+
+        settings: Dict[str, Any] = {}
+        for file in self._files():
+            settings.update(read_file(file) or {})
+        return Snapshot(version_, settings)
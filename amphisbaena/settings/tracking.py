@@ -0,0 +1,83 @@
+"""
+Sampled statistics of the settings reads
+"""
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Set, Tuple
+
+
+@dataclass(frozen=True)
+class ReadReport:
+    """
+    The keys read the most, with their estimated number of reads, and the keys
+    never read
+    """
+
+    reads: int
+    hot: List[Tuple[str, int]]
+    never_read: List[str]
+
+
+class ReadTracker:
+    """
+    Record the reads of a settings instance
+
+    Every read key is remembered exactly, so the never read keys are exact;
+    the reads are counted on a sample of about one in sample_rate, at
+    randomized intervals so that a periodic access pattern is not aliased.
+    The counters are not locked: concurrent reads may lose a few samples.
+    """
+
+    def __init__(self, sample_rate: int = 100):
+        """
+
+        :param sample_rate: count one read in about this number of reads
+        :type sample_rate: int
+        """
+        if sample_rate < 1:
+            raise ValueError(sample_rate)
+
+        self.sample_rate = sample_rate
+        self.seen: Set[str] = set()
+        self.samples: Counter = Counter()
+        self._countdown = self._interval()
+
+    def _interval(self) -> int:
+        """
+        The number of reads until the next sample, of mean sample_rate
+        :return:
+        :rtype: int
+        """
+        return random.randint(1, 2 * self.sample_rate - 1)  # nosec
+
+    def record(self, k: str) -> None:
+        """
+
+        :param k:
+        :type k: str
+        :return:
+        :rtype: None
+        """
+        self.seen.add(k)
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self._interval()
+            self.samples[k] += 1
+
+    def report(self, keys: Iterable[str], top: int = 20) -> ReadReport:
+        """
+
+        :param keys: the keys of the tracked settings
+        :type keys: Iterable[str]
+        :param top: the number of hot keys
+        :type top: int
+        :return:
+        :rtype: ReadReport
+        """
+        hot = [(k, x * self.sample_rate) for k, x in self.samples.most_common(top)]
+        return ReadReport(
+            sum(self.samples.values()) * self.sample_rate,
+            hot,
+            sorted(k for k in keys if k not in self.seen),
+        )
@@ -0,0 +1,87 @@
+"""
+The compact wire format of settings, written by Settings.dumps
+
+The priority of every setting is interned as an index into the tuple of the
+priorities in use, and the names, indexes and values are written as flat tuples
+by marshal, so the value types round-trip exactly. The templates are written as
+their source, and compiled again when read.
+"""
+import marshal
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .base import Setting
+from .exceptions import SettingsSerializationException
+from .interpolation import TEMPLATES, compile_value
+
+# The header of the wire format, with the layout version
+WIRE_HEADER = b"AMS\x01"
+
+
+def dump_settings(priority: str, data: Mapping[str, Setting]) -> bytes:
+    """
+    Serialize the settings with the priority of their instance
+    :param priority:
+    :type priority: str
+    :param data:
+    :type data: Mapping[str, Setting]
+    :return:
+    :rtype: bytes
+    """
+    priorities: Dict[str, int] = {}
+    indexes = bytearray()
+    values: List[Any] = []
+    templates: List[int] = []
+
+    for index, setting in enumerate(data.values()):
+        indexes.append(priorities.setdefault(setting.priority, len(priorities)))
+        value = setting.value
+        if isinstance(value, TEMPLATES):
+            templates.append(index)
+            value = value.source
+        values.append(value)
+
+    try:
+        payload = marshal.dumps(
+            (
+                priority,
+                tuple(priorities),
+                tuple(data),
+                bytes(indexes),
+                tuple(values),
+                tuple(templates),
+            )
+        )
+    except ValueError as exc:
+        raise SettingsSerializationException(exc) from exc
+    return WIRE_HEADER + payload
+
+
+def load_settings(data: bytes) -> Tuple[str, Dict[str, Setting]]:
+    """
+    Deserialize the priority of the instance and the settings
+
+    The payload is read by marshal, so it must come from a trusted peer, as
+    with pickle.
+    :param data:
+    :type data: bytes
+    :return:
+    :rtype: Tuple[str, Dict[str, Setting]]
+    """
+    if data[: len(WIRE_HEADER)] != WIRE_HEADER:
+        raise SettingsSerializationException("unknown wire format")
+
+    try:
+        payload = marshal.loads(memoryview(data)[len(WIRE_HEADER) :])  # nosec
+        priority, priorities, names, indexes, values, templates = payload
+    except (EOFError, TypeError, ValueError) as exc:
+        raise SettingsSerializationException(exc) from exc
+
+    if templates:
+        values = list(values)
+        for index in templates:
+            values[index] = compile_value(values[index])
+
+    return priority, {
+        name: Setting(priorities[index], name, value)
+        for name, index, value in zip(names, indexes, values)
+    }
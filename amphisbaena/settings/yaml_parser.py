@@ -0,0 +1,169 @@
+"""
+The YAML parser and dumper, imported on their first use
+"""
+from typing import IO, Any, Callable, Dict
+
+import yaml
+from yaml.events import (
+    AliasEvent,
+    CollectionEndEvent,
+    CollectionStartEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+)
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from .parsers import select_keys
+
+# Use the LibYAML based loader and dumper when they are available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def load(fh: IO[bytes]) -> Any:  # pylint: disable=invalid-name
+    """
+
+    :param fh:
+    :type fh: IO[bytes]
+    :return:
+    :rtype: Any
+    """
+    return yaml.load(fh, Loader=YamlLoader)  # nosec
+
+
+class _PartialYamlFallback(Exception):
+    """
+    The document can not be read partially, e.g. a selected value refers to an
+    anchor in a skipped one
+    """
+
+
+def _compose_yaml(loader: Any, anchors: Dict[str, Node]) -> Node:
+    """
+    Compose the node of the next events, as the composer of PyYAML does
+    :param loader:
+    :type loader: Any
+    :param anchors:
+    :type anchors: Dict[str, Node]
+    :return:
+    :rtype: Node
+    """
+    event = loader.get_event()
+    if isinstance(event, AliasEvent):
+        if event.anchor not in anchors:
+            raise _PartialYamlFallback(event.anchor)
+        return anchors[event.anchor]
+
+    tag = event.tag
+    node: Node
+    if isinstance(event, ScalarEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(
+            tag, event.value, event.start_mark, event.end_mark, event.style
+        )
+    elif isinstance(event, MappingStartEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(MappingNode, None, event.implicit)
+        node = MappingNode(tag, [], event.start_mark, None, event.flow_style)
+        while not loader.check_event(MappingEndEvent):
+            item = _compose_yaml(loader, anchors)
+            node.value.append((item, _compose_yaml(loader, anchors)))
+        node.end_mark = loader.get_event().end_mark
+    else:
+        if tag is None or tag == "!":
+            tag = loader.resolve(SequenceNode, None, event.implicit)
+        node = SequenceNode(tag, [], event.start_mark, None, event.flow_style)
+        while not loader.check_event(SequenceEndEvent):
+            node.value.append(_compose_yaml(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    return node
+
+
+def _skip_yaml(loader: Any) -> None:
+    """
+    Drop the events of the next node without composing it; the anchors in it
+    are lost, so an alias to them fails to compose later
+    :param loader:
+    :type loader: Any
+    :return:
+    :rtype: None
+    """
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if isinstance(event, CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, CollectionEndEvent):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _load_yaml_partial(
+    fh: IO[bytes], selector: Callable[[str], bool]  # pylint: disable=invalid-name
+) -> Any:
+    """
+    Walk the events of the top level mapping, composing and constructing the
+    selected values only; raise _PartialYamlFallback when the document can not
+    be read this way
+    :param fh:
+    :type fh: IO[bytes]
+    :param selector:
+    :type selector: Callable[[str], bool]
+    :return:
+    :rtype: Any
+    """
+    loader = YamlLoader(fh)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if not loader.check_event(DocumentStartEvent):
+            return None
+        loader.get_event()
+        if not loader.check_event(MappingStartEvent):
+            raise _PartialYamlFallback
+        loader.get_event()
+
+        content: Dict[Any, Any] = {}
+        anchors: Dict[str, Node] = {}
+        while not loader.check_event(MappingEndEvent):
+            event = loader.peek_event()
+            if not isinstance(event, ScalarEvent) or event.value == "<<":
+                raise _PartialYamlFallback
+            if not selector(event.value):
+                loader.get_event()
+                _skip_yaml(loader)
+                continue
+            key = loader.construct_document(_compose_yaml(loader, anchors))
+            content[key] = loader.construct_document(_compose_yaml(loader, anchors))
+        return content
+    finally:
+        loader.dispose()
+
+
+def load_partial(
+    fh: IO[bytes], selector: Callable[[str], bool]  # pylint: disable=invalid-name
+) -> Any:
+    """
+    The values of the skipped keys are parsed into events, but neither composed
+    nor constructed, which is the bulk of the cost of loading YAML; documents
+    with aliases to skipped values, merge keys or complex keys at the top level
+    are loaded whole then filtered
+    :param fh:
+    :type fh: IO[bytes]
+    :param selector:
+    :type selector: Callable[[str], bool]
+    :return:
+    :rtype: Any
+    """
+    try:
+        return _load_yaml_partial(fh, selector)
+    except _PartialYamlFallback:
+        fh.seek(0)
+        return select_keys(load(fh), selector)
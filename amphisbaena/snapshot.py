@@ -0,0 +1,140 @@
+"""
+Opt-in snapshots of the settings resolved by the command line
+
+    amphisbaena --settings-cache ~/.cache/amphisbaena -c settings.yaml -s A=1
+
+A run stores the settings it resolved in the wire format, under a key hashing
+the settings of the command line and the fingerprints of the files they are
+loaded from, i.e. the config files and the default settings: their path,
+modification time, size and content hash. The next run with the same key
+loads the snapshot instead of parsing the files again.
+"""
+import hashlib
+import logging
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    from amphisbaena.settings import Settings
+
+# The version of the layout of the keys and of the snapshots
+SNAPSHOT_FORMAT = "1"
+
+# The module of the default settings, fingerprinted along the config files
+DEFAULT_SETTINGS = "amphisbaena.settings.default_settings"
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(path: Union[str, Path]) -> bytes:
+    """
+    The path, modification time, size and SHA-256 of a file
+    :param path:
+    :type path: Union[str, Path]
+    :return:
+    :rtype: bytes
+    """
+    path = Path(path).absolute()
+    stat = path.stat()
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}:{digest};".encode()
+
+
+class SnapshotCache:
+    """
+    The snapshots of the resolved settings in a directory only accessible by
+    its user; they are read with marshal, so the directory must be trusted as
+    a pickle would be
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+
+        :param directory:
+        :type directory: Union[str, Path]
+        """
+        self.directory = Path(directory)
+
+    def key(self, arguments: str, paths: Iterable[str]) -> Optional[str]:
+        """
+        The key of the settings, or None when a file can not be fingerprinted;
+        the loading reports the error then
+        :param arguments: the settings of the command line, as a stable string
+        :type arguments: str
+        :param paths: the config files
+        :type paths: Iterable[str]
+        :return:
+        :rtype: Optional[str]
+        """
+        digest = hashlib.sha256(f"{SNAPSHOT_FORMAT}:{arguments};".encode())
+        spec = find_spec(DEFAULT_SETTINGS)
+        try:
+            if spec is not None and spec.origin:
+                digest.update(fingerprint(spec.origin))
+            for path in paths:
+                digest.update(fingerprint(path))
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        """
+
+        :param key:
+        :type key: str
+        :return:
+        :rtype: Path
+        """
+        return self.directory / f"{key}.snapshot"
+
+    def get(self, key: str) -> Optional["Settings"]:
+        """
+        The settings of the snapshot, or None when there is none or it is
+        unreadable
+        :param key:
+        :type key: str
+        :return:
+        :rtype: Optional[Settings]
+        """
+        # pylint: disable=import-outside-toplevel
+        from amphisbaena.settings import Settings, SettingsSerializationException
+
+        try:
+            data = self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            return Settings.loads(data)
+        except (EOFError, TypeError, ValueError, SettingsSerializationException):
+            logger.warning("Ignore the corrupted settings snapshot: %s", key)
+            return None
+
+    def put(self, key: str, settings: "Settings") -> bool:
+        """
+        Store the snapshot atomically
+        :param key:
+        :type key: str
+        :param settings:
+        :type settings: Settings
+        :return: whether the settings could be serialized, e.g. marshal does not
+            support the instances of most classes
+        :rtype: bool
+        """
+        # pylint: disable=import-outside-toplevel
+        from amphisbaena.settings import SettingsSerializationException
+
+        try:
+            data = settings.dumps()
+        except SettingsSerializationException:
+            logger.debug("The settings can not be snapshot: %s", key)
+            return False
+
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = self.path(key)
+        temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+        return True
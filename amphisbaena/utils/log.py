@@ -5,23 +5,39 @@ import logging
 import platform
 import pprint
 import ssl
+import sys
+from functools import lru_cache
+from typing import Dict
 
 import orjson
 import yaml
 
 from amphisbaena.settings import Settings
 
+# The name of the console handler installed by configure_logging
+CONSOLE_HANDLER = "amphisbaena.console"
+
 
 def configure_logging(settings: Settings) -> None:
     """
-
+    Install the console handler on the first call, and reconfigure it on the
+    next ones, e.g. on every run in a long-lived process, pointing it to the
+    current sys.stderr
     :param settings:
     :type settings: Settings
     :return:
     :rtype: None
     """
     # Get a console handler and configure it
-    console_handler = logging.StreamHandler()
+    console_handler = next(
+        (x for x in logging.root.handlers if x.get_name() == CONSOLE_HANDLER), None
+    )
+    installed = console_handler is not None
+    if console_handler is None:
+        console_handler = logging.StreamHandler()
+        console_handler.set_name(CONSOLE_HANDLER)
+    else:
+        console_handler.setStream(sys.stderr)  # type: ignore
 
     formatter = logging.Formatter(
         fmt=settings["LOG_FORMATTER_FMT"],
@@ -31,54 +47,60 @@ def configure_logging(settings: Settings) -> None:
     console_handler.setLevel(settings["LOG_LEVEL"])
 
     # add this console handler into logging
-    logging.root.addHandler(console_handler)
+    if not installed:
+        logging.root.addHandler(console_handler)
 
 
-def get_runtime_info(logger) -> None:
+@lru_cache
+def _runtime_info() -> Dict[str, str]:
     """
+    The formatted information of the runtime, which does not change in a
+    process; platform.architecture runs a subprocess
+    :return:
+    :rtype: Dict[str, str]
+    """
+    return {
+        "platform": pprint.pformat(platform.platform()),
+        "details": pprint.pformat(
+            {
+                "OpenSSL": ssl.OPENSSL_VERSION,
+                "architecture": platform.architecture(),
+                "machine": platform.machine(),
+                "node": platform.node(),
+                "processor": platform.processor(),
+                "python_build": platform.python_build(),
+                "python_compiler": platform.python_compiler(),
+                "python_branch": platform.python_branch(),
+                "python_implementation": platform.python_implementation(),
+                "python_revision": platform.python_revision(),
+                "python_version": platform.python_version(),
+                "release": platform.release(),
+                "system": platform.system(),
+                "version": platform.version(),
+            }
+        ),
+        "versions": pprint.pformat(
+            {
+                "Python": platform.python_version(),
+                "orjson": orjson.__version__,
+                "PyYAML": yaml.__version__,
+            }
+        ),
+    }
+
 
+def get_runtime_info(logger) -> None:
+    """
+    Log the information of the runtime, gathered once per process
     :param logger:
     :type logger: logging.Logger
     :return:
     :rtype: None
     """
-    logger.info(
-        "Platform: %(platform)s", {"platform": pprint.pformat(platform.platform())}
-    )
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
-    logger.info(
-        "Platform details:\n%(details)s",
-        {
-            "details": pprint.pformat(
-                {
-                    "OpenSSL": ssl.OPENSSL_VERSION,
-                    "architecture": platform.architecture(),
-                    "machine": platform.machine(),
-                    "node": platform.node(),
-                    "processor": platform.processor(),
-                    "python_build": platform.python_build(),
-                    "python_compiler": platform.python_compiler(),
-                    "python_branch": platform.python_branch(),
-                    "python_implementation": platform.python_implementation(),
-                    "python_revision": platform.python_revision(),
-                    "python_version": platform.python_version(),
-                    "release": platform.release(),
-                    "system": platform.system(),
-                    "version": platform.version(),
-                }
-            )
-        },
-    )
-
-    logger.info(
-        "Versions:\n%(versions)s",
-        {
-            "versions": pprint.pformat(
-                {
-                    "Python": platform.python_version(),
-                    "orjson": orjson.__version__,
-                    "PyYAML": yaml.__version__,
-                }
-            )
-        },
-    )
+    info = _runtime_info()
+    logger.info("Platform: %(platform)s", {"platform": info["platform"]})
+    logger.info("Platform details:\n%(details)s", {"details": info["details"]})
+    logger.info("Versions:\n%(versions)s", {"versions": info["versions"]})
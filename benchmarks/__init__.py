@@ -0,0 +1,69 @@
+"""
+Benchmarks
+
+Every function named bench_* in a benchmark module prepares its data and
+returns the callable to time. Run a module directly to print its timings:
+
+    python -m benchmarks.bench_serialization
+
+or run them all and compare against the stored baseline, failing on any
+benchmark slower than the baseline by more than the threshold:
+
+    python -m benchmarks --threshold 0.25
+    python -m benchmarks --save
+"""
+import timeit
+from typing import Any, Callable, Dict, List, Mapping
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    """
+    Time the callable and return the best seconds per call
+    :param func:
+    :type func: Callable[[], Any]
+    :param repeat:
+    :type repeat: int
+    :return:
+    :rtype: float
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_module(namespace: Mapping[str, Any]) -> Dict[str, float]:
+    """
+    Run all the benchmarks found in a module namespace and print the timings
+    :param namespace:
+    :type namespace: Mapping[str, Any]
+    :return:
+    :rtype: Dict[str, float]
+    """
+    results = {}
+    for name, bench in namespace.items():
+        if name.startswith("bench_") and callable(bench):
+            results[name] = measure(bench())
+            print(f"{name:<48} {results[name] * 1e6:>12.2f} us")
+    return results
+
+
+def compare(
+    results: Mapping[str, float], baseline: Mapping[str, float], threshold: float
+) -> List[str]:
+    """
+    The benchmarks slower than their baseline by more than the threshold, a
+    ratio; the ones without a baseline are never regressions
+    :param results:
+    :type results: Mapping[str, float]
+    :param baseline:
+    :type baseline: Mapping[str, float]
+    :param threshold:
+    :type threshold: float
+    :return:
+    :rtype: List[str]
+    """
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
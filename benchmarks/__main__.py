@@ -0,0 +1,95 @@
+"""
+Run all the benchmarks and compare them against the stored baseline
+"""
+import sys
+from argparse import ArgumentParser, Namespace
+from importlib import import_module
+from pathlib import Path
+from pkgutil import iter_modules
+from typing import Dict
+
+import orjson
+
+from . import compare, run_module
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def get_arguments(*args) -> Namespace:
+    """
+
+    :param args:
+    :type args:
+    :return:
+    :rtype: Namespace
+    """
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="only run the benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="the tolerated slowdown against the baseline, as a ratio",
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE, help="the baseline file"
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="store the timings as the baseline instead of comparing",
+    )
+    return parser.parse_args(args)
+
+
+def main(*args) -> int:
+    """
+
+    :param args:
+    :return:
+    :rtype: int
+    """
+    ns_args = get_arguments(*args)
+
+    results: Dict[str, float] = {}
+    for module_info in iter_modules([str(Path(__file__).parent)]):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = import_module(f"{__package__}.{module_info.name}")
+        namespace = {
+            k: v
+            for k, v in vars(module).items()
+            if k.startswith("bench_") and ns_args.filter in k
+        }
+        for name, seconds in run_module(namespace).items():
+            results[f"{module_info.name}.{name}"] = seconds
+
+    baseline: Dict[str, float] = {}
+    if ns_args.baseline.exists():
+        baseline = orjson.loads(ns_args.baseline.read_bytes())
+
+    if ns_args.save:
+        baseline.update(results)
+        ns_args.baseline.write_bytes(
+            orjson.dumps(baseline, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        )
+        return 0
+
+    regressions = compare(results, baseline, ns_args.threshold)
+    for name in regressions:
+        print(
+            f"REGRESSION {name}: {results[name] * 1e6:.2f} us against "
+            f"{baseline[name] * 1e6:.2f} us",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
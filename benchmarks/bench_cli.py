@@ -0,0 +1,200 @@
+"""
+Benchmarks of the command line interface
+"""
+from ast import literal_eval
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, List
+
+import yaml
+
+from amphisbaena.__main__ import get_arguments, get_parser
+from amphisbaena.__main__ import main as a_main
+from amphisbaena.__main__ import (
+    parse_arguments,
+    read_overrides,
+    resolve_settings,
+    run,
+)
+from amphisbaena.batch import run_batch
+from amphisbaena.settings import Settings
+from amphisbaena.utils.misc import LITERALS_CACHE, literal_value
+
+from . import run_module
+
+
+def make_values(size: int = 1_000) -> List[str]:
+    """
+    The values of -s options, as typed on command lines
+    :param size:
+    :type size: int
+    :return:
+    :rtype: List[str]
+    """
+    forms = ("{}", "{}.5", "'value {}'", "True", "None", "[{}, {}]")
+    return [forms[i % len(forms)].format(i, i) for i in range(size)]
+
+
+def bench_literal_eval() -> Callable[[], Any]:
+    """
+    Parse the values with literal_eval, as -s did before literal_value
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    values = make_values()
+    return lambda: [literal_eval(x) for x in values]
+
+
+def bench_literal_value() -> Callable[[], Any]:
+    """
+    Parse the values never seen before
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    values = make_values()
+
+    def run() -> List[Any]:
+        LITERALS_CACHE.clear()
+        return [literal_value(x) for x in values]
+
+    return run
+
+
+def bench_literal_value_cached() -> Callable[[], Any]:
+    """
+    Parse the values again, as a daemon or a batch does
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    values = make_values()
+    return lambda: [literal_value(x) for x in values]
+
+
+def bench_setting_options() -> Callable[[], Any]:
+    """
+    Parse 1000 overrides given as -s options
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    args = [x for i in range(1_000) for x in ("-s", f"KEY_{i}={i}")]
+    return lambda: get_arguments(*args)
+
+
+def bench_settings_file() -> Callable[[], Any]:
+    """
+    Parse 1000 overrides given as the lines of a -S file
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    lines = [f"KEY_{i}={i}\n" for i in range(1_000)]
+    return lambda: read_overrides(lines)
+
+
+def bench_get_arguments() -> Callable[[], Any]:
+    """
+    Parse the arguments with the cached parser
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    args = ("-s", "A=1", "-s", "B='b'")
+    return lambda: get_arguments(*args)
+
+
+def bench_get_arguments_new_parser() -> Callable[[], Any]:
+    """
+    Build the parser and parse the arguments, as get_arguments did before the
+    parser was cached
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    args = ("-s", "A=1", "-s", "B='b'")
+    return lambda: get_parser.__wrapped__().parse_args(args)
+
+
+def bench_main_repeated() -> Callable[[], Any]:
+    """
+    Run main in process, as the daemon does for each command; the level keeps
+    the runtime information out of the output
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    args = ("-s", "A=1", "-s", "LOG_LEVEL=40")
+    return lambda: a_main(*args)
+
+
+def bench_run_base_settings() -> Callable[[], Any]:
+    """
+    Run the command in process over shared base settings, as an embedding
+    process does
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    base = Settings(default_settings=True)
+    args = ("-s", "A=1", "-s", "LOG_LEVEL=40")
+    return lambda: run(args, base)
+
+
+def bench_batch_100() -> Callable[[], Any]:
+    """
+    Run 100 commands as a batch, against about 100 times the startup of a
+    fresh interpreter when run one by one
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    base = Settings(default_settings=True, settings={"LOG_LEVEL": 40})
+    lines = [f'["-s", "KEY={i}"]\n' for i in range(100)]
+    return lambda: run_batch(lines, base, output=StringIO())
+
+
+def make_config(directory: str, size: int = 2_000) -> str:
+    """
+    A YAML config file of the given size
+    :param directory:
+    :type directory: str
+    :param size:
+    :type size: int
+    :return:
+    :rtype: str
+    """
+    path = Path(directory, "settings.yaml")
+    path.write_text(
+        yaml.safe_dump({f"KEY_{i}": [i, f"value {i}"] for i in range(size)})
+    )
+    return str(path)
+
+
+def bench_resolve_settings() -> Callable[[], Any]:
+    """
+    Resolve the settings of a YAML config file
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+    args = ("-c", make_config(directory.name))
+    return lambda: (directory, resolve_settings(parse_arguments(*args)))
+
+
+def bench_resolve_settings_snapshot() -> Callable[[], Any]:
+    """
+    Resolve the same settings from their snapshot
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+    args = ("-c", make_config(directory.name), "--settings-cache", directory.name)
+    resolve_settings(parse_arguments(*args))
+    return lambda: (directory, resolve_settings(parse_arguments(*args)))
+
+
+def main() -> None:
+    """
+
+    :return:
+    :rtype: None
+    """
+    run_module(globals())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmarks of loading 20 of the 5000 keys of a shared configuration file
+"""
+import atexit
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+import yaml
+
+from amphisbaena.settings import Settings
+
+from . import run_module
+
+CONTENT = {
+    f"KEY_{i}": {"a": list(range(20)), "b": {"c": "x" * 30, "d": [1.5, None, True]}}
+    for i in range(5000)
+}
+KEYS = [f"KEY_{i}" for i in range(0, 5000, 250)]
+
+_directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+atexit.register(_directory.cleanup)
+JSON_FILE = Path(_directory.name, "settings.json")
+JSON_FILE.write_bytes(orjson.dumps(CONTENT))
+YAML_FILE = Path(_directory.name, "settings.yaml")
+YAML_FILE.write_text(yaml.safe_dump(CONTENT))
+
+
+def bench_from_json() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return lambda: Settings.from_json(JSON_FILE)
+
+
+def bench_from_json_keys() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return lambda: Settings.from_json(JSON_FILE, keys=KEYS)
+
+
+def bench_from_yaml() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return lambda: Settings.from_yaml(YAML_FILE)
+
+
+def bench_from_yaml_keys() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return lambda: Settings.from_yaml(YAML_FILE, keys=KEYS)
+
+
+if __name__ == "__main__":
+    run_module(globals())
@@ -0,0 +1,112 @@
+"""
+Benchmarks of the per-tenant settings overlays
+"""
+import tracemalloc
+from typing import Any, Callable, List
+
+from amphisbaena.settings import Settings, SettingsOverlay
+
+from . import run_module
+
+TENANTS = 10_000
+
+
+def make_base(size: int = 1_000) -> Settings:
+    """
+
+    :param size:
+    :type size: int
+    :return:
+    :rtype: Settings
+    """
+    return Settings({f"KEY_{i}": f"value {i}" for i in range(size)})
+
+
+def overrides(tenant: int) -> dict:
+    """
+
+    :param tenant:
+    :type tenant: int
+    :return:
+    :rtype: dict
+    """
+    return {f"KEY_{i}": f"tenant {tenant}" for i in range(5)}
+
+
+def memory(func: Callable[[], List[Settings]]) -> int:
+    """
+    The bytes allocated and kept by the callable
+
+    :param func:
+    :type func: Callable[[], List[Settings]]
+    :return:
+    :rtype: int
+    """
+    tracemalloc.start()
+    try:
+        kept = func()  # pylint: disable=unused-variable
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current
+
+
+def bench_overlay_init() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    base = make_base()
+    overrides_ = overrides(0)
+    return lambda: SettingsOverlay(base, overrides_)
+
+
+def bench_overlay_getitem_base() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    overlay = SettingsOverlay(make_base(), overrides(0))
+    return lambda: overlay["KEY_500"]
+
+
+def bench_overlay_getitem_override() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    overlay = SettingsOverlay(make_base(), overrides(0))
+    return lambda: overlay["KEY_0"]
+
+
+def main() -> None:
+    """
+    Compare the memory of the overlays with full copies for all the tenants;
+    the full copies are measured on a sample of the tenants and extrapolated
+    :return:
+    :rtype: None
+    """
+    run_module(globals())
+
+    base = make_base()
+    overlays = memory(
+        lambda: [SettingsOverlay(base, overrides(x)) for x in range(TENANTS)]
+    )
+
+    sample = TENANTS // 20
+    copies = memory(
+        lambda: [
+            Settings({**base.copy_to_dict(), **overrides(x)}) for x in range(sample)
+        ]
+    )
+    copies = copies * TENANTS // sample
+
+    print(f"{TENANTS} tenants, overlays: {overlays / 2 ** 20:.1f} MiB")
+    print(f"{TENANTS} tenants, full copies: {copies / 2 ** 20:.1f} MiB (estimated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmarks of the Settings wire format against pickle
+"""
+import pickle  # nosec
+from typing import Any, Callable
+
+import orjson
+
+from amphisbaena.settings import PRIORITIES, Settings
+
+from . import run_module
+
+
+def make_settings(size: int = 10_000) -> Settings:
+    """
+    Build settings of the given size across all the priorities
+    :param size:
+    :type size: int
+    :return:
+    :rtype: Settings
+    """
+    settings = Settings()
+    for index, priority in enumerate(PRIORITIES):
+        with settings.unfreeze(priority) as settings_:
+            settings_.update(
+                {
+                    f"KEY_{i}": (f"value {i}", i, [i * 0.5])
+                    for i in range(size)
+                    if i % len(PRIORITIES) == index
+                }
+            )
+    return settings
+
+
+def bench_pickle_state_dumps() -> Callable[[], Any]:
+    """
+    Pickle the instance state, as pickle did before the wire format
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = make_settings()
+    return lambda: pickle.dumps(settings.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def bench_pickle_state_loads() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    data = pickle.dumps(make_settings().__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+    return lambda: pickle.loads(data)  # nosec
+
+
+def bench_pickle_dumps() -> Callable[[], Any]:
+    """
+    Pickle through Settings.__reduce__
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = make_settings()
+    return lambda: pickle.dumps(settings, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def bench_wire_dumps() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = make_settings()
+    return settings.dumps
+
+
+def bench_wire_loads() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    data = make_settings().dumps()
+    return lambda: Settings.loads(data)
+
+
+def bench_items_to_json() -> Callable[[], Any]:
+    """
+    Serialize through the MutableMapping interface, as before to_json_bytes
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = make_settings()
+    return lambda: orjson.dumps(dict(settings.items()))
+
+
+def bench_to_json_bytes() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return make_settings().to_json_bytes
+
+
+def bench_to_yaml() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return make_settings().to_yaml
+
+
+if __name__ == "__main__":
+    run_module(globals())
+    print(
+        "pickle state size:",
+        len(pickle.dumps(make_settings().__dict__, pickle.HIGHEST_PROTOCOL)),
+        "wire size:",
+        len(make_settings().dumps()),
+    )
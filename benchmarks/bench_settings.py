@@ -0,0 +1,131 @@
+"""
+Benchmarks of the Settings construction, updates and reads
+"""
+from typing import Any, Callable
+
+from amphisbaena.settings import Settings
+
+from . import run_module
+
+
+def bench_init() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return Settings
+
+
+def bench_init_default_settings() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return lambda: Settings(default_settings=True)
+
+
+def bench_init_default_settings_with_settings() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = {f"KEY_{i}": i for i in range(10)}
+    return lambda: Settings(settings, priority="cmd", default_settings=True)
+
+
+def _bench_update(size: int) -> Callable[[], Any]:
+    """
+    Update unfrozen settings, already holding the keys at a lower priority
+    :param size:
+    :type size: int
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    values = {f"KEY_{i}": i for i in range(size)}
+
+    def update() -> None:
+        settings = Settings(values)
+        with settings.unfreeze("cmd") as settings_:
+            settings_.update(values)
+
+    return update
+
+
+def bench_update_10() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return _bench_update(10)
+
+
+def bench_update_1000() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return _bench_update(1_000)
+
+
+def bench_update_100000() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    return _bench_update(100_000)
+
+
+def bench_getitem() -> Callable[[], Any]:
+    """
+    A hot read of a default setting
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = Settings(default_settings=True)
+    return lambda: settings["LOG_LEVEL"]
+
+
+def bench_getitem_tracked() -> Callable[[], Any]:
+    """
+    A hot read of a default setting with the reads tracked
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = Settings(default_settings=True)
+    settings.track_reads()
+    return lambda: settings["LOG_LEVEL"]
+
+
+def bench_unfreeze() -> Callable[[], Any]:
+    """
+    Enter and exit unfreeze
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = Settings(default_settings=True)
+
+    def unfreeze() -> None:
+        with settings.unfreeze("cmd"):
+            pass
+
+    return unfreeze
+
+
+def bench_copy_to_dict() -> Callable[[], Any]:
+    """
+
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    settings = Settings({f"KEY_{i}": i for i in range(1_000)}, default_settings=True)
+    return settings.copy_to_dict
+
+
+if __name__ == "__main__":
+    run_module(globals())
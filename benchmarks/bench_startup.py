@@ -0,0 +1,80 @@
+"""
+Benchmarks of the startup of the command line interface
+"""
+import subprocess  # nosec
+import sys
+from typing import Any, Callable, Dict
+
+from . import run_module
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    The cumulative import times in microseconds of the modules imported by
+    importing the module in a fresh interpreter, from python -X importtime
+    :param module:
+    :type module: str
+    :return:
+    :rtype: Dict[str, int]
+    """
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_startup_import() -> Callable[[], Any]:
+    """
+    A fresh interpreter importing the entry point; the budget of the import
+    time, compared against the baseline
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    command = [sys.executable, "-c", "import amphisbaena.__main__"]
+    return lambda: subprocess.run(command, capture_output=True, check=True)  # nosec
+
+
+def bench_startup_version() -> Callable[[], Any]:
+    """
+    A fresh interpreter printing the version
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    command = [sys.executable, "-m", "amphisbaena", "--version"]
+    return lambda: subprocess.run(command, capture_output=True, check=True)  # nosec
+
+
+def bench_startup_main() -> Callable[[], Any]:
+    """
+    A fresh interpreter loading the settings and configuring the logging
+    :return:
+    :rtype: Callable[[], Any]
+    """
+    command = [sys.executable, "-m", "amphisbaena", "-s", "A=1"]
+    return lambda: subprocess.run(command, capture_output=True, check=True)  # nosec
+
+
+def main() -> None:
+    """
+    Print the timings and the import time of the entry point
+    :return:
+    :rtype: None
+    """
+    run_module(globals())
+
+    times = import_times("amphisbaena.__main__")
+    print(f"{'import amphisbaena.__main__':<48} {times['amphisbaena.__main__']:>12} us")
+
+
+if __name__ == "__main__":
+    main()
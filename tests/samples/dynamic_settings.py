@@ -0,0 +1,7 @@
+"""
+Settings for the test cases of the lazy module loading, bound through globals()
+"""
+SEP = "_"
+
+for _name in ("A", "B"):
+    globals()[f"PREFIX{SEP}{_name}"] = _name.lower()
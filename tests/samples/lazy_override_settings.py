@@ -0,0 +1,10 @@
+"""
+Settings for the test cases of the lazy module loading, overriding a default
+only when the environment asks for it
+"""
+import os
+
+VERBOSE = bool(os.environ.get("VERBOSE"))
+
+if VERBOSE:
+    LOG_LEVEL = 10
@@ -0,0 +1,26 @@
+"""
+Settings for the test cases of the lazy module loading
+"""
+import logging
+from logging import INFO as LEVEL_INFO
+
+A = 1
+B, (C, D) = 2, (3, 4)
+E: int = 5
+
+if A:
+    F = 6
+else:
+    G = 7
+
+try:
+    H = 8
+except ImportError:
+    I = 9
+
+for J in range(1):
+    pass
+
+lower = "ignored"
+
+LOG_LEVEL = logging.INFO
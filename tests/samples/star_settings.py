@@ -0,0 +1,7 @@
+"""
+Settings for the test cases of the lazy module loading, with a star import
+"""
+# pylint: disable=wildcard-import,unused-wildcard-import
+from tests.samples.settings import *
+
+Z = 26
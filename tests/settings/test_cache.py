@@ -0,0 +1,157 @@
+"""
+Test the settings cache
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.case import TestCase
+from unittest.main import main
+from unittest.mock import patch
+
+import orjson
+import yaml
+
+from amphisbaena.settings import Setting, Settings, UnknownConfigFormatException
+from amphisbaena.settings.cache import CacheStats, SettingsCache
+
+
+class SettingsCacheTest(TestCase):
+    """
+    test SettingsCache class
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = Path(self.temp_dir.name)
+        for tenant in range(3):
+            (self.path / f"{tenant}.json").write_bytes(orjson.dumps({"A": tenant}))
+        (self.path / "3.yaml").write_text(yaml.safe_dump({"A": 3}))
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.temp_dir.cleanup()
+
+    def test_get(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        cache = SettingsCache(priority="env")
+
+        settings = cache.get(self.path / "0.json")
+        self.assertEqual(settings._data["A"], Setting("env", "A", 0))
+        self.assertIs(cache.get(str(self.path / "0.json")), settings)
+        self.assertEqual(cache.get(self.path / "3.yaml")["A"], 3)
+        self.assertEqual(cache.stats, CacheStats(1, 2, 0, 2, cache.stats.bytes))
+
+        # a modified file is loaded again
+        path = self.path / "0.json"
+        path.write_bytes(orjson.dumps({"A": 10}))
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(cache.get(path)["A"], 10)
+        self.assertEqual(len(cache), 2)
+
+        (self.path / "4.txt").write_text("unknown format")
+        with self.assertRaises(UnknownConfigFormatException):
+            cache.get(self.path / "4.txt")
+
+        with self.assertRaises(FileNotFoundError):
+            cache.get(self.path / "missing.json")
+
+    def test_eviction(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        cache = SettingsCache(maxsize=2)
+        cache.get(self.path / "0.json")
+        cache.get(self.path / "1.json")
+        cache.get(self.path / "0.json")
+        cache.get(self.path / "2.json")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.evictions, 1)
+        cache.get(self.path / "0.json")
+        self.assertEqual(cache.stats.hits, 2)
+
+        size = (self.path / "0.json").stat().st_size
+        cache = SettingsCache(maxsize=None, maxbytes=size * 2)
+        for tenant in range(3):
+            cache.get(self.path / f"{tenant}.json")
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.bytes, size * 2)
+
+        cache.invalidate(self.path / "2.json")
+        self.assertEqual(cache.stats.bytes, size)
+        cache.clear()
+        self.assertEqual(cache.stats, CacheStats(0, 3, 1, 0, 0))
+
+    def test_single_flight(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        calls = []
+
+        from_file = Settings.from_file
+
+        def from_file_slowly(path, priority):
+            calls.append(path)
+            time.sleep(0.1)
+            return from_file(path, priority)
+
+        cache = SettingsCache()
+        results = []
+        with patch.object(Settings, "from_file", from_file_slowly):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(cache.get(self.path / "0.json"))
+                )
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(x is results[0] for x in results))
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hits, 7)
+
+    def test_single_flight_error(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        path = self.path / "5.json"
+        path.write_bytes(b"{")
+
+        cache = SettingsCache()
+        with self.assertRaises(orjson.JSONDecodeError):
+            cache.get(path)
+        self.assertEqual(len(cache), 0)
+
+        path.write_bytes(b"{}")
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(len(cache.get(path)), 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Test the interpolation of setting values
+"""
+from unittest.case import TestCase
+from unittest.main import main
+
+from amphisbaena.settings.interpolation import (
+    ContainerTemplate,
+    Reference,
+    Template,
+    compile_template,
+    compile_value,
+)
+
+
+class InterpolationTest(TestCase):
+    """
+    test the template compilation and rendering
+    """
+
+    def test_compile_template(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        template = compile_template("${ROOT}/logs/${NAME}.log")
+        self.assertIsInstance(template, Template)
+        self.assertSequenceEqual(
+            template.parts,  # type: ignore
+            (Reference("ROOT"), "/logs/", Reference("NAME"), ".log"),
+        )
+        self.assertSequenceEqual(template.references, ("ROOT", "NAME"))  # type: ignore
+
+        # the compiled form is shared by the identical templates
+        self.assertIs(compile_template("${ROOT}/logs/${NAME}.log"), template)
+
+        self.assertEqual(compile_template("no reference"), "no reference")
+        self.assertEqual(compile_template("$${ROOT}"), "${ROOT}")
+        self.assertEqual(compile_template("${lower}"), "${lower}")
+
+    def test_compile_value(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertEqual(compile_value(1), 1)
+        self.assertEqual(compile_value("plain"), "plain")
+        self.assertIsInstance(compile_value("${A}"), Template)
+
+        self.assertEqual(compile_value({"A": ["plain", 1]}), {"A": ["plain", 1]})
+        self.assertEqual(compile_value(["$${A}"]), ["${A}"])
+
+        value = {"A": ["${ROOT}/logs", {"B": ("${PORT}",)}], "C": "plain"}
+        template = compile_value(value)
+        self.assertIsInstance(template, ContainerTemplate)
+        self.assertIs(template.source, value)
+        self.assertSequenceEqual(template.references, ("ROOT", "PORT"))
+
+    def test_render(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = {"ROOT": "/srv", "PORT": 8080}
+
+        self.assertEqual(compile_template("${ROOT}/data").render(settings), "/srv/data")
+        self.assertEqual(compile_template("${PORT}").render(settings), 8080)
+        self.assertEqual(
+            compile_template("${ROOT}:${PORT} $${ROOT}").render(settings),
+            "/srv:8080 ${ROOT}",
+        )
+
+        with self.assertRaises(KeyError):
+            compile_template("${MISSING}").render(settings)
+
+        template = compile_value({"A": ["${ROOT}/logs", {"B": ("${PORT}",)}]})
+        self.assertEqual(
+            template.render(settings), {"A": ["/srv/logs", {"B": (8080,)}]}
+        )
+        with self.assertRaises(KeyError):
+            compile_value(["${MISSING}"]).render(settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Test the lazy module-backed settings
+"""
+import sys
+from unittest.case import TestCase
+from unittest.main import main
+
+from amphisbaena.settings import Settings
+from amphisbaena.settings.lazy import (
+    LazyAttribute,
+    LazyModule,
+    module_names,
+    source_names,
+)
+
+
+class LazyTest(TestCase):
+    """
+    test the lazy module and attributes
+    """
+
+    def test_module_names(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertListEqual(
+            module_names("tests.samples.lazy_settings"),  # type: ignore
+            [
+                "A",
+                "B",
+                "C",
+                "D",
+                "E",
+                "F",
+                "G",
+                "H",
+                "I",
+                "J",
+                "LEVEL_INFO",
+                "LOG_LEVEL",
+            ],
+        )
+        self.assertIsNone(module_names("tests.samples.star_settings"))
+        self.assertIsNone(module_names("tests.samples.missing"))
+        self.assertIsNone(module_names("sys"))
+        self.assertIsNone(module_names("tests.samples.dynamic_settings"))
+
+    def test_source_names(self) -> None:
+        """
+        test the names are unknown when the scan can not see all of them
+        :return:
+        :rtype: None
+        """
+        self.assertListEqual(
+            source_names("with open(F) as (FP, G):\n    X = 1\nY: int = 2\n"),
+            ["FP", "G", "X", "Y"],
+        )
+
+        sources = [
+            "X = 1\nexec('Y = 2')\n",
+            "X = 1\nvars()['Y'] = 2\n",
+            "if (X := 1):\n    pass\n",
+            "X = 1\ndef __getattr__(name):\n    return name\n",
+            "async def f():\n    pass\nasync with f() as X:\n    pass\n",
+        ]
+        if sys.version_info >= (3, 10):
+            sources.append("match 1:\n    case 1:\n        SEP = '_'\n")
+        if sys.version_info >= (3, 11):
+            sources.append("try:\n    X = 1\nexcept* ValueError:\n    Y = 2\n")
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertIsNone(source_names(source))
+
+        # the eager import gives the names the scan can not see
+        sys.modules.pop("tests.samples.dynamic_settings", None)
+        settings = Settings.from_module("tests.samples.dynamic_settings", lazy=True)
+        self.assertDictEqual(
+            settings.copy_to_dict(), {"SEP": "_", "PREFIX_A": "a", "PREFIX_B": "b"}
+        )
+
+    def test_lazy_attribute(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        sys.modules.pop("tests.samples.lazy_settings", None)
+        module = LazyModule("tests.samples.lazy_settings")
+        attribute = LazyAttribute(module, "A")
+        self.assertNotIn("tests.samples.lazy_settings", sys.modules)
+
+        self.assertEqual(attribute.load(), 1)
+        self.assertIn("tests.samples.lazy_settings", sys.modules)
+
+        with self.assertRaises(KeyError):
+            LazyAttribute(module, "G").load()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+The test cases of the parsers of configuration files
+"""
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.case import TestCase, skipIf
+from unittest.main import main
+
+from amphisbaena.settings import UnknownConfigFormatException
+from amphisbaena.settings.parsers import (
+    PARSERS,
+    Parser,
+    get_parser,
+    key_selector,
+    load_ini,
+    load_yaml_partial,
+    read_file,
+    register_parser,
+    TOML_MODULE,
+)
+
+
+class ParsersTest(TestCase):
+    """
+    The test cases of the parsers of configuration files
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.directory.cleanup()
+
+    def test_get_parser_suffix(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertEqual(get_parser("a.json").name, "json")
+        self.assertEqual(get_parser("a.yaml").name, "yaml")
+        self.assertEqual(get_parser(Path("a.YML")).name, "yaml")
+        self.assertEqual(get_parser("a.cfg").name, "ini")
+
+        with self.assertRaises(UnknownConfigFormatException):
+            get_parser("a.txt")
+
+    def test_get_parser_sniff(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertEqual(get_parser(head=b'  {"A": 1}').name, "json")
+        self.assertEqual(get_parser(head=b"; comment\n[section]\nA = a").name, "ini")
+        self.assertEqual(get_parser(head=b"---\nA: 1").name, "yaml")
+        self.assertEqual(get_parser(head=b"A: 1\nB: [1, 2]").name, "yaml")
+
+        with self.assertRaises(UnknownConfigFormatException):
+            get_parser("a.txt", b"unknown format")
+
+    @skipIf(TOML_MODULE is None, "tomllib or tomli is not available")
+    def test_toml(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        head = b'A = 1\nB = "b"\n\n[C]\nD = [1, 2]\n'
+        self.assertEqual(get_parser(head=head).name, "toml")
+        self.assertEqual(get_parser(head=b"[C]\nD = some text").name, "ini")
+
+        path = self.path / "settings"
+        path.write_bytes(head)
+        self.assertDictEqual(read_file(path), {"A": 1, "B": "b", "C": {"D": [1, 2]}})
+
+    def test_load_ini(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        content = load_ini(
+            BytesIO(b"[DEFAULT]\nLOG_LEVEL = INFO\n\n[Database]\nHost = db:5432\n")
+        )
+        self.assertDictEqual(
+            content,
+            {"LOG_LEVEL": "INFO", "Database": {"LOG_LEVEL": "INFO", "Host": "db:5432"}},
+        )
+
+    def test_read_file(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        path = self.path / "settings.json"
+        path.write_bytes(b'{"A": 1}')
+        self.assertDictEqual(read_file(path), {"A": 1})
+
+        path = self.path / "settings.in"
+        path.write_bytes(b"A: 1\n")
+        self.assertDictEqual(read_file(path), {"A": 1})
+        self.assertEqual(read_file(path, PARSERS["yaml"]), {"A": 1})
+
+    def test_key_selector(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertIsNone(key_selector())
+
+        selector = key_selector(["A"], ["DB_"])
+        self.assertTrue(selector("A"))
+        self.assertTrue(selector("DB_HOST"))
+        self.assertFalse(selector("AB"))
+
+        selector = key_selector(keys=iter(["A"]))
+        self.assertTrue(selector("A"))
+        self.assertFalse(selector("B"))
+
+    def test_load_yaml_partial(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        selector = key_selector(["A", "C"], ["DB_"])
+
+        content = load_yaml_partial(
+            BytesIO(b"A: 1\nB: [1, {b: 2}]\nC: &c {c: [1, 2]}\nD: *c\nDB_HOST: h\n"),
+            selector,
+        )
+        self.assertDictEqual(content, {"A": 1, "C": {"c": [1, 2]}, "DB_HOST": "h"})
+
+        content = load_yaml_partial(BytesIO(b"A: &a 1\nB: *a\nC: 2\n"), selector)
+        self.assertDictEqual(content, {"A": 1, "C": 2})
+
+        self.assertIsNone(load_yaml_partial(BytesIO(b""), selector))
+        self.assertListEqual(load_yaml_partial(BytesIO(b"- A\n"), selector), ["A"])
+
+    def test_load_yaml_partial_fallback(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        selector = key_selector(["A", "C"])
+
+        # an alias to a skipped value
+        content = load_yaml_partial(BytesIO(b"B: &b [1, 2]\nC: *b\n"), selector)
+        self.assertDictEqual(content, {"C": [1, 2]})
+
+        # a merge key
+        content = load_yaml_partial(BytesIO(b"<<: {A: 1, B: 2}\nC: 3\n"), selector)
+        self.assertDictEqual(content, {"A": 1, "C": 3})
+
+    def test_read_file_keys(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        path = self.path / "settings.json"
+        path.write_bytes(b'{"A": 1, "B": {"b": 2}, "DB_HOST": "h"}')
+        self.assertDictEqual(read_file(path, keys=["A"]), {"A": 1})
+        self.assertDictEqual(read_file(path, prefixes=["DB_"]), {"DB_HOST": "h"})
+
+        path = self.path / "settings.ini"
+        path.write_bytes(b"[DEFAULT]\nA = 1\nB = 2\n")
+        self.assertDictEqual(read_file(path, keys=["A"]), {"A": "1"})
+
+    def test_register_parser(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        parser = Parser(
+            "lines",
+            (".lines",),
+            lambda fh: dict(x.split(b"=", 1) for x in fh.read().splitlines()),
+        )
+        register_parser(parser)
+        try:
+            path = self.path / "settings.lines"
+            path.write_bytes(b"A=1\nB=2")
+            self.assertDictEqual(read_file(path), {b"A": b"1", b"B": b"2"})
+        finally:
+            del PARSERS["lines"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+The test cases of the settings load profiler
+"""
+import asyncio
+import sys
+import threading
+from tempfile import NamedTemporaryFile
+from unittest.case import TestCase
+from unittest.main import main
+
+import orjson
+
+from amphisbaena.settings import Settings, default_layer
+from amphisbaena.settings.profiler import (
+    LoadProfiler,
+    SourceTiming,
+    get_profiler,
+    measure,
+    profile,
+)
+
+
+class ProfilerTest(TestCase):
+    """
+    The test cases of the settings load profiler
+    """
+
+    def test_profile(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertIsNone(get_profiler())
+
+        with profile() as profiler:
+            self.assertIs(get_profiler(), profiler)
+            inner = LoadProfiler()
+            with profile(inner):
+                self.assertIs(get_profiler(), inner)
+            self.assertIs(get_profiler(), profiler)
+
+        self.assertIsNone(get_profiler())
+
+        with measure("source", "stage") as record:
+            record.keys = 1
+        self.assertListEqual(profiler.records, [])
+
+    def test_report(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps({"A": 1, "B": 2}))
+        json_file.seek(0)
+
+        sys.modules.pop("tests.samples.lazy_settings", None)
+        with profile() as profiler:
+            default_layer("tests.samples.lazy_settings")
+            Settings.from_json(json_file.name)
+
+        self.assertListEqual(
+            [(x.source, x.stage) for x in profiler.records],
+            [
+                ("tests.samples.lazy_settings", "find_spec"),
+                ("tests.samples.lazy_settings", "import_module"),
+                ("tests.samples.lazy_settings", "settings"),
+                (json_file.name, "json"),
+                (json_file.name, "settings"),
+            ],
+        )
+        parsing = profiler.records[3]
+        self.assertEqual(parsing.keys, 2)
+        self.assertEqual(parsing.bytes, len(orjson.dumps({"A": 1, "B": 2})))
+
+        report = profiler.report()
+        self.assertSetEqual(
+            set(report["stages"]), {"find_spec", "import_module", "json", "settings"}
+        )
+        self.assertAlmostEqual(
+            report["seconds"], sum(x.seconds for x in profiler.records)
+        )
+        self.assertEqual(report["sources"][4]["keys"], 2)
+
+        lines = profiler.format().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(lines[4].endswith(json_file.name))
+        self.assertTrue(lines[-1].startswith("total"))
+
+    def test_profile_contexts(self) -> None:
+        """
+        test the profilers of the threads and of the tasks are independent
+        :return:
+        :rtype: None
+        """
+        entered = threading.Event()
+        exited = threading.Event()
+
+        def other() -> None:
+            with profile():
+                entered.set()
+                exited.wait(5)
+
+        # the profilers interleave: the thread exits its profile last
+        thread = threading.Thread(target=other)
+        with profile() as profiler:
+            thread.start()
+            entered.wait(5)
+        exited.set()
+        thread.join()
+        self.assertIsNone(get_profiler())
+        self.assertEqual(len(profiler.records), 0)
+
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps({"A": 1}))
+        json_file.seek(0)
+
+        # the parsing in the thread of the executor is recorded
+        loop = asyncio.new_event_loop()
+        try:
+            with profile() as profiler:
+                loop.run_until_complete(Settings.afrom_json(json_file.name))
+        finally:
+            loop.close()
+        self.assertListEqual([x.stage for x in profiler.records], ["json", "settings"])
+
+    def test_source_timing(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        profiler = LoadProfiler()
+        with self.assertRaises(ValueError):
+            with profiler.measure("source", "stage"):
+                raise ValueError
+        self.assertEqual(profiler.records[0].source, "source")
+        self.assertIsInstance(profiler.records[0], SourceTiming)
+
+
+if __name__ == "__main__":
+    main()
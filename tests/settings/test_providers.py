@@ -0,0 +1,175 @@
+"""
+Test the settings providers
+"""
+import os
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+from unittest.case import TestCase
+from unittest.main import main
+
+import orjson
+import yaml
+
+from amphisbaena.settings import Setting, Settings
+from amphisbaena.settings.providers import (
+    CachedProvider,
+    DirectoryProvider,
+    ProviderUnavailableException,
+    SettingsProvider,
+    Snapshot,
+)
+
+
+class UnavailableProvider(SettingsProvider):
+    """
+    A provider whose backend is always down
+    """
+
+    def version(self) -> str:
+        """
+
+        :return:
+        :rtype: str
+        """
+        raise ProviderUnavailableException
+
+    def fetch(self, version: Optional[str] = None) -> Optional[Snapshot]:
+        """
+
+        :param version:
+        :type version: Optional[str]
+        :return:
+        :rtype: Optional[Snapshot]
+        """
+        raise ProviderUnavailableException
+
+
+class ProvidersTest(TestCase):
+    """
+    test the providers
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = Path(self.temp_dir.name) / "conf.d"
+        self.path.mkdir()
+        (self.path / "00-base.yaml").write_text(yaml.safe_dump({"A": 1, "B": 1}))
+        (self.path / "10-override.json").write_bytes(orjson.dumps({"B": 2}))
+        (self.path / "README").write_text("ignored")
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.temp_dir.cleanup()
+
+    def test_directory_provider(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        provider = DirectoryProvider(self.path)
+
+        snapshot = provider.fetch()
+        self.assertIsNotNone(snapshot)
+        self.assertDictEqual(snapshot.settings, {"A": 1, "B": 2})  # type: ignore
+        self.assertEqual(snapshot.version, provider.version())  # type: ignore
+
+        self.assertIsNone(provider.fetch(snapshot.version))  # type: ignore
+
+        (self.path / "10-override.json").write_bytes(orjson.dumps({"B": 30}))
+        snapshot_ = provider.fetch(snapshot.version)  # type: ignore
+        self.assertIsNotNone(snapshot_)
+        self.assertDictEqual(snapshot_.settings, {"A": 1, "B": 30})  # type: ignore
+
+        with self.assertRaises(ProviderUnavailableException):
+            DirectoryProvider(self.path / "missing").fetch()
+
+    def test_cached_provider(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        cache = Path(self.temp_dir.name) / "cache" / "settings.json"
+        provider = CachedProvider(DirectoryProvider(self.path), cache)
+        self.assertIsNone(provider.cached())
+
+        snapshot = provider.load()
+        self.assertDictEqual(snapshot.settings, {"A": 1, "B": 2})
+        self.assertEqual(provider.cached(), snapshot)
+        self.assertIsNone(provider.fetch(snapshot.version))
+
+        # the cached copy survives the backend going away
+        provider = CachedProvider(UnavailableProvider(), cache)
+        self.assertEqual(provider.load(background=False), snapshot)
+        self.assertEqual(provider.fetch(), snapshot)
+
+        os.remove(cache)
+        with self.assertRaises(ProviderUnavailableException):
+            provider.load()
+
+        cache.write_bytes(b"corrupted")
+        self.assertIsNone(provider.cached())
+
+    def test_cached_provider_refresh(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        cache = Path(self.temp_dir.name) / "settings.json"
+        provider = CachedProvider(DirectoryProvider(self.path), cache)
+        provider.load()
+
+        (self.path / "10-override.json").write_bytes(orjson.dumps({"B": 30}))
+        self.assertEqual(provider.load(background=False).settings["B"], 2)
+        provider.refresh()
+        self.assertEqual(provider.load(background=False).settings["B"], 30)
+
+    def test_watch(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        provider = DirectoryProvider(self.path)
+        received = threading.Event()
+        snapshots = []
+
+        def callback(snapshot: Snapshot) -> None:
+            snapshots.append(snapshot)
+            received.set()
+
+        stop = provider.watch(callback, interval=0.01)
+        self.assertTrue(received.wait(5))
+        stop.set()
+        self.assertDictEqual(snapshots[0].settings, {"A": 1, "B": 2})
+
+    def test_settings_from_provider(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings.from_provider(DirectoryProvider(self.path), "env")
+        self.assertEqual(settings._data["B"], Setting("env", "B", 2))
+
+        settings = Settings({"B": 0})
+        with settings.unfreeze("env") as settings_:
+            settings_.load_provider(DirectoryProvider(self.path))
+        self.assertEqual(settings["B"], 2)
+
+
+if __name__ == "__main__":
+    main()
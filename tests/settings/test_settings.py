@@ -1,12 +1,21 @@
 """
 Test BaseSettings class
 """
+import asyncio
 import logging
+import os
+import pickle  # nosec
+import sys
+import threading
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from importlib import reload
+from io import StringIO
 from tempfile import NamedTemporaryFile
 from types import ModuleType
 from unittest.case import TestCase
 from unittest.main import main
+from unittest.mock import patch
 
 import orjson
 import yaml
@@ -18,10 +27,29 @@ from amphisbaena.settings import (
     CompareWithNotSettingException,
     Setting,
     SettingNameNotUpperException,
+    SettingDependencyCycleException,
+    SettingReferenceNotFoundException,
     Settings,
     SettingsFrozenException,
     SettingsLowOrEqualPriorityException,
+    SettingsNotFrozenException,
+    SettingsOverlay,
+    SettingsSerializationException,
+    UnknownConfigFormatException,
+    default_layer,
 )
+from tests.samples import settings as samples_settings
+
+
+def computed_b(settings: Settings) -> int:
+    """
+    A computed setting defined at the module level to be pickled
+    :param settings:
+    :type settings: Settings
+    :return:
+    :rtype: int
+    """
+    return settings["A"] + 1
 
 
 class SettingTest(TestCase):
@@ -421,6 +449,31 @@ class SettingsTest(TestCase):
             Setting("project", "A", 0),
         )
 
+    def test_default_layer(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        layer = default_layer("tests.samples.settings")
+        self.assertEqual(layer["A"], Setting("default", "A", 1))  # type: ignore
+        self.assertIs(default_layer("tests.samples.settings"), layer)
+        self.assertIsNone(default_layer("tests.samples.missing"))
+
+        settings_a = Settings(default_settings="tests.samples.settings")
+        settings_b = Settings({"A": 0}, default_settings="tests.samples.settings")
+        self.assertIs(
+            settings_a._data["B"],  # pylint: disable = protected-access
+            settings_b._data["B"],  # pylint: disable = protected-access
+        )
+        self.assertEqual(settings_b["A"], 0)
+
+        # a reloaded module is read again
+        reload(samples_settings)
+        layer_reloaded = default_layer("tests.samples.settings")
+        self.assertIsNot(layer_reloaded, layer)
+        self.assertDictEqual(layer_reloaded, layer)  # type: ignore
+
     def test_load_module(self) -> None:
         """
         test the method of load_module
@@ -447,6 +500,86 @@ class SettingsTest(TestCase):
             Setting("project", "A", 1),
         )
 
+    def test_load_module_lazy(self) -> None:
+        """
+        test the method of load_module with lazy
+        :return:
+        :rtype: None
+        """
+        sys.modules.pop("tests.samples.lazy_settings", None)
+
+        settings = Settings.from_module("tests.samples.lazy_settings", lazy=True)
+        self.assertIn("A", settings)
+        self.assertIn("LOG_LEVEL", settings)
+        self.assertNotIn("lower", settings)
+        self.assertNotIn("tests.samples.lazy_settings", sys.modules)
+
+        self.assertEqual(settings["A"], 1)
+        self.assertIn("tests.samples.lazy_settings", sys.modules)
+        self.assertEqual(
+            settings._data["A"],  # pylint: disable = protected-access
+            Setting("project", "A", 1),
+        )
+        self.assertEqual(settings.copy_to_dict()["LOG_LEVEL"], logging.INFO)
+        # the names bound in a branch not taken are dropped on the import
+        self.assertNotIn("G", settings)
+        self.assertEqual(Settings.loads(settings.dumps())["E"], 5)
+
+        # the module is imported when its names can not be read statically
+        settings = Settings()
+        with settings.unfreeze() as settings_:
+            settings_.load_module("tests.samples.star_settings", lazy=True)
+        self.assertEqual(
+            settings._data["Z"],  # pylint: disable = protected-access
+            Setting("project", "Z", 26),
+        )
+        self.assertIn("A", settings)
+
+    def test_load_module_lazy_override(self) -> None:
+        """
+        test the lazy names the module does not define get back the settings
+        they replaced
+        :return:
+        :rtype: None
+        """
+        module = "tests.samples.lazy_override_settings"
+
+        for default in (True, False):
+            with self.subTest(default=default), patch.dict("os.environ"):
+                os.environ.pop("VERBOSE", None)
+                sys.modules.pop(module, None)
+                sys.modules.pop("tests.samples.lazy_settings", None)
+
+                settings = Settings()
+                with settings.unfreeze("default") as settings_:
+                    if default:
+                        settings_["LOG_LEVEL"] = logging.WARNING
+                    else:
+                        # the replaced setting is lazy as well
+                        settings_.load_module("tests.samples.lazy_settings", True)
+                with settings.unfreeze() as settings_:
+                    settings_.load_module(module, lazy=True)
+
+                self.assertIn("LOG_LEVEL", settings)
+                self.assertIs(settings["VERBOSE"], False)
+                self.assertIn("LOG_LEVEL", settings)
+                level = logging.WARNING if default else logging.INFO
+                self.assertEqual(settings["LOG_LEVEL"], level)
+                self.assertEqual(
+                    settings._data["LOG_LEVEL"],  # pylint: disable=protected-access
+                    Setting("default", "LOG_LEVEL", level),
+                )
+                self.assertEqual(settings.copy_to_dict()["LOG_LEVEL"], level)
+                self.assertEqual(Settings.loads(settings.dumps())["LOG_LEVEL"], level)
+
+        with patch.dict("os.environ", {"VERBOSE": "1"}):
+            sys.modules.pop(module, None)
+            settings = Settings({"LOG_LEVEL": logging.WARNING})
+            with settings.unfreeze("env") as settings_:
+                settings_.load_module(module, lazy=True)
+            self.assertEqual(settings["LOG_LEVEL"], 10)
+        sys.modules.pop(module, None)
+
     def test_load_yaml(self) -> None:
         """
 
@@ -484,6 +617,102 @@ class SettingsTest(TestCase):
         self.assertIn("A", settings)
         self.assertEqual(settings._data["A"], Setting("project", "A", 1))
 
+    def test_load_yaml_interpolate(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        test_yaml = {
+            "ROOT": "/srv",
+            "DATA": "${ROOT}/data",
+            "CACHE": "${DATA}/cache",
+            "PORT": 8080,
+            "BIND": "${PORT}",
+            "LITERAL": "$${ROOT}",
+            "PATHS": {"LOGS": ["${ROOT}/logs", "/tmp"], "PORT": "${PORT}"},
+        }
+
+        yaml_file = NamedTemporaryFile(mode="w")
+        yaml.dump(test_yaml, yaml_file)
+
+        settings = Settings()
+        with settings.unfreeze() as settings_:
+            settings_.load_yaml(yaml_file.name, interpolate=True)
+
+        self.assertEqual(settings["CACHE"], "/srv/data/cache")
+        self.assertEqual(settings["BIND"], 8080)
+        self.assertEqual(settings["LITERAL"], "${ROOT}")
+        # the references are resolved at any depth of the dicts and lists
+        self.assertEqual(
+            settings["PATHS"], {"LOGS": ["/srv/logs", "/tmp"], "PORT": 8080}
+        )
+
+        # only the dependents of the key changed by a higher priority are
+        # resolved again
+        with settings.unfreeze("cmd") as settings_:
+            settings_["ROOT"] = "/opt"
+        self.assertEqual(settings["CACHE"], "/opt/data/cache")
+        self.assertEqual(settings["BIND"], 8080)
+        self.assertDictEqual(
+            settings.copy_to_dict(),
+            {
+                "ROOT": "/opt",
+                "DATA": "/opt/data",
+                "CACHE": "/opt/data/cache",
+                "PORT": 8080,
+                "BIND": 8080,
+                "LITERAL": "${ROOT}",
+                "PATHS": {"LOGS": ["/opt/logs", "/tmp"], "PORT": 8080},
+            },
+        )
+        settings = Settings.loads(settings.dumps())
+        self.assertEqual(settings["PATHS"]["LOGS"], ["/opt/logs", "/tmp"])
+
+        settings = Settings.from_yaml(yaml_file.name)
+        self.assertEqual(settings["CACHE"], "${DATA}/cache")
+        self.assertEqual(settings["PATHS"]["LOGS"][0], "${ROOT}/logs")
+
+    def test_load_json_interpolate(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        test_json = {
+            "A": "${B}",
+            "B": "${A}",
+            "C": "${MISSING}",
+            "D": {"E": ["${C}"]},
+        }
+
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps(test_json))
+        json_file.seek(0)
+
+        settings = Settings.from_json(json_file.name, interpolate=True)
+
+        with self.assertRaises(SettingDependencyCycleException):
+            settings["A"]  # pylint: disable=pointless-statement
+
+        # a missing reference is not a missing key
+        self.assertIn("C", settings)
+        for key in ("C", "D"):
+            with self.subTest(key=key):
+                with self.assertRaisesRegex(
+                    SettingReferenceNotFoundException,
+                    "C references the missing setting MISSING",
+                ):
+                    settings.get(key, "default")
+
+        with settings.unfreeze("env") as settings_:
+            settings_["MISSING"] = 1
+        self.assertEqual(settings["D"], {"E": [1]})
+
+        settings = Settings.from_json(json_file.name, interpolate=True, keys=["C"])
+        with self.assertRaises(SettingReferenceNotFoundException):
+            settings.to_json_bytes()
+
     def test_from_module(self) -> None:
         """
         test the method of from_module
@@ -539,6 +768,117 @@ class SettingsTest(TestCase):
         self.assertIn("A", settings)
         self.assertEqual(settings._data["A"], Setting("project", "A", 1))
 
+    def test_from_yaml_keys(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        yaml_file = NamedTemporaryFile(mode="w")
+        yaml.dump({"A": 1, "B": {"C": [2]}, "DB_HOST": "${A}"}, yaml_file)
+
+        settings = Settings.from_yaml(
+            yaml_file.name, interpolate=True, keys=["A"], prefixes=["DB_"]
+        )
+        self.assertListEqual(sorted(settings), ["A", "DB_HOST"])
+        self.assertEqual(settings["DB_HOST"], 1)
+
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps({"A": 1, "B": {"C": [2]}}))
+        json_file.seek(0)
+
+        settings = Settings.from_json(json_file.name, keys=["B"])
+        self.assertListEqual(list(settings), ["B"])
+
+    def test_from_file(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        ini_file = NamedTemporaryFile(mode="w", suffix=".ini")
+        ini_file.write("[DEFAULT]\nA = 1\nB = ${A}\n")
+        ini_file.seek(0)
+
+        settings = Settings.from_file(ini_file.name, "env", interpolate=True)
+        self.assertEqual(settings._data["A"], Setting("env", "A", "1"))
+        self.assertEqual(settings["B"], "1")
+
+        sniffed_file = NamedTemporaryFile(mode="w", suffix=".conf.in")
+        sniffed_file.write("# generated\nA: 1\n")
+        sniffed_file.seek(0)
+
+        settings = Settings.from_file(sniffed_file.name)
+        self.assertEqual(settings._data["A"], Setting("project", "A", 1))
+
+        unknown_file = NamedTemporaryFile(mode="w", suffix=".txt")
+        unknown_file.write("unknown format")
+        unknown_file.seek(0)
+        with self.assertRaises(UnknownConfigFormatException):
+            Settings.from_file(unknown_file.name)
+
+    def test_dumps_loads(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings(
+            {"A": 1, "B": (1, [2.0], {"C": None}), "D": b"d"},
+            default_settings=True,
+        )
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps({"E": "${A}/e"}))
+        json_file.seek(0)
+        with settings.unfreeze("env") as settings_:
+            settings_.load_json(json_file.name, interpolate=True)
+
+        data = settings.dumps()
+        self.assertIsInstance(data, bytes)
+
+        settings_loaded = Settings.loads(data)
+        self.assertIsInstance(settings_loaded, Settings)
+        self.assertTrue(settings_loaded.is_frozen())
+        self.assertDictEqual(
+            settings_loaded._data,  # pylint: disable = protected-access
+            settings._data,  # pylint: disable = protected-access
+        )
+        self.assertEqual(settings_loaded["E"], "1/e")
+
+        with self.assertRaises(SettingsSerializationException):
+            Settings.loads(b"not the wire format")
+
+        with self.assertRaises(SettingsSerializationException):
+            Settings.loads(data[:-1])
+
+        settings = Settings({"A": object()})
+        with self.assertRaises(SettingsSerializationException):
+            settings.dumps()
+
+    def test_pickle(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings({"A": 1, "B": (2,)}, default_settings=True)
+        settings_loaded = pickle.loads(pickle.dumps(settings))  # nosec
+        self.assertDictEqual(
+            settings_loaded._data,  # pylint: disable = protected-access
+            settings._data,  # pylint: disable = protected-access
+        )
+
+        # fall back to the instance state
+        settings = Settings({"A": logging.getLogger("test")})
+        settings_loaded = pickle.loads(pickle.dumps(settings))  # nosec
+        self.assertIs(settings_loaded["A"], settings["A"])
+
+        settings = Settings({"A": 1})
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("B", computed_b)
+        settings_loaded = pickle.loads(pickle.dumps(settings))  # nosec
+        self.assertEqual(settings_loaded["B"], 2)
+
     def test_copy_to_dict(self):
         """
 
@@ -548,6 +888,356 @@ class SettingsTest(TestCase):
 
         self.assertDictEqual(settings.copy_to_dict(), {"A": 1, "B": 2})
 
+    def test_to_json_bytes(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings(settings={"A": 1, "B": [2]})
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("C", lambda x: x["A"] + 2)
+
+        self.assertDictEqual(
+            orjson.loads(settings.to_json_bytes()), {"A": 1, "B": [2], "C": 3}
+        )
+
+        settings = Settings(settings={"A": logging.getLogger("test")})
+        with self.assertRaises(TypeError):
+            settings.to_json_bytes()
+        self.assertDictEqual(
+            orjson.loads(settings.to_json_bytes(default=lambda x: x.name)),
+            {"A": "test"},
+        )
+
+    def test_to_yaml(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings(settings={"B": 1, "A": [2]})
+
+        self.assertEqual(settings.to_yaml(), "B: 1\nA:\n- 2\n")
+
+        stream = StringIO()
+        self.assertIsNone(settings.to_yaml(stream))
+        self.assertDictEqual(yaml.safe_load(stream.getvalue()), {"A": [2], "B": 1})
+
+    def test_register_computed(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        calls = []
+
+        def pool_size(settings_: Settings) -> int:
+            calls.append(1)
+            return settings_["CPU_COUNT"] * settings_["MULTIPLIER"]
+
+        settings = Settings({"CPU_COUNT": 4, "MULTIPLIER": 2, "OTHER": 0})
+        with self.assertRaises(SettingsFrozenException):
+            settings.register_computed("POOL_SIZE", pool_size)
+
+        with settings.unfreeze() as settings_:
+            with self.assertRaises(SettingNameNotUpperException):
+                settings_.register_computed("pool_size", pool_size)
+            settings_.register_computed("POOL_SIZE", pool_size)
+
+        self.assertIn("POOL_SIZE", settings)
+        self.assertEqual(len(settings), 4)
+        self.assertEqual(settings["POOL_SIZE"], 8)
+        self.assertEqual(settings["POOL_SIZE"], 8)
+        self.assertEqual(len(calls), 1)
+        self.assertDictEqual(
+            settings.copy_to_dict(),
+            {"CPU_COUNT": 4, "MULTIPLIER": 2, "OTHER": 0, "POOL_SIZE": 8},
+        )
+
+        # a setting not read during the evaluation keeps the memoized value
+        with settings.unfreeze("env") as settings_:
+            settings_["OTHER"] = 1
+        self.assertEqual(settings["POOL_SIZE"], 8)
+        self.assertEqual(len(calls), 1)
+
+        # a rejected update of a dependency keeps the memoized value
+        with settings.unfreeze("default", skip_error=True) as settings_:
+            settings_["MULTIPLIER"] = 3
+        self.assertEqual(settings["POOL_SIZE"], 8)
+        self.assertEqual(len(calls), 1)
+
+        with settings.unfreeze("env") as settings_:
+            settings_["MULTIPLIER"] = 3
+        self.assertEqual(settings["POOL_SIZE"], 12)
+        self.assertEqual(len(calls), 2)
+
+        # a stored setting takes precedence over the computed one
+        with settings.unfreeze("cmd") as settings_:
+            settings_["POOL_SIZE"] = 1
+        self.assertEqual(settings["POOL_SIZE"], 1)
+        with settings.unfreeze() as settings_:
+            del settings_["POOL_SIZE"]
+        self.assertEqual(settings["POOL_SIZE"], 12)
+
+    def test_register_computed_chain(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings({"A": 1})
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("B", lambda x: x["A"] + 1)
+            settings_.register_computed("C", lambda x: x["B"] * 10)
+            settings_.register_computed("D", lambda x: x.get("MISSING", 0))
+
+        self.assertEqual(settings["C"], 20)
+        self.assertEqual(settings["D"], 0)
+
+        with settings.unfreeze("env") as settings_:
+            settings_["A"] = 2
+            settings_["MISSING"] = 5
+        self.assertEqual(settings["C"], 30)
+        self.assertEqual(settings["D"], 5)
+
+    def test_register_computed_cycle(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings()
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("A", lambda x: x["B"])
+            settings_.register_computed("B", lambda x: x["A"])
+
+        with self.assertRaises(SettingDependencyCycleException):
+            settings["A"]  # pylint: disable=pointless-statement
+
+    def test_register_computed_threads(self) -> None:
+        """
+        The threads evaluating the same computed setting at once neither see a
+        cycle nor record their dependencies into each other
+        :return:
+        :rtype: None
+        """
+        threads = 8
+        barrier = threading.Barrier(threads, timeout=5)
+
+        def compute(settings_: Settings) -> int:
+            value = settings_["A"]
+            barrier.wait()
+            return value + settings_["B"]
+
+        settings = Settings({"A": 1, "B": 10})
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("C", compute)
+            settings_.register_computed("D", lambda x: x["C"] * 2)
+
+        with ThreadPoolExecutor(threads) as executor:
+            values = list(executor.map(lambda _: settings["D"], range(threads)))
+        self.assertListEqual(values, [22] * threads)
+        self.assertDictEqual(settings._tracking, {})
+
+        barrier = threading.Barrier(1)
+        with settings.unfreeze("env") as settings_:
+            settings_["B"] = 20
+        self.assertEqual(settings["D"], 42)
+
+
+class SettingsAsyncTest(TestCase):
+    """
+    test the async loaders of Settings class
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.loop.close()
+
+    def test_afrom_yaml(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        yaml_file = NamedTemporaryFile(mode="w")
+        yaml.dump({"A": 1, "B": "${A}"}, yaml_file)
+
+        settings = self.loop.run_until_complete(
+            Settings.afrom_yaml(yaml_file.name, "env", interpolate=True)
+        )
+        self.assertEqual(settings._data["A"], Setting("env", "A", 1))
+        self.assertEqual(settings["B"], 1)
+        self.assertTrue(settings.is_frozen())
+
+    def test_afrom_json(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        json_file = NamedTemporaryFile()
+        json_file.write(orjson.dumps({"A": 1}))
+        json_file.seek(0)
+
+        with ThreadPoolExecutor(1) as executor:
+            settings = self.loop.run_until_complete(
+                Settings.afrom_json(json_file.name, executor=executor)
+            )
+        self.assertEqual(settings._data["A"], Setting("project", "A", 1))
+
+        json_file = NamedTemporaryFile()
+        json_file.write(b"{")
+        json_file.seek(0)
+        with self.assertRaises(orjson.JSONDecodeError):
+            self.loop.run_until_complete(Settings.afrom_json(json_file.name))
+
+    def test_afrom_file(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        yaml_file = NamedTemporaryFile(mode="w", suffix=".yml")
+        yaml.dump({"A": 1}, yaml_file)
+
+        settings = self.loop.run_until_complete(Settings.afrom_file(yaml_file.name))
+        self.assertEqual(settings._data["A"], Setting("project", "A", 1))
+
+    def test_cancel(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def read_json(json, keys=None, prefixes=None):
+            started.set()
+            release.wait(5)
+            return {"A": 1}
+
+        async def cancel():
+            task = asyncio.ensure_future(Settings.afrom_json("settings.json"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            release.set()
+            await task
+
+        with patch("amphisbaena.settings.aio.read_json", read_json):
+            with self.assertRaises(asyncio.CancelledError):
+                self.loop.run_until_complete(cancel())
+
+
+class SettingsOverlayTest(TestCase):
+    """
+    test SettingsOverlay class
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.base = Settings({"A": 1, "B": 2}, priority="cmd")
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        del self.base
+
+    def test_init(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        overlay = SettingsOverlay(self.base, {"B": 20, "C": 30})
+        self.assertIs(overlay.base, self.base)
+        self.assertTrue(overlay.is_frozen())
+        self.assertDictEqual(
+            overlay._data,  # pylint: disable = protected-access
+            {"B": Setting("project", "B", 20), "C": Setting("project", "C", 30)},
+        )
+
+        with self.base.unfreeze():
+            with self.assertRaises(SettingsNotFrozenException):
+                SettingsOverlay(self.base)
+
+    def test_mapping(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        overlay = SettingsOverlay(self.base, {"B": 20, "C": 30})
+
+        self.assertEqual(overlay["A"], 1)
+        self.assertEqual(overlay["B"], 20)
+        self.assertEqual(overlay["C"], 30)
+        with self.assertRaises(KeyError):
+            overlay["D"]  # pylint: disable=pointless-statement
+
+        self.assertIn("A", overlay)
+        self.assertNotIn("D", overlay)
+        self.assertEqual(len(overlay), 3)
+        self.assertListEqual(sorted(overlay), ["A", "B", "C"])
+        self.assertDictEqual(overlay.copy_to_dict(), {"A": 1, "B": 20, "C": 30})
+        self.assertDictEqual(self.base.copy_to_dict(), {"A": 1, "B": 2})
+
+        with overlay.unfreeze() as overlay_:
+            del overlay_["B"]
+        self.assertEqual(overlay["B"], 2)
+
+    def test_computed(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        overlay = SettingsOverlay(self.base)
+        with overlay.unfreeze() as overlay_:
+            overlay_.register_computed("SUM", lambda x: x["A"] + x["B"])
+        self.assertEqual(overlay["SUM"], 3)
+
+        with overlay.unfreeze() as overlay_:
+            overlay_["A"] = 10
+        self.assertEqual(overlay["SUM"], 12)
+        self.assertNotIn("SUM", self.base)
+
+    def test_pickle(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        overlay = SettingsOverlay(self.base, {"B": 20})
+        overlay_loaded = pickle.loads(pickle.dumps(overlay))  # nosec
+        self.assertIsInstance(overlay_loaded, SettingsOverlay)
+        self.assertDictEqual(overlay_loaded.copy_to_dict(), {"A": 1, "B": 20})
+        self.assertDictEqual(
+            overlay_loaded._data,  # pylint: disable = protected-access
+            overlay._data,  # pylint: disable = protected-access
+        )
+
 
 if __name__ == "__main__":
     main()
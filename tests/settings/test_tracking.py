@@ -0,0 +1,105 @@
+"""
+The test cases of the read tracking
+"""
+from unittest.case import TestCase
+from unittest.main import main
+
+from amphisbaena.settings import (
+    Settings,
+    SettingsOverlay,
+    SettingsReadsNotTrackedException,
+)
+from amphisbaena.settings.tracking import ReadReport, ReadTracker
+
+
+class ReadTrackerTest(TestCase):
+    """
+    The test cases of the read tracker
+    """
+
+    def test_record(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with self.assertRaises(ValueError):
+            ReadTracker(0)
+
+        tracker = ReadTracker(1)
+        for k in ("A", "B", "A"):
+            tracker.record(k)
+        self.assertSetEqual(tracker.seen, {"A", "B"})
+        self.assertDictEqual(dict(tracker.samples), {"A": 2, "B": 1})
+
+        report = tracker.report(["A", "B", "C"], top=1)
+        self.assertEqual(report, ReadReport(3, [("A", 2)], ["C"]))
+
+    def test_sampling(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        tracker = ReadTracker(10)
+        for _ in range(10_000):
+            tracker.record("A")
+            tracker.record("B")
+            tracker.record("B")
+        tracker.record("C")
+
+        report = tracker.report(["A", "B", "C", "D"])
+        self.assertEqual(report.hot[0][0], "B")
+        self.assertAlmostEqual(report.hot[0][1], 20_000, delta=3_000)
+        self.assertAlmostEqual(report.reads, 30_000, delta=3_000)
+        self.assertListEqual(report.never_read, ["D"])
+
+
+class SettingsReadsTest(TestCase):
+    """
+    The test cases of the read tracking of settings
+    """
+
+    def test_track_reads(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings({"A": 1, "B": "${A}", "C": 3})
+        with settings.unfreeze() as settings_:
+            settings_.register_computed("D", lambda x: x["C"] + 1)
+
+        with self.assertRaises(SettingsReadsNotTrackedException):
+            settings.read_report()
+
+        tracker = settings.track_reads(sample_rate=1)
+        self.assertEqual(settings["A"], 1)
+        self.assertEqual(settings["D"], 4)
+        self.assertEqual(settings.get("E"), None)
+
+        report = settings.read_report()
+        self.assertListEqual(report.hot, [("A", 1), ("D", 1), ("C", 1), ("E", 1)])
+        self.assertListEqual(report.never_read, ["B"])
+
+        self.assertIs(settings.untrack_reads(), tracker)
+        self.assertIsNone(settings.untrack_reads())
+        settings["A"]  # pylint: disable=pointless-statement
+        self.assertEqual(tracker.samples["A"], 1)
+
+    def test_overlay(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        overlay = SettingsOverlay(Settings({"A": 1, "B": 2}), {"B": 3})
+        overlay.track_reads(sample_rate=1)
+        self.assertEqual(overlay["A"], 1)
+        self.assertEqual(overlay["B"], 3)
+        self.assertSetEqual(overlay._reads.seen, {"A", "B"})
+        self.assertListEqual(overlay.read_report().never_read, [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+The test cases of the batch mode
+"""
+import logging
+import os
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from unittest.case import TestCase
+from unittest.main import main
+from unittest.mock import patch
+
+import orjson
+
+from amphisbaena.__main__ import run
+from amphisbaena.batch import read_commands, run_batch
+from amphisbaena.settings import Settings
+
+COMMANDS = [
+    '["-s", "A=1", "-s", "LOG_LEVEL=40"]\n',
+    "\n",
+    '["--unknown"]\n',
+    "not json\n",
+    '["--serve", "socket"]\n',
+    '["-s", "LOG_LEVEL=40", "--profile-settings"]\n',
+]
+
+
+class BatchTest(TestCase):
+    """
+    The test cases of the batch mode
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.handlers = list(logging.root.handlers)
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        logging.root.handlers[:] = self.handlers
+
+    def test_read_commands(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        # the abbreviations and the = forms of the options are refused as well
+        for argv in (
+            ["--serv", "socket"],
+            ["--serve=socket"],
+            ["--ser=socket"],
+            ["--bat", "-"],
+            ["-s", "A=1", "--batch=-"],
+        ):
+            with self.subTest(argv=argv):
+                (command,) = read_commands([orjson.dumps(argv).decode()])
+                self.assertIsInstance(command, ValueError)
+                self.assertIn("not allowed", str(command))
+        (command,) = read_commands(['["--settings-file", "-"]'])
+        self.assertListEqual(command, ["--settings-file", "-"])
+
+        commands = list(read_commands(COMMANDS + ["[1]\n", '{"a": 1}\n']))
+        self.assertEqual(len(commands), 7)
+        self.assertListEqual(commands[0], ["-s", "A=1", "-s", "LOG_LEVEL=40"])
+        self.assertListEqual(commands[1], ["--unknown"])
+        for index, message in (
+            (2, "line 4"),
+            (3, "not allowed"),
+            (5, "not an array of strings"),
+            (6, "not an array of strings"),
+        ):
+            self.assertIsInstance(commands[index], ValueError)
+            self.assertIn(message, str(commands[index]))
+
+    def check_results(self, output: str) -> None:
+        """
+
+        :param output:
+        :type output: str
+        :return:
+        :rtype: None
+        """
+        results = [orjson.loads(x) for x in output.splitlines()]
+        self.assertListEqual([x["index"] for x in results], list(range(5)))
+        self.assertListEqual(
+            [x["status"] for x in results], [0, 2, os.EX_USAGE, os.EX_USAGE, 0]
+        )
+        self.assertIn("unrecognized arguments", results[1]["stderr"])
+        self.assertIn("total", results[4]["stderr"])
+
+    def test_run_batch(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings(default_settings=True)
+        output = StringIO()
+        self.assertEqual(run_batch(COMMANDS, settings, output=output), 3)
+        self.check_results(output.getvalue())
+
+    def test_run_batch_jobs(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        settings = Settings(default_settings=True)
+        output = StringIO()
+        self.assertEqual(run_batch(COMMANDS, settings, jobs=2, output=output), 3)
+        self.check_results(output.getvalue())
+
+    def test_main_batch(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with NamedTemporaryFile(mode="w", suffix=".ndjson") as fp, patch(
+            "sys.stdout", StringIO()
+        ) as stdout:
+            fp.write('["-s", "LOG_LEVEL=40", "-v"]\n')
+            fp.flush()
+            result = run(["-s", "B=2", "--batch", fp.name])
+        self.assertEqual(result.status, 0)
+        self.assertEqual(result.settings["B"], 2)
+        self.assertEqual(orjson.loads(stdout.getvalue())["status"], 0)
+
+        with patch("sys.stdin", StringIO('["--unknown"]\n')), patch(
+            "sys.stdout", StringIO()
+        ):
+            result = run(["--batch", "-"])
+        self.assertEqual(result.status, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+The test cases of the benchmark runner
+"""
+from unittest.case import TestCase
+from unittest.main import main
+
+from benchmarks import compare
+
+
+class BenchmarksTest(TestCase):
+    """
+    The test cases of the benchmark runner
+    """
+
+    def test_compare(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+        results = {"a": 1.2, "b": 1.3, "c": 0.5, "d": 10.0}
+
+        self.assertListEqual(compare(results, baseline, 0.25), ["b"])
+        self.assertListEqual(compare(results, baseline, 0.1), ["a", "b"])
+        self.assertListEqual(compare(results, {}, 0.0), [])
+
+
+if __name__ == "__main__":
+    main()
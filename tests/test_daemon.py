@@ -0,0 +1,303 @@
+"""
+The test cases of the daemon
+"""
+import logging
+import os
+import socket
+import stat
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.case import TestCase
+from unittest.main import main
+from unittest.mock import MagicMock, patch
+
+import amphisbaena
+from amphisbaena.__main__ import SOCKET_ENV, entrypoint
+from amphisbaena.daemon import (
+    CommandServer,
+    is_forwardable,
+    is_serving,
+    reads_stdin,
+    recv_message,
+    request,
+    run_captured,
+    send_message,
+)
+
+
+class DaemonTest(TestCase):
+    """
+    The test cases of the daemon
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name, "amphisbaena.sock")
+        self.handlers = list(logging.root.handlers)
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        logging.root.handlers[:] = self.handlers
+        self.directory.cleanup()
+
+    def start_server(self) -> CommandServer:
+        """
+
+        :return:
+        :rtype: CommandServer
+        """
+        server = CommandServer(self.path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        def stop() -> None:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return server
+
+    def test_messages(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        left, right = socket.socketpair()
+        with left, right:
+            send_message(left, {"argv": ["-s", "A=1"]})
+            self.assertDictEqual(recv_message(right), {"argv": ["-s", "A=1"]})
+
+            left.close()
+            self.assertIsNone(recv_message(right))
+
+    def test_run_captured(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        status, stdout, _ = run_captured(["--version"])
+        self.assertEqual(status, os.EX_OK)
+        self.assertEqual(stdout, f"amphisbaena {amphisbaena.__version__}\n")
+
+        status, _, stderr = run_captured(["--unknown"])
+        self.assertEqual(status, 2)
+        self.assertIn("unrecognized arguments", stderr)
+
+        status, _, stderr = run_captured(["-s", "A"])
+        self.assertEqual(status, 1)
+        self.assertIn("ValueError", stderr)
+
+        with patch(
+            "amphisbaena.__main__.set_logging",
+            side_effect=amphisbaena.settings.SettingsException,
+        ):
+            status, _, _ = run_captured(["-s", "A=1"])
+        self.assertEqual(status, os.EX_CONFIG)
+
+    def test_server(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.start_server()
+        self.assertTrue(is_serving(self.path))
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode) & 0o077, 0)
+
+        with self.assertRaises(OSError):
+            CommandServer(self.path)
+
+        for _ in range(2):
+            response = request(self.path, ["-s", "LOG_LEVEL='WARNING'"])
+            self.assertEqual(response["status"], os.EX_OK)
+            self.assertEqual(response["stderr"], "")
+
+        response = request(self.path, ["-s", "A=1"])
+        self.assertEqual(response["status"], os.EX_OK)
+        self.assertEqual(response["stderr"].count("Platform:"), 1)
+
+    def test_stale_socket(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.path.touch()
+        self.assertFalse(is_serving(self.path))
+        self.start_server()
+        self.assertTrue(is_serving(self.path))
+
+    def send(self, message: dict) -> dict:
+        """
+        Send a raw request to the daemon
+        :param message:
+        :type message: dict
+        :return:
+        :rtype: dict
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.path))
+            send_message(sock, message)
+            return recv_message(sock)  # type: ignore
+
+    def test_client_context(self) -> None:
+        """
+        A relative config file is read in the working directory of the client,
+        whatever the one of the daemon
+        :return:
+        :rtype: None
+        """
+        self.start_server()
+        client = Path(self.directory.name, "client")
+        client.mkdir()
+        (client / "conf.json").write_text('{"LOG_LEVEL": 40}')
+        cwd = os.getcwd()
+        argv = ["-c", "conf.json"]
+
+        response = self.send({"argv": argv})
+        self.assertEqual(response["status"], 1)
+        self.assertIn("FileNotFoundError", response["stderr"])
+
+        response = self.send({"argv": argv, "cwd": str(client)})
+        self.assertEqual(response["status"], os.EX_OK)
+        self.assertEqual(response["stderr"], "")
+        self.assertEqual(os.getcwd(), cwd)
+
+        cache = Path(self.directory.name, "snapshots")
+        environ = {"AMPHISBAENA_SETTINGS_CACHE": str(cache), "OTHER": "1"}
+        response = self.send({"argv": argv, "cwd": str(client), "env": environ})
+        self.assertEqual(response["status"], os.EX_OK)
+        self.assertEqual(len(list(cache.iterdir())), 1)
+        self.assertNotIn("AMPHISBAENA_SETTINGS_CACHE", os.environ)
+
+        response = self.send({"argv": argv, "cwd": str(client / "missing")})
+        self.assertEqual(response["status"], os.EX_OSERR)
+        self.assertEqual(os.getcwd(), cwd)
+
+    def test_reads_stdin(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        for argv in (
+            ["-S", "-"],
+            ["-S-"],
+            ["-s", "A=1", "--settings-file", "-"],
+            ["--settings-file=-"],
+            ["--settings-f", "-"],
+            ("-S", "-"),
+        ):
+            with self.subTest(argv=argv):
+                self.assertTrue(reads_stdin(argv))
+        for argv in (["-S", "file"], ["--settings-file=file"], ["-s", "-"], ["-S"]):
+            with self.subTest(argv=argv):
+                self.assertFalse(reads_stdin(argv))
+
+        self.start_server()
+        response = request(self.path, ["-S", "-"])
+        self.assertEqual(response["status"], os.EX_USAGE)
+        self.assertIn("stdin", response["stderr"])
+
+    def test_is_forwardable(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertTrue(is_forwardable(["-s", "A=1", "-c", "conf.json"]))
+        for argv in (
+            ["--serve", "other.sock"],
+            ["--serve=other.sock"],
+            ["--serv", "other.sock"],
+            ["--batch=-"],
+            ["-s", "A=1", "--batch", "batch.ndjson"],
+            ["-S", "-"],
+        ):
+            with self.subTest(argv=argv):
+                self.assertFalse(is_forwardable(argv))
+
+        self.start_server()
+        response = request(self.path, ["--serve=" + str(self.path) + ".other"])
+        self.assertEqual(response["status"], os.EX_USAGE)
+        self.assertFalse(Path(str(self.path) + ".other").exists())
+
+    @patch("amphisbaena.__main__.main")
+    def test_entrypoint(self, a_main: MagicMock) -> None:
+        """
+
+        :param a_main:
+        :type a_main: MagicMock
+        :return:
+        :rtype: None
+        """
+        with patch.dict(os.environ, {SOCKET_ENV: str(self.path)}):
+            with self.assertRaises(SystemExit) as context:
+                entrypoint("-s", "A=1")
+        self.assertEqual(context.exception.code, os.EX_OK)
+        a_main.assert_called_once_with("-s", "A=1", settings=None)
+
+        self.start_server()
+        with patch.dict(os.environ, {SOCKET_ENV: str(self.path)}), patch(
+            "amphisbaena.daemon.forward", return_value=os.EX_CONFIG
+        ) as forward:
+            with self.assertRaises(SystemExit) as context:
+                entrypoint("-s", "A=1")
+        self.assertEqual(context.exception.code, os.EX_CONFIG)
+        forward.assert_called_once_with(str(self.path), ("-s", "A=1"))
+        a_main.assert_called_once()
+
+        for args in (("-S", "-"), ("--batch=-",), ("--serve=other.sock",)):
+            with patch.dict(os.environ, {SOCKET_ENV: str(self.path)}), patch(
+                "amphisbaena.daemon.forward"
+            ) as forward:
+                with self.assertRaises(SystemExit):
+                    entrypoint(*args)
+            forward.assert_not_called()
+        self.assertEqual(a_main.call_count, 4)
+
+        # the command only runs in this process when the daemon never got it
+        with patch.dict(os.environ, {SOCKET_ENV: str(self.path)}), patch(
+            "amphisbaena.daemon.forward", side_effect=ConnectionRefusedError
+        ):
+            with self.assertRaises(SystemExit):
+                entrypoint("-s", "A=1")
+        self.assertEqual(a_main.call_count, 5)
+
+        with patch.dict(os.environ, {SOCKET_ENV: str(self.path)}), patch(
+            "amphisbaena.daemon.forward", side_effect=ConnectionResetError
+        ):
+            with self.assertRaises(SystemExit) as context:
+                entrypoint("-s", "A=1")
+        self.assertIn("the daemon on", context.exception.code)
+        self.assertEqual(a_main.call_count, 5)
+
+    def test_request_timeout(self) -> None:
+        """
+        test a client does not wait forever for a daemon never answering
+        :return:
+        :rtype: None
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(self.path))
+            sock.listen()
+            with patch("amphisbaena.daemon.CLIENT_TIMEOUT", 0.1):
+                with self.assertRaises(socket.timeout):
+                    request(self.path, ["-s", "A=1"])
+
+
+if __name__ == "__main__":
+    main()
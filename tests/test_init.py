@@ -0,0 +1,49 @@
+"""
+The test cases of the package
+"""
+import subprocess  # nosec
+import sys
+from unittest.case import TestCase
+from unittest.main import main
+
+import amphisbaena
+from amphisbaena._version import get_versions
+
+
+class PackageTest(TestCase):
+    """
+    The test cases of the package
+    """
+
+    def test_version(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertEqual(amphisbaena.__version__, get_versions()["version"])
+
+        with self.assertRaises(AttributeError):
+            amphisbaena.__unknown__  # pylint: disable=pointless-statement
+
+    def test_import_without_version(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        code = (
+            "import sys\n"
+            "import amphisbaena\n"
+            "print('amphisbaena._version' in sys.modules)\n"
+            "amphisbaena.__version__\n"
+            "print('amphisbaena._version' in sys.modules)\n"
+        )
+        process = subprocess.run(  # nosec
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        )
+        self.assertListEqual(process.stdout.split(), ["False", "True"])
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,11 @@
 The test cases of __main__
 """
 import logging
+import os
+import subprocess  # nosec
+import sys
 from argparse import Namespace
+from io import StringIO
 from tempfile import NamedTemporaryFile
 from unittest.case import TestCase
 from unittest.main import main
@@ -11,10 +15,17 @@ from unittest.mock import MagicMock, patch
 import orjson
 import yaml
 
-from amphisbaena.__main__ import get_arguments
+import amphisbaena
+from amphisbaena.__main__ import get_arguments, get_parser
 from amphisbaena.__main__ import main as a_main
-from amphisbaena.__main__ import set_logging
-from amphisbaena.settings import Settings
+from amphisbaena.__main__ import Result, load_configs, read_overrides, run, set_logging
+from amphisbaena.settings import (
+    Setting,
+    Settings,
+    SettingsException,
+    SettingsOverlay,
+    profile,
+)
 
 
 class MainTest(TestCase):
@@ -55,8 +66,134 @@ class MainTest(TestCase):
             self.assertIsInstance(ns, Namespace)
             self.assertDictEqual(ns.config, {"A": 1, "B": 2})
 
-    @patch("amphisbaena.__main__.configure_logging")
-    @patch("amphisbaena.__main__.get_runtime_info")
+        with NamedTemporaryFile(mode="w", suffix=".ini") as fp:
+            fp.write("[DEFAULT]\nA = 1\n")
+            fp.seek(0)
+            ns = get_arguments("--config", fp.name)
+            self.assertDictEqual(ns.config, {"A": "1"})
+
+        with NamedTemporaryFile(mode="w", suffix=".txt") as fp, patch(
+            "sys.stderr", StringIO()
+        ):
+            fp.write("unknown format")
+            fp.seek(0)
+            with self.assertRaises(SystemExit):
+                get_arguments("--config", fp.name)
+
+        self.assertDictEqual(get_arguments().config, {})
+
+    def test_load_configs(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with NamedTemporaryFile(suffix=".json") as fp_a, NamedTemporaryFile(
+            mode="w", suffix=".yaml"
+        ) as fp_b:
+            fp_a.write(orjson.dumps({"A": 1, "B": 2}))
+            fp_a.flush()
+            fp_b.write(yaml.safe_dump({"B": 3}))
+            fp_b.flush()
+
+            self.assertDictEqual(load_configs([fp_a.name]), {"A": 1, "B": 2})
+            self.assertDictEqual(load_configs([fp_a.name, fp_b.name]), {"A": 1, "B": 3})
+            self.assertDictEqual(load_configs([fp_b.name, fp_a.name]), {"A": 1, "B": 2})
+            ns = get_arguments("-c", fp_a.name, "-c", fp_b.name)
+            self.assertDictEqual(ns.config, {"A": 1, "B": 3})
+
+    @patch("amphisbaena.__main__.load_configs")
+    def test_get_arguments_version_config(self, load_configs_: MagicMock) -> None:
+        """
+
+        :param load_configs_:
+        :type load_configs_: MagicMock
+        :return:
+        :rtype: None
+        """
+        with patch("sys.stdout", StringIO()):
+            with self.assertRaises(SystemExit):
+                get_arguments("-c", "/nonexistent/settings.yaml", "--version")
+        load_configs_.assert_not_called()
+
+    def test_get_parser(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertIs(get_parser(), get_parser())
+
+        ns = get_arguments("-s", "A=1", "-S", "/dev/null")
+        ns.setting["B"] = 2
+        ns.settings_file["B"] = 2
+
+        ns = get_arguments()
+        self.assertDictEqual(ns.setting, {})
+        self.assertDictEqual(ns.settings_file, {})
+        self.assertDictEqual(get_arguments("-s", "C=3").setting, {"C": 3})
+
+    def test_read_overrides(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        lines = [
+            "# comment\n",
+            "A=1\n",
+            "\n",
+            " B = 'b' \n",
+            '{"C": [1, 2], "A": 2}\n',
+            "D={'x': 1}\n",
+        ]
+        self.assertDictEqual(
+            read_overrides(lines), {"A": 2, "B": "b", "C": [1, 2], "D": {"x": 1}}
+        )
+
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            read_overrides(["A=1", "B"])
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            read_overrides(["{A: 1}"])
+
+    def test_get_arguments_settings_file(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with NamedTemporaryFile(mode="w", suffix=".txt") as fp:
+            fp.write("A=1\nB='b'\n")
+            fp.seek(0)
+            ns = get_arguments("-S", fp.name, "--settings-file", fp.name)
+            self.assertDictEqual(ns.settings_file, {"A": 1, "B": "b"})
+
+        with patch("sys.stdin", StringIO('{"A": 1}\n{"B": 2}\n')):
+            ns = get_arguments("-S", "-")
+        self.assertDictEqual(ns.settings_file, {"A": 1, "B": 2})
+
+        with patch("sys.stdin", StringIO("A\n")), patch("sys.stderr", StringIO()):
+            with self.assertRaises(SystemExit):
+                get_arguments("-S", "-")
+
+        with patch("sys.stderr", StringIO()):
+            with self.assertRaises(SystemExit):
+                get_arguments("-S", "/nonexistent/overrides")
+
+    def test_get_arguments_version(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        with patch("sys.stdout", StringIO()) as stdout:
+            with self.assertRaises(SystemExit) as context:
+                get_arguments("--version")
+        self.assertEqual(context.exception.code, 0)
+        self.assertEqual(stdout.getvalue(), f"amphisbaena {amphisbaena.__version__}\n")
+
+    @patch("amphisbaena.utils.configure_logging")
+    @patch("amphisbaena.utils.get_runtime_info")
     def test_set_logging(
         self, get_runtime_info: MagicMock, configure_logging: MagicMock
     ) -> None:
@@ -96,6 +233,115 @@ class MainTest(TestCase):
         self.assertIn("B", settings)
         self.assertEqual(settings["B"], 2)
 
+        with patch("sys.stdin", StringIO("A=0\nC=3\n")):
+            a_main("-S", "-", "-s", "A=1")
+        (settings,) = set_logging.call_args[0]
+        self.assertEqual(settings["A"], 1)
+        self.assertEqual(settings["C"], 3)
+        self.assertEqual(settings._data["C"], Setting("cmd", "C", 3))
+
+    @patch("amphisbaena.__main__.set_logging")
+    def test_main_profile_settings(self, set_logging: MagicMock) -> None:
+        """
+
+        :param set_logging:
+        :type set_logging: MagicMock
+        :return:
+        :rtype: None
+        """
+        # without the option, the profiler of the caller records the loading
+        with patch("sys.stderr", StringIO()) as stderr, profile() as profiler:
+            a_main("--setting", "A=1")
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertTrue(profiler.records)
+
+        with patch("sys.stderr", StringIO()) as stderr:
+            a_main("--profile-settings", "--setting", "A=1")
+        self.assertIn("amphisbaena.settings.default_settings", stderr.getvalue())
+        self.assertIn("total", stderr.getvalue())
+
+
+    @patch("amphisbaena.__main__.set_logging")
+    def test_run(self, set_logging: MagicMock) -> None:
+        """
+
+        :param set_logging:
+        :type set_logging: MagicMock
+        :return:
+        :rtype: None
+        """
+        result = run(["-s", "A=1"])
+        self.assertIsInstance(result, Result)
+        self.assertEqual(result.status, 0)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.settings["A"], 1)
+        set_logging.assert_called_once_with(result.settings)
+
+        base = Settings({"A": 0, "B": 0})
+        result = run(["-s", "A=1"], base)
+        self.assertIsInstance(result.settings, SettingsOverlay)
+        self.assertIs(result.settings.base, base)
+        self.assertEqual((result.settings["A"], result.settings["B"]), (1, 0))
+        self.assertEqual(base["A"], 0)
+
+        with patch("sys.stdout", StringIO()):
+            self.assertEqual(run(["--version"]), Result(0))
+
+        with patch("sys.stderr", StringIO()):
+            result = run(["--unknown"])
+        self.assertEqual(result.status, 2)
+        self.assertIsInstance(result.error, SystemExit)
+
+        result = run(["-s", "A"])
+        self.assertEqual(result.status, 1)
+        self.assertIsInstance(result.error, ValueError)
+
+        set_logging.side_effect = SettingsException
+        result = run(["-s", "A=1"])
+        self.assertEqual(result.status, os.EX_CONFIG)
+        self.assertIsInstance(result.error, SettingsException)
+
+
+class StartupTest(TestCase):
+    """
+    The test cases of the startup of the command line interface, in fresh
+    interpreters
+    """
+
+    # the modules only needed once the settings are loaded
+    HEAVY_MODULES = (
+        "amphisbaena.settings",
+        "amphisbaena.utils",
+        "asyncio",
+        "logging",
+        "orjson",
+        "platform",
+        "pprint",
+        "ssl",
+        "yaml",
+    )
+
+    def test_version_imports(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        code = (
+            "import sys\n"
+            "from amphisbaena.__main__ import get_arguments\n"
+            "try:\n"
+            "    get_arguments('--version')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sys.modules))\n"
+        )
+        process = subprocess.run(  # nosec
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        )
+        modules = set(process.stdout.splitlines()[-1].split())
+        self.assertSetEqual(modules & set(self.HEAVY_MODULES), set())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,123 @@
+"""
+The test cases of the settings snapshots
+"""
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.case import TestCase
+from unittest.main import main
+from unittest.mock import MagicMock, patch
+
+from amphisbaena.__main__ import main as a_main
+from amphisbaena.settings import Settings
+from amphisbaena.snapshot import SnapshotCache, fingerprint
+
+
+class SnapshotTest(TestCase):
+    """
+    The test cases of the settings snapshots
+    """
+
+    def setUp(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.config = self.path / "settings.json"
+        self.config.write_text('{"A": 1}')
+        self.cache = SnapshotCache(self.path / "snapshots")
+
+    def tearDown(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.directory.cleanup()
+
+    def test_fingerprint(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        before = fingerprint(self.config)
+        self.assertEqual(fingerprint(self.config), before)
+
+        stat = self.config.stat()
+        self.config.write_text('{"A": 2}')
+        os.utime(self.config, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertNotEqual(fingerprint(self.config), before)
+
+    def test_key(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        key = self.cache.key("args", [str(self.config)])
+        self.assertEqual(self.cache.key("args", [str(self.config)]), key)
+        self.assertNotEqual(self.cache.key("other args", [str(self.config)]), key)
+        self.assertNotEqual(self.cache.key("args", []), key)
+        self.assertIsNone(self.cache.key("args", [str(self.path / "missing")]))
+
+    def test_get_put(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        self.assertIsNone(self.cache.get("key"))
+
+        settings = Settings({"A": (1, "a")}, priority="cmd", default_settings=True)
+        self.assertTrue(self.cache.put("key", settings))
+        self.assertEqual(self.cache.path("key").parent.stat().st_mode & 0o077, 0)
+        self.assertDictEqual(
+            self.cache.get("key").copy_to_dict(), settings.copy_to_dict()
+        )
+
+        self.assertFalse(self.cache.put("object", Settings({"A": object()})))
+        self.assertFalse(self.cache.path("object").exists())
+
+        self.cache.path("key").write_bytes(b"corrupted")
+        with self.assertLogs("amphisbaena.snapshot"):
+            self.assertIsNone(self.cache.get("key"))
+
+    @patch("amphisbaena.__main__.set_logging")
+    def test_main(self, set_logging: MagicMock) -> None:
+        """
+
+        :param set_logging:
+        :type set_logging: MagicMock
+        :return:
+        :rtype: None
+        """
+        args = ("--settings-cache", str(self.cache.directory), "-c", str(self.config))
+
+        with patch("amphisbaena.__main__.load_configs", return_value={"A": 1}) as load:
+            a_main(*args, "-s", "B=2")
+            load.assert_called_once()
+            miss = set_logging.call_args[0][0]
+
+            a_main(*args, "-s", "B=2")
+            load.assert_called_once()
+            hit = set_logging.call_args[0][0]
+            self.assertDictEqual(hit.copy_to_dict(), miss.copy_to_dict())
+            self.assertEqual((hit["A"], hit["B"]), (1, 2))
+
+            a_main(*args, "-s", "B=3")
+            self.assertEqual(load.call_count, 2)
+
+            a_main(*args, "-s", "B=2", "--no-settings-cache")
+            self.assertEqual(load.call_count, 3)
+
+            with patch.dict(os.environ, {"AMPHISBAENA_SETTINGS_CACHE": args[1]}):
+                a_main(*args[2:], "-s", "B=2")
+            self.assertEqual(load.call_count, 3)
+
+
+if __name__ == "__main__":
+    main()
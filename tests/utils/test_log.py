@@ -2,12 +2,13 @@
 The test cases of log
 """
 import logging
+from io import StringIO
 from unittest.case import TestCase
 from unittest.main import main
 from unittest.mock import MagicMock, patch
 
 from amphisbaena.settings import Settings
-from amphisbaena.utils.log import configure_logging, get_runtime_info
+from amphisbaena.utils.log import _runtime_info, configure_logging, get_runtime_info
 
 
 class LogTest(TestCase):
@@ -36,6 +37,30 @@ class LogTest(TestCase):
         self.assertEqual(handler.formatter.datefmt, settings["LOG_FORMATTER_DATEFMT"])
         self.assertEqual(handler.formatter._fmt, settings["LOG_FORMATTER_FMT"])
 
+    def test_configure_logging_twice(self) -> None:
+        """
+
+        :return:
+        :rtype: None
+        """
+        handlers = list(logging.root.handlers)
+        try:
+            configure_logging(Settings(default_settings="tests.samples.settings"))
+            (handler,) = [x for x in logging.root.handlers if x not in handlers]
+
+            settings = Settings(
+                {"LOG_LEVEL": logging.ERROR},
+                priority="cmd",
+                default_settings="tests.samples.settings",
+            )
+            with patch("sys.stderr", StringIO()) as stderr:
+                configure_logging(settings)
+                self.assertEqual(len(logging.root.handlers), len(handlers) + 1)
+                self.assertEqual(handler.level, logging.ERROR)
+                self.assertIs(handler.stream, stderr)
+        finally:
+            logging.root.handlers[:] = handlers
+
     def test_get_runtime_info(self) -> None:
         """
 
@@ -55,6 +80,30 @@ class LogTest(TestCase):
             ],
         )
 
+    @patch("platform.architecture")
+    def test_get_runtime_info_once(self, architecture: MagicMock) -> None:
+        """
+
+        :param architecture:
+        :type architecture: MagicMock
+        :return:
+        :rtype: None
+        """
+        _runtime_info.cache_clear()
+        logger = logging.getLogger("test")
+        for _ in range(2):
+            with self.assertLogs("test", level=logging.INFO):
+                get_runtime_info(logger)
+        architecture.assert_called_once()
+
+        logger.setLevel(logging.WARNING)
+        try:
+            with patch.object(logger, "info") as info:
+                get_runtime_info(logger)
+            info.assert_not_called()
+        finally:
+            logger.setLevel(logging.NOTSET)
+
 
 if __name__ == "__main__":
     main()
@@ -3,11 +3,20 @@ The test cases of miscellaneous
 """
 import asyncio
 import json
+from ast import literal_eval
 from unittest.case import TestCase
 from unittest.main import main
 
 from amphisbaena.settings import PRIORITIES, Settings
-from amphisbaena.utils.misc import load_object, to_async, to_bytes, to_str, to_sync
+from amphisbaena.utils.misc import (
+    LITERALS_CACHE,
+    literal_value,
+    load_object,
+    to_async,
+    to_bytes,
+    to_str,
+    to_sync,
+)
 from tests.samples import settings
 
 
@@ -99,6 +108,53 @@ class MiscTest(TestCase):
         with self.assertRaises(TypeError):
             to_str(0)
 
+    def test_literal_value(self):
+        for text in (
+            "1",
+            "-2",
+            "+3",
+            "1.5",
+            ".5",
+            "1.",
+            "-1.5E-3",
+            "1e5",
+            "True",
+            "False",
+            "None",
+            "'a b'",
+            '"a"',
+            "'a\\nb'",
+            "0x1F",
+            "1_000",
+            "b'a'",
+            "[1, 'a']",
+            '{"a": [1, 2.5]}',
+            "(1, 2)",
+        ):
+            with self.subTest(text=text):
+                value = literal_value(text)
+                self.assertEqual(value, literal_eval(text))
+                self.assertIs(type(value), type(literal_eval(text)))
+
+    def test_literal_value_json(self):
+        self.assertIs(literal_value("true"), True)
+        self.assertIsNone(literal_value("null"))
+
+    def test_literal_value_invalid(self):
+        with self.assertRaises(SyntaxError):
+            literal_value("007")
+        with self.assertRaises(ValueError):
+            literal_value("a")
+
+    def test_literal_value_cache(self):
+        self.assertEqual(literal_value("'cached'"), "cached")
+        self.assertIn("'cached'", LITERALS_CACHE)
+
+        value = literal_value("[1]")
+        value.append(2)
+        self.assertEqual(literal_value("[1]"), [1])
+        self.assertNotIn("[1]", LITERALS_CACHE)
+
 
 if __name__ == "__main__":
     main()